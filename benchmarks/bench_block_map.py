@@ -0,0 +1,80 @@
+"""
+Benchmark how a worker process gets the block map: unpickling the whole dict
+(what every pool worker did before) against mapping the file written by
+SharedBlockMap and looking up only the blocks its pages reference.
+
+Usage: python -m benchmarks.bench_block_map [--blocks 200000] [--lookups 1000]
+"""
+
+import argparse
+import os
+import pickle
+import random
+import time
+import uuid
+
+from src.file_handlers.shared_block_map import SharedBlockMap
+
+
+def make_block_map(blocks: int):
+    """A block map of blocks entries with UUID keys"""
+    rng = random.Random(0)
+    return {
+        str(uuid.UUID(int=rng.getrandbits(128), version=4)): (
+            f"Block {i} with some text and a [[link {i % 100}]]",
+            f"Page {i // 20}",
+        )
+        for i in range(blocks)
+    }
+
+
+def time_ms(func, repeat: int) -> float:
+    """Return the best time in milliseconds of func over repeat runs"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--blocks", type=int, default=200_000)
+    parser.add_argument("--lookups", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    block_map = make_block_map(args.blocks)
+    wanted = random.Random(1).sample(sorted(block_map), min(args.lookups, args.blocks))
+    pickled = pickle.dumps(block_map, protocol=pickle.HIGHEST_PROTOCOL)
+    path = SharedBlockMap.write_temporary(block_map)
+
+    def unpickle():
+        copy = pickle.loads(pickled)
+        for block_id in wanted:
+            copy[block_id]
+
+    def shared():
+        mapped = SharedBlockMap(path)
+        for block_id in wanted:
+            mapped[block_id]
+        mapped.close()
+
+    try:
+        header = f"{'per worker':<12} | {'MB':>6} | {'ms':>9}"
+        print(header)
+        print("-" * len(header))
+        rows = [
+            ("unpickle", len(pickled), unpickle),
+            ("mmap", os.path.getsize(path), shared),
+        ]
+        for name, size, func in rows:
+            elapsed = time_ms(func, args.repeat)
+            print(f"{name:<12} | {size / 1e6:>6.1f} | {elapsed:>9.1f}")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
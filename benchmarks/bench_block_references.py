@@ -0,0 +1,87 @@
+"""
+Benchmark BlockReferencesReplacer's per-file cost as the number of known block IDs grows.
+
+Usage: python -m benchmarks.bench_block_references [--sizes 1000 10000 60000]
+"""
+
+import argparse
+import random
+import re
+import time
+import uuid
+
+from src.processors.block_references import BlockReferencesReplacer
+
+
+def make_replacer(block_count: int, rng: random.Random) -> BlockReferencesReplacer:
+    """Build a replacer whose block map holds block_count blocks spread over pages"""
+    replacer = BlockReferencesReplacer()
+    for i in range(block_count):
+        block_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        text = f"Block number {i}"
+        page_name = f"Page {i % 500}"
+        replacer.block_map[block_id] = (text, page_name)
+        replacer.block_links[block_id] = replacer._format_block_link(text, page_name)
+    return replacer
+
+
+def make_file(block_ids, rng: random.Random, lines: int = 200, refs: int = 20) -> str:
+    """Build a page of bullets, some of which reference known blocks"""
+    content = [f"- Plain bullet number {i} with some text" for i in range(lines)]
+    for _ in range(refs):
+        index = rng.randrange(lines)
+        content[index] += f" see (({rng.choice(block_ids)}))"
+    return "\n".join(content)
+
+
+def legacy_replace(replacer: BlockReferencesReplacer, content: str) -> str:
+    """The previous implementation: one re.sub per known block ID"""
+    for block_id, (text, page_name) in replacer.block_map.items():
+        pattern = r"\(\(" + re.escape(block_id) + r"\)\)"
+        formatted_page_name = replacer._format_page_name_for_link(page_name)
+        content = re.sub(pattern, f"_{text} ([[{formatted_page_name}]])_", content)
+    return content
+
+
+def time_per_file(func, files) -> float:
+    """Return the average time in milliseconds of func over files"""
+    start = time.perf_counter()
+    for content in files:
+        func(content)
+    return (time.perf_counter() - start) * 1000 / len(files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 60_000]
+    )
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument(
+        "--legacy",
+        action="store_true",
+        help="Also time the previous one-re.sub-per-block implementation",
+    )
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    header = f"{'block ids':>10} | {'ms/file':>10}"
+    if args.legacy:
+        header += f" | {'legacy ms/file':>15}"
+    print(header)
+    print("-" * len(header))
+    for size in args.sizes:
+        replacer = make_replacer(size, rng)
+        block_ids = list(replacer.block_map)
+        files = [make_file(block_ids, rng) for _ in range(args.files)]
+        per_file = time_per_file(replacer._replace_regular_references, files)
+        row = f"{size:>10} | {per_file:>10.3f}"
+        if args.legacy:
+            legacy_files = files[: max(1, args.files // 10)]
+            legacy = time_per_file(lambda c: legacy_replace(replacer, c), legacy_files)
+            row += f" | {legacy:>15.3f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
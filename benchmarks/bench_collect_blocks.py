@@ -0,0 +1,102 @@
+"""
+Benchmark BlockReferencesReplacer.collect_blocks, the pre-pass that finds every
+id:: property of a synthetic graph before any file is converted, reading the
+files from disk or from a WorkspaceIndex, with one or more processes.
+
+With --legacy, the previous collection is timed too: every file read as text
+and scanned line by line in this process, with or without id:: properties.
+The "same" column checks that both build the same block map.
+
+Usage: python -m benchmarks.bench_collect_blocks [--files 20000] [--jobs 1 4]
+       [--legacy]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.graph_generator import generate_graph
+from src.file_handlers.workspace_index import WorkspaceIndex
+from src.processors.block_references import BlockReferencesReplacer
+from src.utils import find_markdown_files
+
+
+def legacy_process(workspace: str) -> BlockReferencesReplacer:
+    """The previous implementation: decode and scan every file in this process"""
+    replacer = BlockReferencesReplacer()
+    for subdir in ("journals", "pages"):
+        for file_path in find_markdown_files(os.path.join(workspace, subdir)):
+            with open(file_path, "r", encoding="utf-8") as f:
+                content = f.read()
+            page_name = replacer._extract_page_name(file_path, content)
+            replacer._extract_block_ids(content, page_name)
+    return replacer
+
+
+def time_ms(func, repeat: int) -> float:
+    """Return the best time in milliseconds of func over repeat runs"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=20_000)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--legacy",
+        action="store_true",
+        help="Also time the previous single-process collection",
+    )
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="logseq-bench-")
+    try:
+        workspace = os.path.join(work_dir, "graph")
+        generate_graph(workspace, args.files, args.seed)
+        index = WorkspaceIndex.scan(workspace)
+        header = (
+            f"{'source':<6} | {'jobs':>4} | {'blocks':>7} | {'skipped':>7} | "
+            f"{'ms':>8}"
+        )
+        if args.legacy:
+            header += " | same"
+        print(header)
+        print("-" * len(header))
+        expected = legacy_process(workspace).block_map if args.legacy else None
+        if args.legacy:
+            elapsed = time_ms(lambda: legacy_process(workspace), args.repeat)
+            print(
+                f"{'legacy':<6} | {1:>4} | {len(expected):>7} | {0:>7} | "
+                f"{elapsed:>8.1f} | True"
+            )
+        for source, source_index in (("disk", None), ("index", index)):
+            for jobs in args.jobs:
+                replacer = BlockReferencesReplacer()
+
+                def collect():
+                    replacer.block_map = {}
+                    replacer.collect_blocks(workspace, source_index, jobs=jobs)
+
+                elapsed = time_ms(collect, args.repeat)
+                row = (
+                    f"{source:<6} | {jobs:>4} | {len(replacer.block_map):>7} | "
+                    f"{replacer.files_skipped:>7} | {elapsed:>8.1f}"
+                )
+                if args.legacy:
+                    row += f" | {replacer.block_map == expected}"
+                print(row)
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark LogSeqToReflectConverter.run end to end on synthetic graphs, with a
+per-processor breakdown from the pipeline profiler.
+
+Usage: python -m benchmarks.bench_conversion [--sizes 1000 10000 100000] [--jobs 1]
+       [--io-threads 0]
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.graph_generator import generate_graph
+from src.file_handlers.logseq_to_reflect_converter import LogSeqToReflectConverter
+from src.processors.backlink_collector import BacklinkCollector
+from src.processors.tag_to_backlink import TagToBacklinkProcessor
+
+
+def run_once(workspace: str, output_dir: str, jobs: int, io_threads: int = 0):
+    """Convert the workspace into output_dir, returning (seconds, converter)"""
+    TagToBacklinkProcessor.found_tags.clear()
+    BacklinkCollector.clear_backlinks()
+    converter = LogSeqToReflectConverter(
+        workspace=workspace,
+        output_dir=output_dir,
+        jobs=jobs,
+        profile=True,
+        io_threads=io_threads,
+    )
+    start = time.perf_counter()
+    converter.run()
+    return time.perf_counter() - start, converter
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--io-threads", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--work-dir",
+        help="Keep generated graphs here and reuse them on later runs "
+        "(default: a temporary directory that is removed afterwards)",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="logseq-bench-")
+    try:
+        results = []
+        for size in args.sizes:
+            workspace = os.path.join(work_dir, f"graph_{size}_{args.seed}")
+            if not os.path.isdir(workspace):
+                start = time.perf_counter()
+                summary = generate_graph(workspace, size, args.seed)
+                elapsed = time.perf_counter() - start
+                print(f"Generated {summary} in {elapsed:.1f}s")
+            output_dir = os.path.join(work_dir, f"output_{size}")
+            shutil.rmtree(output_dir, ignore_errors=True)
+            seconds, converter = run_once(
+                workspace, output_dir, args.jobs, args.io_threads
+            )
+            results.append((size, seconds))
+            print(f"\n{size} files: {seconds:.2f}s ({size / seconds:.0f} files/s)")
+            print(converter.profiler.format_table())
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+        print(f"\n{'files':>8} | {'seconds':>8} | {'files/s':>8}")
+        for size, seconds in results:
+            print(f"{size:>8} | {seconds:>8.2f} | {size / seconds:>8.0f}")
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark the per-line cost of the regex-heavy content processors on a synthetic
+journal corpus.
+
+Each processor is run on every journal on its own, so the numbers are the cost
+of the processor rather than of the pipeline. The digest column lets two runs
+(e.g. before and after a change) be checked for identical output.
+
+Usage: python -m benchmarks.bench_line_processors [--megabytes 10] [--repeat 3]
+"""
+
+import argparse
+import hashlib
+import time
+
+from benchmarks.graph_generator import generate_journal_corpus
+from src.processors import (
+    AdmonitionProcessor,
+    ArrowsProcessor,
+    BlockReferencesReplacer,
+    CodeBlockProcessor,
+    EmptyContentCleaner,
+    FirstContentIndentationProcessor,
+    HeadingProcessor,
+    LinkProcessor,
+    PropertiesProcessor,
+    TaskCleaner,
+)
+
+
+def make_processors(corpus):
+    """The processors to benchmark, with a block map collected from the corpus"""
+    replacer = BlockReferencesReplacer()
+    for i, content in enumerate(corpus):
+        replacer._extract_block_ids(content, f"Journal {i}")
+    return [
+        LinkProcessor(),
+        PropertiesProcessor(),
+        EmptyContentCleaner(),
+        AdmonitionProcessor(),
+        TaskCleaner(),
+        CodeBlockProcessor(),
+        HeadingProcessor(),
+        FirstContentIndentationProcessor(),
+        ArrowsProcessor(),
+        replacer,
+    ]
+
+
+def run(processor, corpus):
+    """Process every journal, returning (seconds, digest of the output)"""
+    digest = hashlib.blake2b(digest_size=8)
+    start = time.perf_counter()
+    outputs = [processor.process(content)[0] for content in corpus]
+    seconds = time.perf_counter() - start
+    for output in outputs:
+        digest.update(output.encode("utf-8"))
+    return seconds, digest.hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--megabytes", type=float, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = generate_journal_corpus(int(args.megabytes * 1_000_000), args.seed)
+    lines = sum(content.count("\n") + 1 for content in corpus)
+    size = sum(len(content.encode("utf-8")) for content in corpus)
+    print(f"{len(corpus)} journals, {lines} lines, {size / 1_000_000:.1f} MB\n")
+
+    print(f"{'Processor':<34} {'ms':>8} {'ns/line':>8}  digest")
+    total = 0.0
+    for processor in make_processors(corpus):
+        best = float("inf")
+        for _ in range(args.repeat):
+            seconds, digest = run(processor, corpus)
+            best = min(best, seconds)
+        total += best
+        name = processor.__class__.__name__
+        print(f"{name:<34} {best * 1000:>8.1f} {best * 1e9 / lines:>8.0f}  {digest}")
+    print(f"{'Total':<34} {total * 1000:>8.1f} {total * 1e9 / lines:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark OrderedListProcessor against the previous whole-document regex on
+ordinary and pathological pages.
+
+The regex's leading \\s* can start at every line of a run of blank or
+whitespace-only lines and scan to the end of the run, so such runs cost
+quadratic time. The "same" column checks that both give the same output once
+the items are numbered "1." again, which is all the regex did.
+
+Usage: python -m benchmarks.bench_ordered_lists [--lines 20000] [--legacy]
+"""
+
+import argparse
+import re
+import time
+
+from src.processors.ordered_list_processor import OrderedListProcessor
+
+PROPERTY = "logseq.order-list-type:: number"
+LEGACY_PATTERN = re.compile(
+    r"(?m)^(?P<indent>\s*)-\s+(?P<item>.+?)\r?\n"
+    r"\s*logseq\.order-list-type::\s*number\r?\n?"
+)
+NUMBER_PATTERN = re.compile(r"(?m)^(\s*)\d+\. ")
+
+
+def make_pages(lines: int):
+    """Pages of about lines lines each, by name"""
+    nested = []
+    for i in range(lines // 4):
+        nested += [f"- item {i}", f"  {PROPERTY}", f"\t- child {i}", f"\t  {PROPERTY}"]
+    pages = {
+        "ordered list": "\n".join(
+            f"- item {i} with some text\n  {PROPERTY}" for i in range(lines // 2)
+        ),
+        "nested lists": "\n".join(nested),
+        "plain bullets": "\n".join(f"- item {i} with some text" for i in range(lines))
+        + f"\n- last\n  {PROPERTY}",
+        "blank lines": f"- item\n  {PROPERTY}" + "\n" * lines + "- last",
+        "indented blank lines": f"- item\n  {PROPERTY}" + "\n  " * lines + "- last",
+    }
+    return {name: page + "\n" for name, page in pages.items()}
+
+
+def legacy_process(content: str) -> str:
+    """The previous implementation: one multiline regex over the document"""
+    return LEGACY_PATTERN.sub(
+        lambda m: f"{m.group('indent') or ''}1. {m.group('item')}\n", content
+    )
+
+
+def time_ms(func, repeat: int) -> float:
+    """Return the best time in milliseconds of func over repeat runs"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--legacy",
+        action="store_true",
+        help="Also time the previous regex implementation (once)",
+    )
+    args = parser.parse_args()
+
+    processor = OrderedListProcessor()
+    header = f"{'page':<22} | {'ms':>9}"
+    if args.legacy:
+        header += f" | {'legacy ms':>10} | same"
+    print(header)
+    print("-" * len(header))
+    for name, page in make_pages(args.lines).items():
+        elapsed = time_ms(lambda: processor.process(page), args.repeat)
+        row = f"{name:<22} | {elapsed:>9.1f}"
+        if args.legacy:
+            legacy = time_ms(lambda: legacy_process(page), 1)
+            output = NUMBER_PATTERN.sub(r"\g<1>1. ", processor.process(page)[0])
+            row += f" | {legacy:>10.1f} | {output == legacy_process(page)}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
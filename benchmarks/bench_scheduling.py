@@ -0,0 +1,85 @@
+"""
+Benchmark how the parallel walker dispatches files to workers, by simulating a
+pool on a graph of thousands of tiny journals and a handful of multi-MB pages.
+
+Each chunk costs a fixed round trip plus a time proportional to its bytes, and
+goes to whichever worker is free first, as with ProcessPoolExecutor. The
+previous dispatch sent the files in walk order with a fixed chunksize; the
+current one sends them largest first, grouping small files (plan_chunks). The
+columns are the makespan, the worker time spent idle at the tail of the run,
+and the number of chunks sent.
+
+Usage: python -m benchmarks.bench_scheduling [--jobs 4 8] [--journals 5000]
+       [--large-pages 6]
+"""
+
+import argparse
+import heapq
+import random
+
+from src.file_handlers.parallel import plan_chunks
+
+# Simulated cost of sending a chunk to a worker and of converting a byte
+ROUND_TRIP_MS = 0.3
+MS_PER_BYTE = 0.0001
+
+
+def make_sizes(journals: int, large_pages: int, seed: int):
+    """File sizes in walk order: journals, then pages with the large ones mixed in"""
+    rng = random.Random(seed)
+    sizes = [rng.randint(200, 4_000) for _ in range(journals)]
+    pages = [rng.randint(1_000, 40_000) for _ in range(journals // 5)]
+    pages += [rng.randint(2_000_000, 8_000_000) for _ in range(large_pages)]
+    rng.shuffle(pages)
+    return sizes + pages
+
+
+def legacy_chunks(sizes, jobs: int):
+    """The previous dispatch: walk order, len(tasks) // (jobs * 4) files a chunk"""
+    chunksize = max(1, len(sizes) // (jobs * 4))
+    indexes = list(range(len(sizes)))
+    return [indexes[i : i + chunksize] for i in range(0, len(indexes), chunksize)]
+
+
+def simulate(sizes, chunks, jobs: int):
+    """Return (makespan_ms, tail_idle_ms) of the chunks on jobs workers"""
+    workers = [0.0] * jobs
+    heapq.heapify(workers)
+    for chunk in chunks:
+        free = heapq.heappop(workers)
+        cost = ROUND_TRIP_MS + MS_PER_BYTE * sum(sizes[index] for index in chunk)
+        heapq.heappush(workers, free + cost)
+    makespan = max(workers)
+    return makespan, sum(makespan - end for end in workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[4, 8])
+    parser.add_argument("--journals", type=int, default=5_000)
+    parser.add_argument("--large-pages", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    sizes = make_sizes(args.journals, args.large_pages, args.seed)
+    print(f"{len(sizes)} files, {sum(sizes) / 1e6:.1f} MB")
+    header = (
+        f"{'jobs':>4} | {'dispatch':<8} | {'makespan ms':>11} | "
+        f"{'tail idle ms':>12} | {'chunks':>6}"
+    )
+    print(header)
+    print("-" * len(header))
+    for jobs in args.jobs:
+        for name, chunks in (
+            ("legacy", legacy_chunks(sizes, jobs)),
+            ("lpt", plan_chunks(sizes, jobs)),
+        ):
+            makespan, tail = simulate(sizes, chunks, jobs)
+            print(
+                f"{jobs:>4} | {name:<8} | {makespan:>11.1f} | "
+                f"{tail:>12.1f} | {len(chunks):>6}"
+            )
+
+
+if __name__ == "__main__":
+    main()
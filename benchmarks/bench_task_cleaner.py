@@ -0,0 +1,106 @@
+"""
+Benchmark TaskCleaner against the previous chain of whole-document regexes on
+journals with many tasks.
+
+The previous LOGBOOK regex, \\s+:LOGBOOK:.*?:END: with DOTALL, scanned to the
+end of the page from every drawer that has no :END: after it, so a page of
+unclosed drawers cost quadratic time; keep --tasks small with --legacy. The
+"same" column checks that both give the same output.
+
+Usage: python -m benchmarks.bench_task_cleaner [--tasks 100000] [--legacy]
+"""
+
+import argparse
+import re
+import time
+
+from src.processors.task_cleaner import TaskCleaner
+
+TASKS = [
+    "- TODO write the report {i}",
+    "- DONE review #{i}\n  :LOGBOOK:\n  CLOCK: [2024-01-02 Tue 10:00]\n  :END:",
+    "  - DOING nested task {i} [[Page {i}]]",
+    "- WAITING reply from {i}",
+    "- CANCELLED meeting {i}",
+    "## TODO heading task {i}",
+    "- ### DONE bullet heading {i}",
+    "- plain note {i} without a task",
+]
+LEGACY_SUBSTITUTIONS = [
+    (re.compile(r"\s+:LOGBOOK:.*?:END:", re.DOTALL), ""),
+    (re.compile(r"-\s+(?:CANCELLED|CANCELED)\s+(.*)"), r"- [x] ~~\1~~"),
+    (re.compile(r"-\s+WAITING\s+(.*)"), r"- [ ] \1"),
+    (re.compile(r"- TODO "), "- [ ] "),
+    (re.compile(r"- DONE "), "- [x] "),
+    (re.compile(r"- DOING "), "- [ ] "),
+    (
+        re.compile(
+            r"^(?!-\s+)(#+)\s+(?:TODO|DONE|DOING|WAITING)\s+(.*)", re.MULTILINE
+        ),
+        r"\1 \2",
+    ),
+    (
+        re.compile(r"^(?!-\s+)(#+)\s+(?:CANCELLED|CANCELED)\s+(.*)", re.MULTILINE),
+        r"\1 \2",
+    ),
+    (re.compile(r"-\s+(#+)\s+(?:TODO|DONE|DOING|WAITING)\s+(.*)"), r"- \1 \2"),
+    (re.compile(r"-\s+(#+)\s+(?:CANCELLED|CANCELED)\s+(.*)"), r"- \1 \2"),
+]
+
+
+def make_pages(tasks: int):
+    """Journals of tasks tasks each, by name"""
+    lines = [TASKS[i % len(TASKS)].format(i=i) for i in range(tasks)]
+    unclosed = [f"- DONE task {i}\n  :LOGBOOK:\n  CLOCK: [x]" for i in range(tasks)]
+    return {
+        "tasks": "\n".join(lines) + "\n",
+        "unclosed logbooks": "\n".join(unclosed) + "\n",
+    }
+
+
+def legacy_process(content: str) -> str:
+    """The previous implementation: one substitution per marker over the page"""
+    for pattern, replacement in LEGACY_SUBSTITUTIONS:
+        content = pattern.sub(replacement, content)
+    return content
+
+
+def time_ms(func, repeat: int) -> float:
+    """Return the best time in milliseconds of func over repeat runs"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--legacy",
+        action="store_true",
+        help="Also time the previous regex implementation (once)",
+    )
+    args = parser.parse_args()
+
+    processor = TaskCleaner()
+    header = f"{'page':<18} | {'MB':>6} | {'ms':>9}"
+    if args.legacy:
+        header += f" | {'legacy ms':>10} | same"
+    print(header)
+    print("-" * len(header))
+    for name, page in make_pages(args.tasks).items():
+        elapsed = time_ms(lambda: processor.process(page), args.repeat)
+        row = f"{name:<18} | {len(page) / 1e6:>6.1f} | {elapsed:>9.1f}"
+        if args.legacy:
+            legacy = time_ms(lambda: legacy_process(page), 1)
+            same = processor.process(page)[0] == legacy_process(page)
+            row += f" | {legacy:>10.1f} | {same}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark WikiLinkProcessor on a link-heavy page with a large tag registry.
+
+Usage: python -m benchmarks.bench_wikilinks [--links 5000] [--tags 10000]
+"""
+
+import argparse
+import random
+import re
+import time
+
+from src.processors.tag_to_backlink import TagToBacklinkProcessor
+from src.processors.wikilink import WikiLinkProcessor
+
+
+def make_page(tags, links: int, rng: random.Random) -> str:
+    """Build a page of bullets whose wikilinks point at tags or at regular pages"""
+    lines = []
+    for i in range(links):
+        if i % 4 == 0:
+            target = rng.choice(tags)
+        else:
+            target = f"project___page number {i}"
+        lines.append(f"- Bullet {i} links to [[{target}]]")
+    return "\n".join(lines)
+
+
+def legacy_process(processor: WikiLinkProcessor, content: str) -> str:
+    """The previous implementation: the lowercase tag set is rebuilt per link"""
+
+    def format_wikilink(match):
+        link_text = match.group(1)
+        found_tags_lower = {t.lower() for t in TagToBacklinkProcessor.found_tags}
+        if link_text.lower() in found_tags_lower:
+            return f"[[{link_text.lower()}]]"
+        return f"[[{processor._flatten_and_title_case(link_text)}]]"
+
+    return re.sub(r"\[\[(.*?)\]\]", format_wikilink, content)
+
+
+def time_ms(func, repeat: int) -> float:
+    """Return the best time in milliseconds of func over repeat runs"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--links", type=int, default=5_000)
+    parser.add_argument("--tags", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--legacy",
+        action="store_true",
+        help="Also time the previous rebuild-per-link implementation (once)",
+    )
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    tags = [f"tag-{i}" for i in range(args.tags)]
+    saved_tags = set(TagToBacklinkProcessor.found_tags)
+    TagToBacklinkProcessor.found_tags.clear()
+    TagToBacklinkProcessor.register_tags(tags)
+    try:
+        processor = WikiLinkProcessor()
+        page = make_page(tags, args.links, rng)
+        elapsed = time_ms(lambda: processor.process(page), args.repeat)
+        print(f"{args.links} wikilinks, {args.tags} tags: {elapsed:.1f} ms/page")
+        if args.legacy:
+            legacy = time_ms(lambda: legacy_process(processor, page), 1)
+            print(f"legacy: {legacy:.1f} ms/page")
+            assert legacy_process(processor, page) == processor.process(page)[0]
+    finally:
+        TagToBacklinkProcessor.found_tags.clear()
+        TagToBacklinkProcessor.register_tags(saved_tags)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+Generate a deterministic synthetic Logseq graph for benchmarks.
+
+The graph has journals (YYYY_MM_DD.md) and pages, including namespaced pages
+(a___b.md), and a realistic mix of content: aliases, id:: blocks with ((refs))
+and {{embed}}s pointing at them, wikilinks, tags, tasks with LOGBOOKs, code
+fences, admonitions, ordered lists and nested bullets. The same arguments
+always produce the same files.
+
+Usage: python -m benchmarks.graph_generator OUTPUT_DIR [--files 1000] [--seed 0]
+"""
+
+import argparse
+import datetime
+import os
+import random
+import uuid
+from typing import Dict, List
+
+WORDS = (
+    "project alpha beta release planning meeting notes design review budget "
+    "roadmap customer feedback deploy pipeline database cache latency api "
+    "service migration incident report retro onboarding hiring research idea "
+    "reading book article podcast health travel garden recipe python logseq "
+    "reflect sync backup security audit metrics dashboard quarter goal"
+).split()
+NAMESPACES = ("jira", "repo", "topic", "area", "aws", "people")
+TASK_MARKERS = ("TODO", "DONE", "DOING", "LATER", "NOW", "WAITING", "CANCELLED")
+ADMONITIONS = ("NOTE", "TIP", "WARNING", "IMPORTANT", "QUOTE")
+CODE_LANGUAGES = ("python", "bash", "sql", "")
+
+# Share of files that are journals
+JOURNAL_RATIO = 0.4
+START_DATE = datetime.date(2018, 1, 1)
+
+
+class GraphSummary:
+    """What was generated, for reporting and sanity checks"""
+
+    def __init__(self):
+        self.journals = 0
+        self.pages = 0
+        self.bytes = 0
+        self.blocks = 0
+        self.block_refs = 0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.journals} journals, {self.pages} pages, "
+            f"{self.bytes / 1_000_000:.1f} MB, {self.blocks} blocks, "
+            f"{self.block_refs} block references"
+        )
+
+
+class GraphGenerator:
+    """Deterministic generator of Logseq graph content"""
+
+    def __init__(self, files: int, seed: int = 0):
+        self.rng = random.Random(seed)
+        self.journal_count = int(files * JOURNAL_RATIO)
+        self.page_count = files - self.journal_count
+        self.page_names = self._make_page_names(self.page_count)
+        self.tags = [self._words(1, 2, "-") for _ in range(max(10, files // 20))]
+        # Block IDs defined by each file, assigned up front so that references
+        # can point at blocks in files that haven't been written yet
+        self.file_blocks: List[List[str]] = [
+            [self._uuid() for _ in range(self.rng.choice((0, 0, 1, 2, 3)))]
+            for _ in range(files)
+        ]
+        self.all_blocks = [block for blocks in self.file_blocks for block in blocks]
+
+    def _uuid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def _words(self, low: int, high: int, sep: str = " ") -> str:
+        count = self.rng.randint(low, high)
+        return sep.join(self.rng.choice(WORDS) for _ in range(count))
+
+    def _make_page_names(self, count: int) -> List[str]:
+        names: Dict[str, None] = {}
+        while len(names) < count:
+            name = self._words(1, 4)
+            if self.rng.random() < 0.3:
+                name = f"{self.rng.choice(NAMESPACES)}___{name}"
+            if self.rng.random() < 0.2:
+                name = name.replace(" ", "_")
+            names.setdefault(f"{name} {len(names)}" if name in names else name)
+        return list(names)
+
+    def _sentence(self) -> str:
+        """A line of text with the occasional wikilink and tag"""
+        parts = [self._words(3, 10)]
+        if self.page_names and self.rng.random() < 0.5:
+            target = self.rng.choice(self.page_names).replace("___", "/")
+            parts.append(f"see [[{target}]]")
+        if self.rng.random() < 0.3:
+            parts.append(f"#{self.rng.choice(self.tags)}")
+        if self.rng.random() < 0.1:
+            parts.append("-> next")
+        self.rng.shuffle(parts)
+        return " ".join(parts)
+
+    def _block_ref(self) -> str:
+        return self.rng.choice(self.all_blocks) if self.all_blocks else self._uuid()
+
+    def _bullet(self, indent: str, summary: GraphSummary) -> List[str]:
+        """One top-level bullet with a random kind of content and children"""
+        kind = self.rng.random()
+        child = indent + "\t"
+        if kind < 0.35:
+            lines = [f"{indent}- {self._sentence()}"]
+            for _ in range(self.rng.choice((0, 0, 1, 2, 3))):
+                lines.append(f"{child}- {self._sentence()}")
+        elif kind < 0.5:
+            marker = self.rng.choice(TASK_MARKERS)
+            lines = [f"{indent}- {marker} {self._words(2, 6)}"]
+            if marker in ("DONE", "DOING", "NOW") or self.rng.random() < 0.3:
+                lines += [
+                    f"{indent}  :LOGBOOK:",
+                    f"{indent}  CLOCK: [2024-01-02 Tue 09:00:00]--"
+                    f"[2024-01-02 Tue 10:30:00] =>  01:30:00",
+                    f"{indent}  :END:",
+                ]
+        elif kind < 0.62:
+            summary.block_refs += 1
+            ref = self._block_ref()
+            if self.rng.random() < 0.3:
+                lines = [f"{indent}- {{{{embed (({ref}))}}}}"]
+            else:
+                lines = [f"{indent}- {self._words(2, 5)} (({ref}))"]
+        elif kind < 0.7:
+            language = self.rng.choice(CODE_LANGUAGES)
+            lines = [
+                f"{indent}- ```{language}",
+                f"{indent}  # not a [[link]] or #tag",
+                f"{indent}  value = compute({self.rng.randint(0, 999)})",
+                f"{indent}  ```",
+            ]
+        elif kind < 0.78:
+            name = self.rng.choice(ADMONITIONS)
+            lines = [
+                f"{indent}- #+BEGIN_{name}",
+                f"{indent}  {self._sentence()}",
+                f"{indent}  #+END_{name}",
+            ]
+        elif kind < 0.85:
+            lines = [f"{indent}- {self._words(2, 4)}"]
+            for _ in range(self.rng.randint(2, 5)):
+                lines += [
+                    f"{child}- {self._words(2, 6)}",
+                    f"{child}  logseq.order-list-type:: number",
+                ]
+        elif kind < 0.92:
+            lines = [f"{indent}- ## {self._words(1, 4)}", f"{indent}  collapsed:: true"]
+            lines.append(f"{child}- {self._sentence()}")
+        else:
+            lines = [f"{indent}- {self._sentence()}"]
+            deep = child
+            for _ in range(self.rng.randint(2, 6)):
+                lines.append(f"{deep}- {self._words(2, 6)}")
+                deep += "\t"
+        return lines
+
+    def _file_content(self, blocks: List[str], summary: GraphSummary) -> str:
+        lines: List[str] = []
+        for _ in range(self.rng.randint(5, 25)):
+            lines += self._bullet("", summary)
+        # Attach the file's block IDs to some of its top-level bullets
+        starts = [i for i, line in enumerate(lines) if line.startswith("- ")]
+        for block_id in blocks:
+            index = self.rng.choice(starts)
+            lines[index] += f"\n  id:: {block_id}"
+            summary.blocks += 1
+        return "\n".join(lines) + "\n"
+
+    def _page_header(self) -> str:
+        header = []
+        if self.rng.random() < 0.15:
+            count = self.rng.randint(1, 2)
+            aliases = ", ".join(self._words(1, 3) for _ in range(count))
+            header.append(f"alias:: {aliases}")
+        if self.rng.random() < 0.2:
+            header.append(f"tags:: {self.rng.choice(self.tags)}")
+        return "\n".join(header) + "\n\n" if header else ""
+
+    def write(self, output_dir: str) -> GraphSummary:
+        """Write the graph to output_dir/journals and output_dir/pages"""
+        summary = GraphSummary()
+        journals_dir = os.path.join(output_dir, "journals")
+        pages_dir = os.path.join(output_dir, "pages")
+        os.makedirs(journals_dir, exist_ok=True)
+        os.makedirs(pages_dir, exist_ok=True)
+        for i in range(self.journal_count):
+            date = START_DATE + datetime.timedelta(days=i)
+            path = os.path.join(journals_dir, date.strftime("%Y_%m_%d.md"))
+            content = self._file_content(self.file_blocks[i], summary)
+            summary.bytes += self._write_file(path, content)
+            summary.journals += 1
+        for i, name in enumerate(self.page_names):
+            path = os.path.join(pages_dir, f"{name}.md")
+            blocks = self.file_blocks[self.journal_count + i]
+            content = self._page_header() + self._file_content(blocks, summary)
+            summary.bytes += self._write_file(path, content)
+            summary.pages += 1
+        return summary
+
+    @staticmethod
+    def _write_file(path: str, content: str) -> int:
+        data = content.encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(data)
+        return len(data)
+
+
+def generate_journal_corpus(target_bytes: int, seed: int = 0) -> List[str]:
+    """
+    Generate journal contents in memory until they add up to target_bytes.
+
+    Args:
+        target_bytes: Minimum total size of the corpus in UTF-8 bytes
+        seed: Random seed; the same seed and size always give the same corpus
+
+    Returns:
+        List of journal file contents
+    """
+    # Journals average about 1.5 KB, which sizes the page and block pools
+    generator = GraphGenerator(max(10, target_bytes // 1500), seed)
+    summary = GraphSummary()
+    contents: List[str] = []
+    total = 0
+    while total < target_bytes:
+        blocks = generator.file_blocks[len(contents) % len(generator.file_blocks)]
+        content = generator._file_content(blocks, summary)
+        contents.append(content)
+        total += len(content.encode("utf-8"))
+    return contents
+
+
+def generate_graph(output_dir: str, files: int, seed: int = 0) -> GraphSummary:
+    """
+    Generate a synthetic Logseq graph.
+
+    Args:
+        output_dir: Workspace directory to create the journals and pages in
+        files: Total number of markdown files
+        seed: Random seed; the same seed and size always give the same graph
+
+    Returns:
+        GraphSummary describing what was written
+    """
+    return GraphGenerator(files, seed).write(output_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("output_dir")
+    parser.add_argument("--files", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    summary = generate_graph(args.output_dir, args.files, args.seed)
+    print(f"Generated {summary} in {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
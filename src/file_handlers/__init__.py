@@ -3,3 +3,4 @@ from .journal_file_processor import JournalFileProcessor
 from .page_file_processor import PageFileProcessor
 from .directory_walker import DirectoryWalker
 from .logseq_to_reflect_converter import LogSeqToReflectConverter
+from .workspace_index import WorkspaceIndex
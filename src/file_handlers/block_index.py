@@ -0,0 +1,188 @@
+import os
+import sqlite3
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+BLOCK_INDEX_FILENAME = ".logseq-to-reflect-blocks.sqlite"
+# Bump when the stored block text or page names would change, to force a rescan
+BLOCK_INDEX_VERSION = 1
+
+# (file_path, size, mtime, content_or_None)
+SourceFile = Tuple[str, int, float, Optional[str]]
+
+
+class PersistentBlockIndex:
+    """
+    On-disk cache of the blocks (id:: properties) defined in each source file,
+    stored in a SQLite database next to the conversion output.
+
+    Files are keyed by path, size and mtime: a file whose size and mtime match
+    its stored row has its blocks loaded from the database, every other file is
+    read and scanned again. Only the block text and page name are stored; the
+    replacement links are formatted when blocks are loaded, so a change in the
+    categories config doesn't require a rescan.
+    """
+
+    def __init__(self, path: str, read_only: bool = False):
+        """
+        Args:
+            path: Path to the SQLite database file
+            read_only: If True, cached blocks are used but the database isn't updated
+        """
+        self.path = path
+        self.read_only = read_only
+        self.files_reused = 0
+        self.files_scanned = 0
+
+    @classmethod
+    def for_output_dir(
+        cls, output_dir: str, read_only: bool = False
+    ) -> "PersistentBlockIndex":
+        """Return the block index stored in an output directory"""
+        return cls(os.path.join(output_dir, BLOCK_INDEX_FILENAME), read_only)
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the database, recreating its tables if they are from another version"""
+        if self.read_only and not os.path.exists(self.path):
+            return None
+        try:
+            conn = sqlite3.connect(self.path)
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != BLOCK_INDEX_VERSION:
+                if self.read_only:
+                    conn.close()
+                    return None
+                conn.executescript(
+                    """
+                    DROP TABLE IF EXISTS files;
+                    DROP TABLE IF EXISTS blocks;
+                    CREATE TABLE files (
+                        path TEXT PRIMARY KEY,
+                        size INTEGER NOT NULL,
+                        mtime REAL NOT NULL
+                    );
+                    CREATE TABLE blocks (
+                        path TEXT NOT NULL,
+                        position INTEGER NOT NULL,
+                        block_id TEXT NOT NULL,
+                        text TEXT NOT NULL,
+                        page_name TEXT NOT NULL,
+                        PRIMARY KEY (path, position)
+                    );
+                    """
+                )
+                conn.execute(f"PRAGMA user_version = {BLOCK_INDEX_VERSION}")
+                conn.commit()
+            return conn
+        except sqlite3.Error as e:
+            logger.error(f"Error opening block index {self.path}: {e}")
+            return None
+
+    def _load(
+        self, conn: sqlite3.Connection
+    ) -> Tuple[Dict[str, Tuple[int, float]], Dict[str, List[Tuple[str, str, str]]]]:
+        """Load every stored file stamp and its blocks, in file order"""
+        stamps = {
+            path: (size, mtime)
+            for path, size, mtime in conn.execute("SELECT path, size, mtime FROM files")
+        }
+        blocks: Dict[str, List[Tuple[str, str, str]]] = {}
+        for path, block_id, text, page_name in conn.execute(
+            "SELECT path, block_id, text, page_name FROM blocks ORDER BY path, position"
+        ):
+            blocks.setdefault(path, []).append((block_id, text, page_name))
+        return stamps, blocks
+
+    def collect(self, replacer, files: Iterable[SourceFile], jobs: int = 1) -> None:
+        """
+        Fill the replacer's block map from the given files, rescanning only the
+        files that changed since the index was last written.
+
+        Files are added in the given order, so when two files define the same
+        block ID the later one wins, exactly like a full scan.
+
+        Args:
+            replacer: BlockReferencesReplacer to add the blocks to
+            files: Iterable of (file_path, size, mtime, content_or_None) tuples;
+                   files without content are read only if they need a rescan
+            jobs: Number of processes rescanning the files
+        """
+        conn = self._connect()
+        stamps: Dict[str, Tuple[int, float]] = {}
+        cached: Dict[str, List[Tuple[str, str, str]]] = {}
+        if conn is not None:
+            try:
+                stamps, cached = self._load(conn)
+            except sqlite3.Error as e:
+                logger.error(f"Error reading block index {self.path}: {e}")
+
+        files = list(files)
+        rescan = [
+            (file_path, content)
+            for file_path, size, mtime, content in files
+            if stamps.get(file_path) != (size, mtime)
+        ]
+        scanned = replacer.scan_files(rescan, jobs)
+        rescanned = dict(zip((file_path for file_path, _ in rescan), scanned))
+        self.files_reused = 0
+        self.files_scanned = 0
+        seen = set()
+        updates: List[Tuple[str, int, float, List[Tuple[str, str, str]]]] = []
+        ordered: List[Tuple[str, List[Tuple[str, str, str]]]] = []
+        for file_path, size, mtime, _ in files:
+            seen.add(file_path)
+            if file_path not in rescanned:
+                blocks = cached.get(file_path, [])
+                self.files_reused += 1
+            else:
+                blocks = rescanned[file_path]
+                if blocks is None:
+                    # The file couldn't be read
+                    continue
+                updates.append((file_path, size, mtime, blocks))
+                self.files_scanned += 1
+            ordered.append((file_path, blocks))
+        replacer.add_file_blocks(ordered)
+
+        logger.info(
+            f"Block index: {self.files_reused} files reused, "
+            f"{self.files_scanned} files scanned"
+        )
+        if conn is None:
+            return
+        try:
+            if not self.read_only:
+                removed = [(path,) for path in stamps if path not in seen]
+                self._write(conn, updates, removed)
+        except sqlite3.Error as e:
+            logger.error(f"Error writing block index {self.path}: {e}")
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _write(
+        conn: sqlite3.Connection,
+        updates: List[Tuple[str, int, float, List[Tuple[str, str, str]]]],
+        removed: List[Tuple[str]],
+    ) -> None:
+        """Replace the rows of rescanned files and drop the rows of vanished ones"""
+        with conn:
+            stale = removed + [(path,) for path, _, _, _ in updates]
+            conn.executemany("DELETE FROM files WHERE path = ?", stale)
+            conn.executemany("DELETE FROM blocks WHERE path = ?", stale)
+            conn.executemany(
+                "INSERT INTO files (path, size, mtime) VALUES (?, ?, ?)",
+                [(path, size, mtime) for path, size, mtime, _ in updates],
+            )
+            conn.executemany(
+                "INSERT INTO blocks (path, position, block_id, text, page_name) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (path, position, block_id, text, page_name)
+                    for path, _, _, blocks in updates
+                    for position, (block_id, text, page_name) in enumerate(blocks)
+                ],
+            )
@@ -1,11 +1,21 @@
 import os
 import logging
-import re
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Tuple, Optional, Iterator
+from typing import Dict, List, Set, Tuple, Optional, Iterator
 
+from .file_processor import DEFAULT_STREAM_THRESHOLD
 from .journal_file_processor import JournalFileProcessor
 from .page_file_processor import PageFileProcessor
+from .parallel import (
+    PoolReport,
+    Task,
+    run_in_pool,
+    reset_file_collections,
+    get_file_collections,
+)
+from .pipelined_io import PrefetchReader, WriteBehindWriter, read_file
+from .workspace_index import WorkspaceIndex, IndexedFile, has_aliases
 from ..processors.block_references import BlockReferencesReplacer
 from ..utils import find_markdown_files
 
@@ -23,6 +33,10 @@ class DirectoryWalker:
         dry_run: bool = False,
         block_references_replacer: Optional[BlockReferencesReplacer] = None,
         categories_config: str = None,
+        jobs: int = 1,
+        index: Optional[WorkspaceIndex] = None,
+        io_threads: int = 0,
+        stream_threshold: Optional[int] = DEFAULT_STREAM_THRESHOLD,
     ):
         """
         Initialize DirectoryWalker for processing LogSeq files.
@@ -33,15 +47,48 @@ class DirectoryWalker:
             dry_run: If True, don't actually write any files
             block_references_replacer: Optional block references processor
             categories_config: Optional categories configuration
+            jobs: Number of worker processes (1 converts files in this process)
+            index: Optional pre-built WorkspaceIndex; when set, files are listed and
+                   read from the index instead of walking the directories again
+            io_threads: If set, files not in the index are read ahead on this many
+                        threads and outputs are written behind on a background
+                        thread while the next files are converted (jobs=1 only)
+            stream_threshold: Files with at least this many characters are
+                              converted and written block by block to bound
+                              memory use (None: never)
         """
         self.workspace = os.path.abspath(workspace)
         self.output_dir = output_dir
         self.dry_run = dry_run
+        self.jobs = max(1, jobs or 1)
+        self.block_references_replacer = block_references_replacer
+        self.categories_config = categories_config
+        self.index = index
+        self.io_threads = max(0, io_threads or 0)
+        self.stream_threshold = stream_threshold
+        # If set, only these source paths are converted (e.g. incremental runs)
+        self.selected_paths: Optional[Set[str]] = None
+        # If set to a dict, the (tags, backlinks, date_backlinks) found in each
+        # converted file are recorded in it, keyed by source path
+        self.file_results: Optional[
+            Dict[str, Tuple[Set[str], Set[str], Dict[str, str]]]
+        ] = None
+        # Lowercase link targets each converted file formatted as pages rather
+        # than tags, keyed by source path (see WikiLinkProcessor)
+        self.untagged_links: Dict[str, Set[str]] = {}
+        # How busy the worker processes were over the parallel runs (jobs > 1)
+        self.pool_report = PoolReport()
         self.journal_processor = JournalFileProcessor(
-            block_references_replacer, dry_run, categories_config=categories_config
+            block_references_replacer,
+            dry_run,
+            categories_config=categories_config,
+            stream_threshold=stream_threshold,
         )
         self.page_processor = PageFileProcessor(
-            block_references_replacer, dry_run, categories_config=categories_config
+            block_references_replacer,
+            dry_run,
+            categories_config=categories_config,
+            stream_threshold=stream_threshold,
         )
         # Always use step_1 and step_2 subdirectories under the output dir
         self.step_1_dir = os.path.join(self.output_dir, "step_1")
@@ -88,46 +135,190 @@ class DirectoryWalker:
             logger.error(f"Failed to create output directory {output_path}: {e}")
             return False
 
-    def _has_aliases(self, file_path: str) -> bool:
+    def _has_aliases(self, file_path: str, content: Optional[str] = None) -> bool:
         """
-        Check if a file has aliases (triple underscores in filename).
+        Check if a file has aliases (triple underscores in filename or an alias::
+        property).
 
         Args:
             file_path: Path to the file to check
+            content: Content of the file if already loaded; otherwise the file is
+                     read unless its name settles it
 
         Returns:
             True if file has aliases, False otherwise
         """
         filename = os.path.basename(file_path)
-        if "___" in filename:
-            return True
-
-        # Also check if file content has an alias property
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-            if re.search(r"alias::", content):
-                return True
-        except Exception:
-            pass
+        if content is None and "___" not in filename:
+            try:
+                content = read_file(file_path)
+            except Exception:
+                pass
+        return has_aliases(filename, content)
 
-        return False
-
-    def _get_output_dir_for_file(self, file_path: str) -> str:
+    def _get_output_dir_for_file(
+        self,
+        file_path: str,
+        entry: Optional[IndexedFile] = None,
+        content: Optional[str] = None,
+    ) -> str:
         """
         Determine the appropriate output directory for a file.
 
         Args:
             file_path: Path to the file to check
+            entry: Optional index entry for the file, whose alias flag is used if given
+            content: Optional content of the file, used instead of reading it again
 
         Returns:
             Path to the appropriate output directory (step_1 or step_2)
         """
-        if self._has_aliases(file_path):
+        if entry is not None:
+            is_alias_page = entry.has_aliases
+        else:
+            is_alias_page = self._has_aliases(file_path, content)
+        if is_alias_page:
             return self.step_1_dir
         else:
             return self.step_2_dir
 
+    def _iter_files(
+        self, dir_path: str
+    ) -> Iterator[Tuple[str, Optional[IndexedFile]]]:
+        """
+        List the markdown files under a directory, from the index if there is one.
+
+        Yields:
+            Tuples of (file_path, index_entry), index_entry being None without an index
+        """
+        if self.index is not None:
+            files = ((entry.path, entry) for entry in self.index.files_under(dir_path))
+        else:
+            files = ((path, None) for path in find_markdown_files(dir_path))
+        for file_path, entry in files:
+            if self.selected_paths is None or file_path in self.selected_paths:
+                yield file_path, entry
+
+    def _iter_contents(
+        self, dir_path: str
+    ) -> Iterator[Tuple[str, Optional[IndexedFile], Optional[str]]]:
+        """
+        List the markdown files under a directory with their contents. Files that
+        aren't indexed are read here, once, ahead of time when io_threads is set.
+
+        Yields:
+            Tuples of (file_path, index_entry, content), content being None when the
+            file couldn't be read (the file processor then reports the error)
+        """
+        files = self._iter_files(dir_path)
+        if self.index is not None:
+            for file_path, entry in files:
+                yield file_path, entry, entry.content
+            return
+        if not self.io_threads:
+            for file_path, _ in files:
+                try:
+                    content = read_file(file_path)
+                except Exception:
+                    content = None
+                yield file_path, None, content
+            return
+        reader = PrefetchReader(self.io_threads)
+        for file_path, content in reader.read(path for path, _ in files):
+            yield file_path, None, content
+
+    @contextmanager
+    def _write_behind(self, processor) -> Iterator[None]:
+        """
+        Queue the processor's outputs on a write-behind writer while the block runs,
+        waiting for every write when it ends. Does nothing without io_threads or
+        in a dry run.
+        """
+        if not self.io_threads or self.dry_run:
+            yield
+            return
+        # A single writer thread keeps writes in submission order
+        processor.writer = WriteBehindWriter()
+        try:
+            yield
+        finally:
+            writer, processor.writer = processor.writer, None
+            errors = writer.close()
+            if errors:
+                logger.error(f"{len(errors)} converted files couldn't be written")
+
+    def get_output_path(self, entry: IndexedFile) -> Optional[str]:
+        """
+        Determine where an indexed journal or page file will be written.
+
+        Args:
+            entry: Index entry for the source file
+
+        Returns:
+            Output path, or None for journals whose name isn't a YYYY_MM_DD date
+        """
+        if entry.kind == "journal":
+            date_parts = self.journal_processor.extract_date_from_filename(
+                entry.filename
+            )
+            if not date_parts:
+                return None
+            year, month, day = date_parts
+            return os.path.join(self.step_2_dir, f"{year}-{month}-{day}.md")
+        output_dir = self._get_output_dir_for_file(entry.path, entry)
+        return os.path.join(output_dir, entry.filename)
+
+    def _record_file_result(self, file_path: str, processor) -> None:
+        """Record what the last file converted by processor contributed"""
+        wikilink_processor = processor.wikilink_processor
+        self.untagged_links[file_path] = wikilink_processor.file_untagged_links
+        if self.file_results is not None:
+            self.file_results[file_path] = get_file_collections(processor)
+
+    @staticmethod
+    def _file_size(file_path: str, entry: Optional[IndexedFile]) -> int:
+        """Size of a file in bytes, from its index entry if there is one"""
+        if entry is not None:
+            return entry.size
+        try:
+            return os.path.getsize(file_path)
+        except OSError:
+            return 0
+
+    def _run_parallel(
+        self, tasks: List[Task], sizes: List[int]
+    ) -> Iterator[Tuple[str, bool, bool, Optional[str]]]:
+        """
+        Convert files in a process pool, merging found tags and backlinks as results arrive.
+
+        Args:
+            tasks: List of (kind, file_path, output_path, content) tuples
+            sizes: Size in bytes of each task's file; the largest go first
+
+        Yields:
+            Tuples of (file_path, content_changed, success, error)
+        """
+        results = run_in_pool(
+            tasks,
+            self.jobs,
+            self.block_references_replacer,
+            self.dry_run,
+            self.categories_config,
+            self.stream_threshold,
+            sizes,
+            self.pool_report,
+        )
+        for result in results:
+            if not result.error:
+                self.untagged_links[result.file_path] = result.untagged_links
+            if self.file_results is not None and not result.error:
+                self.file_results[result.file_path] = (
+                    result.tags,
+                    result.backlinks,
+                    result.date_backlinks,
+                )
+            yield result.file_path, result.content_changed, result.success, result.error
+
     def process_journal_directory(self, journal_dir: str) -> Tuple[int, int, int]:
         """
         Process all markdown files in a journal directory and its subdirectories.
@@ -149,26 +340,59 @@ class DirectoryWalker:
         logger.info(f"Processing journal directory: {journal_dir}")
         logger.info(f"Output step_1 directory: {self.step_1_dir}")
         logger.info(f"Output step_2 directory: {self.step_2_dir}")
-        try:
-            for file_path in find_markdown_files(journal_dir):
-                # Journals always go to step_2
-                output_root = self.step_2_dir
-                try:
-                    content_change, file_renamed = self.journal_processor.process_file(
-                        file_path, output_root
-                    )
+        if self.jobs > 1:
+            try:
+                tasks = []
+                sizes = []
+                for file_path, entry in self._iter_files(journal_dir):
+                    content = entry.content if entry is not None else None
+                    tasks.append(("journal", file_path, self.step_2_dir, content))
+                    sizes.append(self._file_size(file_path, entry))
+                results = self._run_parallel(tasks, sizes)
+                for file_path, content_change, file_renamed, error in results:
+                    if error:
+                        logger.error(
+                            f"Error processing journal file {file_path}: {error}"
+                        )
+                        continue
                     total_files += 1
                     if content_change:
                         content_changed += 1
                     if file_renamed:
                         renamed += 1
-                except Exception as e:
-                    logger.error(f"Error processing journal file {file_path}: {e}")
+            except Exception as e:
+                # A worker crash (BrokenProcessPool) or a task that can't be
+                # pickled ends the pool; report it like a failed walk
+                logger.error(
+                    f"Error converting journal directory {journal_dir} in worker "
+                    f"processes: {e}"
+                )
+            return total_files, content_changed, renamed
+        try:
+            with self._write_behind(self.journal_processor):
+                for file_path, entry, content in self._iter_contents(journal_dir):
+                    # Journals always go to step_2
+                    output_root = self.step_2_dir
+                    try:
+                        reset_file_collections(self.journal_processor)
+                        content_change, file_renamed = (
+                            self.journal_processor.process_file(
+                                file_path, output_root, content=content
+                            )
+                        )
+                        self._record_file_result(file_path, self.journal_processor)
+                        total_files += 1
+                        if content_change:
+                            content_changed += 1
+                        if file_renamed:
+                            renamed += 1
+                    except Exception as e:
+                        logger.error(f"Error processing journal file {file_path}: {e}")
         except Exception as e:
             logger.error(f"Error walking journal directory {journal_dir}: {e}")
         return total_files, content_changed, renamed
 
-    def process_pages_directory(self, pages_dir: str) -> Tuple[int, int]:
+    def process_pages_directory(self, pages_dir: str) -> Tuple[int, int, int]:
         """
         Process all markdown files in a pages directory and its subdirectories.
 
@@ -176,33 +400,78 @@ class DirectoryWalker:
             pages_dir: Path to the pages directory
 
         Returns:
-            Tuple of (total_files, content_changed)
+            Tuple of (total_files, content_changed, aliases), aliases being the
+            number of processed pages routed to step_1
         """
         # Ensure both output directories exist
         if not self._ensure_output_directory(
             self.step_1_dir
         ) or not self._ensure_output_directory(self.step_2_dir):
-            return 0, 0
+            return 0, 0, 0
         total_files = 0
         content_changed = 0
+        aliases = 0
         logger.info(f"Processing pages directory: {pages_dir}")
         logger.info(f"Output step_1 directory: {self.step_1_dir}")
         logger.info(f"Output step_2 directory: {self.step_2_dir}")
-        try:
-            for file_path in find_markdown_files(pages_dir):
-                output_dir = self._get_output_dir_for_file(file_path)
-                output_path = os.path.join(output_dir, os.path.basename(file_path))
-                try:
-                    if not self.dry_run:
-                        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                    content_change, _ = self.page_processor.process_file(
-                        file_path, output_path
+        if self.jobs > 1:
+            try:
+                tasks = []
+                sizes = []
+                alias_pages = set()
+                # Each page is read once, here, to route it, and its content is
+                # sent to the worker converting it
+                for file_path, entry, content in self._iter_contents(pages_dir):
+                    output_dir = self._get_output_dir_for_file(
+                        file_path, entry, content
                     )
+                    if output_dir == self.step_1_dir:
+                        alias_pages.add(file_path)
+                    output_path = os.path.join(output_dir, os.path.basename(file_path))
+                    tasks.append(("page", file_path, output_path, content))
+                    sizes.append(self._file_size(file_path, entry))
+                results = self._run_parallel(tasks, sizes)
+                for file_path, content_change, _, error in results:
+                    if error:
+                        logger.error(
+                            f"Error processing page file {file_path}: {error}"
+                        )
+                        continue
                     total_files += 1
                     if content_change:
                         content_changed += 1
-                except Exception as e:
-                    logger.error(f"Error processing page file {file_path}: {e}")
+                    if file_path in alias_pages:
+                        aliases += 1
+            except Exception as e:
+                # A worker crash (BrokenProcessPool) or a task that can't be
+                # pickled ends the pool; report it like a failed walk
+                logger.error(
+                    f"Error converting pages directory {pages_dir} in worker "
+                    f"processes: {e}"
+                )
+            return total_files, content_changed, aliases
+        try:
+            with self._write_behind(self.page_processor):
+                for file_path, entry, content in self._iter_contents(pages_dir):
+                    output_dir = self._get_output_dir_for_file(
+                        file_path, entry, content
+                    )
+                    output_path = os.path.join(output_dir, os.path.basename(file_path))
+                    try:
+                        if not self.dry_run:
+                            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+                        reset_file_collections(self.page_processor)
+                        content_change, _ = self.page_processor.process_file(
+                            file_path, output_path, content=content
+                        )
+                        self._record_file_result(file_path, self.page_processor)
+                        total_files += 1
+                        if content_change:
+                            content_changed += 1
+                        if output_dir == self.step_1_dir:
+                            aliases += 1
+                    except Exception as e:
+                        logger.error(f"Error processing page file {file_path}: {e}")
         except Exception as e:
             logger.error(f"Error walking pages directory {pages_dir}: {e}")
-        return total_files, content_changed
+        return total_files, content_changed, aliases
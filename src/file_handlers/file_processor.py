@@ -1,26 +1,160 @@
 import os
 from src.processors.pipeline import ProcessorPipeline
-from typing import List
-from src.processors.base import ContentProcessor
+from typing import Callable, Iterator, List, Optional, Set, Tuple
+from src.processors.base import HEAD, ContentProcessor
+from src.processors.code_block_processor import CodeBlockProcessor
+from src.processors.blocks import block_spans
+from .pipelined_io import write_file
+
+# Pages with at least this many characters are converted block by block
+DEFAULT_STREAM_THRESHOLD = 4 * 1024 * 1024
+
+# Called with (block, position) around the pipeline when converting block by block
+BlockHook = Callable[[str, int], Tuple[str, bool]]
 
 
 class FileProcessor:
     """Base class for file processors, handling file I/O and delegating content processing to a ProcessorPipeline."""
 
-    def __init__(self, processors: List[ContentProcessor], dry_run: bool = False):
+    # Blocks of a page converted block by block are joined up to this many
+    # characters, so that small bullets don't each go through the pipeline
+    stream_block_size = 64 * 1024
+
+    def __init__(
+        self,
+        processors: List[ContentProcessor],
+        dry_run: bool = False,
+        stream_threshold: Optional[int] = DEFAULT_STREAM_THRESHOLD,
+    ):
         self.pipeline = ProcessorPipeline(processors)
         self.dry_run = dry_run
+        # If set to a WriteBehindWriter, outputs are queued to it instead of being
+        # written before process_file returns
+        self.writer = None
+        # Content with at least this many characters is converted and written
+        # block by block (None: always convert files in one piece)
+        self.stream_threshold = stream_threshold
+        self._moves_code_blocks = any(
+            isinstance(processor, CodeBlockProcessor) for processor in processors
+        )
+
+    def _should_stream(self, content: str) -> bool:
+        threshold = self.stream_threshold
+        return threshold is not None and len(content) >= threshold
+
+    def _block_spans(self, content: str) -> Iterator[Tuple[int, int, int]]:
+        """(start, end, position) of the blocks of content (see split_blocks)"""
+        return block_spans(content, self._moves_code_blocks, self.stream_block_size)
+
+    def _process_blocks(
+        self,
+        content: str,
+        output_path: Optional[str],
+        before: Optional[BlockHook] = None,
+        after: Optional[BlockHook] = None,
+    ) -> bool:
+        """
+        Convert a page block by block (see split_blocks) and write each converted
+        block as soon as it's done, so that only one block of the converted page
+        is in memory at a time. Outputs are written directly, not on self.writer.
+
+        Converting a whole page keeps the output of a processor that doesn't
+        report all its changes (see ContentProcessor.reports_all_changes) only
+        if it reports one somewhere in the page, which isn't known until every
+        block is converted. The blocks are converted assuming that every such
+        processor does, which holds for most large pages; otherwise the page is
+        converted again with the processors that did. Whether one reports a
+        change may depend on whether the output of the ones before it is kept,
+        so this is repeated until it settles, at least one more processor
+        settling each time (in pipeline order).
 
-    def process_file(self, file_path: str, output_path: str) -> tuple[bool, bool]:
+        Args:
+            content: Content of the page
+            output_path: Path of the converted page, or None to write nothing
+            before: Optional hook applied to each block before the pipeline
+            after: Optional hook applied to each block after the pipeline
+
+        Returns:
+            Whether any block changed
+        """
+        spans = list(self._block_spans(content))
+        reported = self.pipeline.inexact_indexes()
+        while True:
+            found = set()
+            content_changed = self._write_blocks(
+                content, spans, output_path, reported, found, before, after
+            )
+            if found == reported:
+                return content_changed
+            reported = found
+
+    def _write_blocks(
+        self,
+        content: str,
+        spans: List[Tuple[int, int, int]],
+        output_path: Optional[str],
+        reported: Set[int],
+        found: Set[int],
+        before: Optional[BlockHook],
+        after: Optional[BlockHook],
+    ) -> bool:
+        """Convert and write the blocks of a page (see ProcessorPipeline.process)"""
+        output = None
+        if output_path is not None:
+            output_dir = os.path.dirname(output_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            output = open(output_path, "w", encoding="utf-8")
+        try:
+            content_changed = False
+            for start, end, position in spans:
+                block = content[start:end]
+                if before is not None:
+                    block, changed = before(block, position)
+                    content_changed = content_changed or changed
+                block, changed = self.pipeline.process(
+                    block, position, reported, found
+                )
+                content_changed = content_changed or changed
+                if after is not None:
+                    block, changed = after(block, position)
+                    content_changed = content_changed or changed
+                if output is not None:
+                    if not position & HEAD:
+                        output.write("\n")
+                    output.write(block)
+            return content_changed
+        finally:
+            if output is not None:
+                output.close()
+
+    def _write_output(self, output_path: str, content: str) -> None:
+        """Write a converted file, or queue it on the write-behind writer"""
+        if self.writer is not None:
+            self.writer.submit(output_path, content)
+            return
+        write_file(output_path, content)
+
+    def process_file(
+        self, file_path: str, output_path: str, content: Optional[str] = None
+    ) -> tuple[bool, bool]:
         """
         Process a file and write the result to output_path.
+        If content is given (e.g. from a WorkspaceIndex), the file isn't read again.
         Returns:
             Tuple of (content_changed, success)
         """
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-            new_content, content_changed = self.pipeline.process(content)
+            if content is None:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    content = f.read()
+            if self._should_stream(content):
+                content_changed = self._process_blocks(
+                    content, None if self.dry_run else output_path
+                )
+                new_content = None
+            else:
+                new_content, content_changed = self.pipeline.process(content)
             if self.dry_run:
                 if content_changed:
                     print(f"Would update content in {file_path}")
@@ -35,8 +169,8 @@ class FileProcessor:
                     and not os.path.samefile(output_dir, os.getcwd())
                 ):
                     os.makedirs(output_dir, exist_ok=True)
-                with open(output_path, "w", encoding="utf-8") as f:
-                    f.write(new_content)
+                if new_content is not None:
+                    self._write_output(output_path, new_content)
                 return content_changed, True
         except Exception as e:
             print(f"Error processing {file_path}: {e}")
@@ -1,7 +1,7 @@
 import os
 import re
 from ..utils import DateFormatter
-from .file_processor import FileProcessor
+from .file_processor import DEFAULT_STREAM_THRESHOLD, FileProcessor
 from ..processors import (
     LinkProcessor,
     PropertiesProcessor,
@@ -33,8 +33,13 @@ class JournalFileProcessor(FileProcessor):
         block_references_replacer: Optional[BlockReferencesReplacer] = None,
         dry_run: bool = False,
         categories_config: str = None,  # Accept for compatibility
+        stream_threshold: Optional[int] = DEFAULT_STREAM_THRESHOLD,
     ):
         self.block_references_replacer = block_references_replacer
+        # Kept as attributes so callers can read what the last file contributed
+        self.tag_processor = TagToBacklinkProcessor(categories_config=categories_config)
+        self.backlink_collector = BacklinkCollector()
+        self.wikilink_processor = WikiLinkProcessor()
         processors = [LinkProcessor()]
         processors.append(PropertiesProcessor())
         processors.append(OrderedListProcessor())
@@ -49,16 +54,16 @@ class JournalFileProcessor(FileProcessor):
                 EmptyContentCleaner(),
                 IndentedBulletPointsProcessor(),
                 HeadingProcessor(),
-                TagToBacklinkProcessor(categories_config=categories_config),
-                WikiLinkProcessor(),
-                BacklinkCollector(),
+                self.tag_processor,
+                self.wikilink_processor,
+                self.backlink_collector,
                 ArrowsProcessor(),
                 EmptyLineBetweenBulletsProcessor(),
                 FirstContentIndentationProcessor(),
                 ImageProcessor(),
             ]
         )
-        super().__init__(processors, dry_run)
+        super().__init__(processors, dry_run, stream_threshold)
 
     def extract_date_from_filename(
         self, filename: str
@@ -68,9 +73,12 @@ class JournalFileProcessor(FileProcessor):
             return None
         return match.groups()
 
-    def process_file(self, file_path: str, output_dir: str) -> tuple[bool, bool]:
+    def process_file(
+        self, file_path: str, output_dir: str, content: Optional[str] = None
+    ) -> tuple[bool, bool]:
         """
         Process a journal file, add a date header, and write the result to output_dir.
+        If content is given (e.g. from a WorkspaceIndex), the file isn't read again.
         Returns:
             Tuple of (content_changed, success)
         """
@@ -89,21 +97,29 @@ class JournalFileProcessor(FileProcessor):
         output_path = os.path.join(output_dir, new_filename)
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-            new_content, content_changed = self.pipeline.process(content)
+            if content is None:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    content = f.read()
             date_processor = DateHeaderProcessor(formatted_date)
-            new_content, changed = date_processor.process(new_content)
-            content_changed = content_changed or changed
+            new_content = None
+            if self._should_stream(content):
+                content_changed = self._process_blocks(
+                    content,
+                    None if self.dry_run else output_path,
+                    after=date_processor.process_block,
+                )
+            else:
+                new_content, content_changed = self.pipeline.process(content)
+                new_content, changed = date_processor.process(new_content)
+                content_changed = content_changed or changed
             if self.dry_run:
                 if content_changed:
                     print(f"Would update content in {file_path}")
                 print(f"Would save to {output_path} (renamed from {filename})")
                 return content_changed, True
             else:
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                with open(output_path, "w", encoding="utf-8") as f:
-                    f.write(new_content)
+                if new_content is not None:
+                    self._write_output(output_path, new_content)
                 return content_changed, True
         except Exception as e:
             print(f"Error processing {file_path}: {e}")
@@ -1,10 +1,25 @@
 import os
 import logging
-from typing import Tuple, List, Dict, Any
+from typing import Tuple, List, Dict, Any, Optional
 from .directory_walker import DirectoryWalker
+from .file_processor import DEFAULT_STREAM_THRESHOLD
+from .workspace_index import WorkspaceIndex
+from .block_index import PersistentBlockIndex
+from .reflect_json import export_reflect_json
+from .watcher import WorkspaceWatcher, DEFAULT_POLL_INTERVAL
+from .manifest import (
+    ConversionManifest,
+    compute_config_hash,
+    hash_content,
+    find_block_refs,
+    find_link_targets,
+    block_refs_digest,
+    expand_block_refs,
+)
 from ..processors import BlockReferencesReplacer, TagToBacklinkProcessor
-from ..utils import find_markdown_files
 from ..processors.backlink_collector import BacklinkCollector
+from ..processors.pipeline import ProcessorPipeline
+from ..processors.title_table import TitleTable
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -21,6 +36,17 @@ class ConversionStats:
         self.pages_files_changed = 0
         self.files_in_step_1 = 0
         self.files_in_step_2 = 0
+        # Incremental runs only
+        self.files_unchanged = 0
+        self.outputs_removed = 0
+        # Block collection pre-pass
+        self.blocks_collected = 0
+        self.block_files_scanned = 0
+        self.block_files_skipped = 0
+        self.duplicate_block_ids = 0
+        self.block_collection_seconds = 0.0
+        # Parallel runs only: PoolReport of the worker processes
+        self.pool_report = None
 
     def add_journal_stats(self, files: int, changed: int, renamed: int) -> None:
         """Add journal directory processing statistics"""
@@ -58,8 +84,20 @@ class ConversionStats:
             f"  Files in step_1 (alias pages): {self.files_in_step_1}\n"
             f"  Files in step_2 (all other files): {self.files_in_step_2}\n"
             f"  Total files processed: {self.total_files}\n"
-            f"  Total files with changes: {self.total_changed}"
+            f"  Total files with changes: {self.total_changed}\n"
+            f"  Block collection: {self.blocks_collected} blocks from "
+            f"{self.block_files_scanned} files in "
+            f"{self.block_collection_seconds:.2f}s "
+            f"({self.block_files_skipped} files without block IDs skipped, "
+            f"{self.duplicate_block_ids} IDs defined in more than one file)"
         )
+        if self.files_unchanged or self.outputs_removed:
+            result += (
+                f"\n  Files skipped as unchanged (incremental): {self.files_unchanged}"
+                f"\n  Outputs removed for deleted sources: {self.outputs_removed}"
+            )
+        if self.pool_report is not None and self.pool_report.runs:
+            result += f"\n  Worker processes: {self.pool_report}"
         return result
 
 
@@ -72,6 +110,13 @@ class LogSeqToReflectConverter:
         output_dir: str = None,
         dry_run: bool = False,
         categories_config: str = None,
+        jobs: int = 1,
+        incremental: bool = False,
+        block_index: bool = False,
+        profile: bool = False,
+        json_export: str = None,
+        io_threads: int = 0,
+        stream_threshold: Optional[int] = DEFAULT_STREAM_THRESHOLD,
     ):
         """
         Initialize the LogSeq to Reflect converter.
@@ -82,12 +127,40 @@ class LogSeqToReflectConverter:
                        "<workspace> (Reflect format)" in the same parent directory
             dry_run: If True, show what would be changed without making changes
             categories_config: Path to categories config directory (types.txt, uppercase.txt)
+            jobs: Number of worker processes used to convert files (default: 1)
+            incremental: If True, only reconvert files whose inputs changed since the
+                         last incremental run (tracked in a manifest in output_dir)
+            block_index: If True, cache the collected blocks in output_dir so that
+                         only changed files are scanned for id:: properties
+                         (implied by incremental); every file is still read, as
+                         converting it needs its content
+            profile: If True, record per-processor statistics in self.profiler
+            json_export: Optional path of a Reflect JSON export to write from the
+                         converted notes
+            io_threads: If set, read the workspace on this many threads and write
+                        converted files on a background thread while the next ones
+                        are converted, so disk I/O overlaps with processing
+            stream_threshold: Convert and write files with at least this many
+                              characters block by block, so memory use stays
+                              proportional to the largest block (None: never)
         """
         self.workspace = os.path.abspath(workspace)
         self.output_dir = self._determine_output_dir(output_dir)
         self.dry_run = dry_run
         self.stats = ConversionStats()
         self.categories_config = categories_config
+        self.jobs = jobs
+        self.incremental = incremental
+        self.block_index = block_index or incremental
+        self.profile = profile
+        self.profiler = None
+        self.json_export = json_export
+        self.io_threads = io_threads
+        self.stream_threshold = stream_threshold
+        self.index = None
+        self.manifest = None
+        # Source path -> (rel_path, content_hash, output_rel, refs_digest, links)
+        self._incremental_inputs: Dict[str, Tuple[str, str, str, str, List[str]]] = {}
 
         # Initialize processors and walker
         self.block_references_replacer = BlockReferencesReplacer()
@@ -97,6 +170,9 @@ class LogSeqToReflectConverter:
             dry_run,
             self.block_references_replacer,
             categories_config=self.categories_config,
+            jobs=self.jobs,
+            io_threads=self.io_threads,
+            stream_threshold=self.stream_threshold,
         )
 
     def _determine_output_dir(self, output_dir: str = None) -> str:
@@ -119,18 +195,185 @@ class LogSeqToReflectConverter:
         """Process all pages directories"""
         for pages_dir in pages_dirs:
             logger.info(f"Processing pages directory: {pages_dir}")
-            # Count files with aliases before processing
-            alias_count = 0
-            try:
-                for file_path in find_markdown_files(pages_dir):
-                    if "___" in os.path.basename(file_path):
-                        alias_count += 1
-            except Exception as e:
-                logger.error(f"Error counting alias files: {e}")
-                alias_count = 0
-            # Process the directory
-            files, changed = self.walker.process_pages_directory(pages_dir)
-            self.stats.add_pages_stats(files, changed, alias_count)
+            # The walker counts the pages it routes to step_1 as it converts them
+            files, changed, aliases = self.walker.process_pages_directory(pages_dir)
+            self.stats.add_pages_stats(files, changed, aliases)
+
+    def _remove_output(self, output_rel: str) -> None:
+        """Remove a previously written output file (relative to the output dir)"""
+        output_path = os.path.join(self.output_dir, output_rel)
+        if not os.path.exists(output_path):
+            return
+        self.stats.outputs_removed += 1
+        if self.dry_run:
+            print(f"Would remove {output_path}")
+            return
+        try:
+            os.remove(output_path)
+        except Exception as e:
+            logger.error(f"Error removing {output_path}: {e}")
+
+    def _reconvert_late_tag_links(
+        self, journals_dirs: List[str], pages_dirs: List[str], seed_backlinks: set
+    ) -> None:
+        """
+        Reconvert the files that formatted a link as a page whose target turned
+        out to be a tag, found in a file converted after them or by another
+        worker process, so the output doesn't depend on the order in which
+        files are converted. Which tags a file contains doesn't depend on the
+        tags found elsewhere, so one round is enough.
+
+        Args:
+            journals_dirs: Journal directories of the workspace
+            pages_dirs: Pages directories of the workspace
+            seed_backlinks: Backlinks known before any file was converted
+        """
+        walker = self.walker
+        retry = {
+            path
+            for path, links in walker.untagged_links.items()
+            if any(TagToBacklinkProcessor.is_tag(link) for link in links)
+        }
+        if not retry:
+            return
+        logger.info(f"Reconverting {len(retry)} files that link to tags found later")
+        selected = walker.selected_paths
+        walker.selected_paths = retry
+        try:
+            for journal_dir in journals_dirs:
+                walker.process_journal_directory(journal_dir)
+            for pages_dir in pages_dirs:
+                walker.process_pages_directory(pages_dir)
+        finally:
+            walker.selected_paths = selected
+        # Drop the backlinks to the pages those links were first formatted as
+        found_backlinks = BacklinkCollector.found_backlinks
+        found_backlinks.clear()
+        found_backlinks.update(seed_backlinks)
+        for _, backlinks, _ in walker.file_results.values():
+            found_backlinks.update(backlinks)
+
+    def _plan_incremental(self) -> None:
+        """
+        Compare the workspace against the manifest of the previous run, select the
+        files that need reconverting, seed the tag/backlink registries with what the
+        unchanged files contributed last time, and remove outputs of deleted sources.
+        """
+        self.manifest = ConversionManifest.load(
+            self.output_dir, compute_config_hash(self.categories_config)
+        )
+        TagToBacklinkProcessor.found_tags.clear()
+        replacer = self.block_references_replacer
+        block_map = replacer.block_map
+        self._incremental_inputs = {}
+        selected = set()
+        for entry in self.index.files:
+            rel_path = os.path.relpath(entry.path, self.workspace)
+            output_path = self.walker.get_output_path(entry)
+            output_rel = (
+                os.path.relpath(output_path, self.output_dir) if output_path else None
+            )
+            content = entry.content or ""
+            block_refs = expand_block_refs(find_block_refs(content), block_map)
+            links = find_link_targets(content)
+            for block_id in block_refs:
+                if block_id in block_map:
+                    page_name = block_map[block_id][1]
+                    links.add(replacer._format_page_name_for_link(page_name).lower())
+            refs_digest = block_refs_digest(block_refs, block_map)
+            content_hash = hash_content(content)
+            self._incremental_inputs[entry.path] = (
+                rel_path,
+                content_hash,
+                output_rel,
+                refs_digest,
+                sorted(links),
+            )
+            up_to_date = (
+                entry.content is not None
+                and self.manifest.is_up_to_date(
+                    rel_path, content_hash, output_rel, refs_digest
+                )
+                and (output_path is None or os.path.exists(output_path))
+            )
+            if up_to_date:
+                previous = self.manifest.files[rel_path]
+                TagToBacklinkProcessor.register_tags(previous.get("tags", []))
+                BacklinkCollector.merge_backlinks(
+                    set(previous.get("backlinks", [])),
+                    previous.get("date_backlinks", {}),
+                )
+            else:
+                selected.add(entry.path)
+
+        # Remove outputs of deleted sources, and old outputs of re-routed sources
+        current = {inputs[0]: inputs[2] for inputs in self._incremental_inputs.values()}
+        current_outputs = set(current.values())
+        for rel_path, previous in list(self.manifest.files.items()):
+            old_output = previous.get("output")
+            if rel_path not in current:
+                del self.manifest.files[rel_path]
+            elif current[rel_path] == old_output:
+                continue
+            if old_output and old_output not in current_outputs:
+                self._remove_output(old_output)
+
+        self.stats.files_unchanged = len(self.index.files) - len(selected)
+        logger.info(
+            f"Incremental run: {len(selected)} files to convert, "
+            f"{self.stats.files_unchanged} unchanged"
+        )
+        self.walker.selected_paths = selected
+        self.walker.file_results = {}
+
+    def _finish_incremental(
+        self, journals_dirs: List[str], pages_dirs: List[str]
+    ) -> None:
+        """
+        Reconvert unchanged files whose links now resolve differently because the
+        set of tags changed, then record every converted file in the manifest.
+        """
+        found_tags = TagToBacklinkProcessor.found_tags
+        file_results = self.walker.file_results
+        retry = set()
+        for path, (rel_path, _, _, _, links) in self._incremental_inputs.items():
+            previous = self.manifest.files.get(rel_path)
+            if path in file_results or previous is None:
+                continue
+            if sorted(found_tags.intersection(links)) != previous.get("tag_hits", []):
+                retry.add(path)
+        if retry:
+            logger.info(f"Reconverting {len(retry)} files affected by tag changes")
+            self.stats.files_unchanged -= len(retry)
+            self.walker.selected_paths = retry
+            self._process_journal_directories(journals_dirs)
+            self._process_pages_directories(pages_dirs)
+
+        for path, (tags, backlinks, date_backlinks) in file_results.items():
+            rel_path, content_hash, output_rel, refs_digest, links = (
+                self._incremental_inputs[path]
+            )
+            self.manifest.files[rel_path] = {
+                "hash": content_hash,
+                "output": output_rel,
+                "refs_digest": refs_digest,
+                "links": links,
+                "tag_hits": sorted(found_tags.intersection(links)),
+                "tags": sorted(tags),
+                "backlinks": sorted(backlinks),
+                "date_backlinks": date_backlinks,
+            }
+
+        # Remove tag pages of tags that no longer appear anywhere
+        for tag in self.manifest.tags:
+            if tag not in found_tags:
+                self._remove_output(os.path.join("step_1", f"{tag}.md"))
+        self.manifest.tags = sorted(found_tags)
+
+        self.walker.selected_paths = None
+        self.walker.file_results = None
+        if not self.dry_run:
+            self.manifest.save()
 
     def run(self) -> ConversionStats:
         """
@@ -139,9 +382,20 @@ class LogSeqToReflectConverter:
         Returns:
             ConversionStats object with conversion statistics
         """
+        if not self.profile:
+            return self._run()
+        self.profiler = ProcessorPipeline.enable_profiling()
+        try:
+            return self._run()
+        finally:
+            ProcessorPipeline.disable_profiling()
+
+    def _run(self) -> ConversionStats:
         logger.info(f"Converting LogSeq workspace: {self.workspace}")
         logger.info(f"Output directory: {self.output_dir}")
         logger.info(f"Dry run: {self.dry_run}")
+        if self.jobs > 1:
+            logger.info(f"Converting files with {self.jobs} worker processes")
         logger.info("Using step_1/step_2 directory organization (default)")
         # Create output directory and subdirectories if needed
         if not self.dry_run:
@@ -149,12 +403,35 @@ class LogSeqToReflectConverter:
             os.makedirs(os.path.join(self.output_dir, "step_1"), exist_ok=True)
             os.makedirs(os.path.join(self.output_dir, "step_2"), exist_ok=True)
 
+        # Scan the workspace once; every later phase reads from this index
+        self.index = WorkspaceIndex.scan(self.workspace, self.io_threads)
+        self.walker.index = self.index
+        logger.info(f"Indexed {len(self.index.files)} markdown files")
+        # Page names and aliases keep their formatted titles for the whole run
+        TitleTable.register_workspace(self.index)
+
         # Pre-collect dates from the workspace
         BacklinkCollector.clear_backlinks()
-        BacklinkCollector.collect_dates_from_workspace(self.workspace)
+        BacklinkCollector.collect_dates_from_workspace(self.workspace, self.index)
 
         # Collect block references from all files
-        self.block_references_replacer.collect_blocks(self.workspace)
+        block_index = None
+        if self.block_index:
+            # The index has already read every file, as converting needs them, so
+            # the cache saves scanning unchanged files for blocks, not reading them.
+            # A dry run never creates the output directory, so it only reads the cache
+            block_index = PersistentBlockIndex.for_output_dir(
+                self.output_dir, read_only=self.dry_run
+            )
+        replacer = self.block_references_replacer
+        replacer.collect_blocks(self.workspace, self.index, block_index, self.jobs)
+        self.stats.blocks_collected = len(replacer.block_map)
+        self.stats.block_files_scanned = replacer.files_scanned
+        self.stats.block_files_skipped = replacer.files_skipped
+        self.stats.duplicate_block_ids = replacer.duplicate_block_ids
+        self.stats.block_collection_seconds = replacer.collect_seconds
+        if self.incremental:
+            self._plan_incremental()
         # Find directories to process
         journals_dirs = self.walker.find_directories("journals")
         pages_dirs = self.walker.find_directories("pages")
@@ -167,9 +444,24 @@ class LogSeqToReflectConverter:
             logger.info(f"Found {len(pages_dirs)} pages directories")
         else:
             logger.info("No pages directories found")
+        # Record what each file contributes, so the backlinks can be rebuilt if
+        # files are reconverted (incremental runs and the watcher already do)
+        walker = self.walker
+        own_results = walker.file_results is None
+        if own_results:
+            walker.file_results = {}
+        walker.untagged_links = {}
+        seed_backlinks = set(BacklinkCollector.found_backlinks)
         # Process all directories
         self._process_journal_directories(journals_dirs)
         self._process_pages_directories(pages_dirs)
+        self._reconvert_late_tag_links(journals_dirs, pages_dirs, seed_backlinks)
+        if own_results:
+            walker.file_results = None
+        if self.jobs > 1:
+            self.stats.pool_report = self.walker.pool_report
+        if self.incremental:
+            self._finish_incremental(journals_dirs, pages_dirs)
         # --- Tag page generation ---
         tag_dir = os.path.join(self.output_dir, "step_1")
         for tag in TagToBacklinkProcessor.found_tags:
@@ -187,6 +479,13 @@ class LogSeqToReflectConverter:
             )
             BacklinkCollector.write_to_file(backlinks_file)
 
+        # --- Reflect JSON export, streamed from the converted notes ---
+        if self.json_export and not self.dry_run:
+            notes = export_reflect_json(
+                self.output_dir, self.json_export, TagToBacklinkProcessor.found_tags
+            )
+            logger.info(f"Wrote {notes} notes to {self.json_export}")
+
         # Return stats for reporting
         return self.stats
 
@@ -219,6 +518,70 @@ def main():
         "--categories-config",
         help="Path to categories config directory (containing types.txt and uppercase.txt)",
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of worker processes used to convert files (default: 1)",
+    )
+    parser.add_argument(
+        "--io-threads",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Read and write files on N background threads, overlapping disk I/O "
+        "with conversion (default: 0, synchronous I/O)",
+    )
+    parser.add_argument(
+        "--stream-threshold",
+        type=int,
+        default=DEFAULT_STREAM_THRESHOLD,
+        metavar="CHARS",
+        help="Convert files of at least CHARS characters block by block to bound "
+        f"memory use (default: {DEFAULT_STREAM_THRESHOLD}, negative to disable)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only reconvert files whose inputs changed since the last incremental run",
+    )
+    parser.add_argument(
+        "--block-index",
+        action="store_true",
+        help=(
+            "Cache the blocks found in each file in the output dir, so unchanged "
+            "files aren't rescanned for id:: properties (implied by --incremental)"
+        ),
+    )
+    parser.add_argument(
+        "--json-export",
+        metavar="PATH",
+        help="Also write the converted notes as a single Reflect JSON export",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and reconvert files as the workspace changes",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        metavar="SECONDS",
+        help=f"Seconds between checks for changes in watch mode "
+        f"(default: {DEFAULT_POLL_INTERVAL})",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print time spent in each content processor at the end of the run",
+    )
+    parser.add_argument(
+        "--profile-json",
+        metavar="PATH",
+        help="Write the per-processor statistics to a JSON file (implies --profile)",
+    )
     parser.add_argument(
         "--verbose", "-v", action="store_true", help="Enable verbose output"
     )
@@ -236,21 +599,46 @@ def main():
         output_dir=args.output_dir,
         dry_run=args.dry_run,
         categories_config=args.categories_config,
+        jobs=args.jobs,
+        incremental=args.incremental,
+        block_index=args.block_index,
+        profile=args.profile or bool(args.profile_json),
+        json_export=args.json_export,
+        io_threads=args.io_threads,
+        stream_threshold=(
+            args.stream_threshold if args.stream_threshold >= 0 else None
+        ),
     )
-    stats = converter.run()
+    watcher = None
+    if args.watch:
+        watcher = WorkspaceWatcher(converter, args.watch_interval)
+        stats = watcher.start()
+    else:
+        stats = converter.run()
     # Print statistics
     print("\nConversion Statistics:")
     print(stats)
     # Print information about the two-step output structure
     print("\nOutput Directory Structure:")
     print(
-        f"  step_1/ - Contains {stats.files_in_step_1} pages with aliases (files with '___' in original filename)"
+        f"  step_1/ - Contains {stats.files_in_step_1} pages with aliases (alias:: property or '___' in the filename)"
     )
     print(
         f"  step_2/ - Contains {stats.files_in_step_2} other pages and journal entries"
     )
+    if converter.profiler is not None:
+        print("\nProcessor Profile:")
+        print(converter.profiler.format_table())
+        if args.profile_json and converter.profiler.write_json(args.profile_json):
+            print(f"\nProfile written to {args.profile_json}")
     if args.dry_run:
         print("\nRun without --dry-run to apply these changes.")
+    if watcher is not None:
+        print(f"\nWatching {converter.workspace} for changes (press Ctrl+C to stop)")
+        try:
+            watcher.watch()
+        except KeyboardInterrupt:
+            print("\nStopped watching.")
 
 
 __all__ = ["main"]
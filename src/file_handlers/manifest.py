@@ -0,0 +1,226 @@
+import os
+import re
+import json
+import hashlib
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..processors.block_references import BlockReferencePatterns
+from ..processors import page_title
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = ".logseq-to-reflect-manifest.json"
+# Bump when the conversion output changes, so stale manifests trigger a full rebuild
+MANIFEST_VERSION = 6
+# The package whose source code is part of the config hash (see
+# converter_fingerprint)
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_converter_fingerprint: Optional[str] = None
+
+BLOCK_REF_ID_PATTERN = re.compile(
+    r"\(\((" + BlockReferencePatterns.UUID_PATTERN + r")\)\)"
+)
+WIKILINK_PATTERN = re.compile(r"\[\[(.*?)\]\]")
+
+
+def hash_content(content: str) -> str:
+    """Return a short, stable hash of a text"""
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def converter_fingerprint() -> str:
+    """
+    Hash the converter's own source code (every module of the package), so
+    that outputs written by a different version of the converter are rebuilt
+    even if MANIFEST_VERSION wasn't bumped. Computed once per process.
+    """
+    global _converter_fingerprint
+    if _converter_fingerprint is None:
+        digest = hashlib.blake2b(digest_size=16)
+        for dir_path, dir_names, file_names in os.walk(PACKAGE_DIR):
+            dir_names[:] = sorted(d for d in dir_names if d != "__pycache__")
+            for name in sorted(file_names):
+                if not name.endswith(".py"):
+                    continue
+                path = os.path.join(dir_path, name)
+                rel_path = os.path.relpath(path, PACKAGE_DIR).replace(os.sep, "/")
+                digest.update(b"\0" + rel_path.encode("utf-8") + b"\0")
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+        _converter_fingerprint = digest.hexdigest()
+    return _converter_fingerprint
+
+
+def compute_config_hash(categories_config: Optional[str] = None) -> str:
+    """
+    Hash everything besides the source files that affects the output: the
+    manifest version, the converter's source code and the contents of the
+    categories config files. Config files are hashed by role, not path, so
+    moving the checkout or the config directory doesn't force a rebuild.
+
+    Args:
+        categories_config: Optional path to the categories config directory
+    """
+    names = ("uppercase.txt", "types.txt", "lowercase.txt")
+    files = [
+        ("default", page_title.UPPERCASE_PATH),
+        ("default", page_title.TYPES_PATH),
+        ("default", os.path.join(page_title.CATEGORIES_DIR, "lowercase.txt")),
+    ]
+    if categories_config:
+        files += [("custom", os.path.join(categories_config, name)) for name in names]
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(MANIFEST_VERSION).encode("utf-8"))
+    digest.update(converter_fingerprint().encode("utf-8"))
+    for role, path in files:
+        name = os.path.basename(path)
+        digest.update(b"\0" + f"{role}/{name}".encode("utf-8") + b"\0")
+        try:
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(b"<missing>")
+    return digest.hexdigest()
+
+
+def find_block_refs(content: str) -> Set[str]:
+    """Return the block ids referenced (or embedded) in the content"""
+    return set(BLOCK_REF_ID_PATTERN.findall(content))
+
+
+def find_link_targets(content: str) -> Set[str]:
+    """Return the lowercased [[wikilink]] targets in the content"""
+    return {target.lower() for target in WIKILINK_PATTERN.findall(content)}
+
+
+def expand_block_refs(
+    block_refs: Iterable[str], block_map: Dict[str, Tuple[str, str]]
+) -> Set[str]:
+    """
+    Return the block ids whose text ends up in a file referencing block_refs:
+    the ids themselves and, transitively, the blocks referenced in their text
+    (see BlockReferencesReplacer._resolve_block_link). Each block is visited
+    once, so reference cycles end.
+    """
+    expanded: Set[str] = set()
+    pending = list(block_refs)
+    while pending:
+        block_id = pending.pop()
+        if block_id in expanded:
+            continue
+        expanded.add(block_id)
+        block = block_map.get(block_id)
+        if block is not None and "((" in block[0]:
+            pending.extend(find_block_refs(block[0]))
+    return expanded
+
+
+def block_refs_digest(
+    block_refs: Iterable[str], block_map: Dict[str, Tuple[str, str]]
+) -> str:
+    """
+    Hash the current resolution of a file's block references, so that a change
+    to (or removal of) any referenced block marks the file for reconversion.
+    block_refs should include the blocks referenced indirectly (see
+    expand_block_refs).
+    """
+    resolved = [
+        [block_id, list(block_map[block_id]) if block_id in block_map else None]
+        for block_id in sorted(block_refs)
+    ]
+    return hash_content(json.dumps(resolved, ensure_ascii=False))
+
+
+class ConversionManifest:
+    """
+    Persistent record of the previous conversion, stored in the output directory.
+
+    Each source file (keyed by its path relative to the workspace) maps to:
+        hash:           hash of the source content
+        output:         output path relative to the output directory
+        refs_digest:    hash of the block references it resolved (see block_refs_digest)
+        links:          lowercased wikilink targets, whose rendering depends on tags
+        tag_hits:       the links that resolved to tags
+        tags:           tags found in the file
+        backlinks:      backlinks found in the file
+        date_backlinks: formatted date -> YYYY/MM/DD mappings found in the file
+    """
+
+    def __init__(
+        self,
+        path: str,
+        config_hash: str,
+        files: Optional[Dict[str, Dict[str, Any]]] = None,
+        tags: Optional[List[str]] = None,
+    ):
+        self.path = path
+        self.config_hash = config_hash
+        self.files: Dict[str, Dict[str, Any]] = files or {}
+        # Tags whose tag pages were written by the previous run
+        self.tags: List[str] = tags or []
+
+    @classmethod
+    def load(cls, output_dir: str, config_hash: str) -> "ConversionManifest":
+        """
+        Load the manifest from the output directory.
+
+        Returns an empty manifest (meaning: reconvert everything) if there is no
+        manifest, it can't be read, or it was written with a different manifest
+        version, converter or config.
+        """
+        path = os.path.join(output_dir, MANIFEST_FILENAME)
+        if not os.path.exists(path):
+            return cls(path, config_hash)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.error(f"Error reading manifest {path}: {e}")
+            return cls(path, config_hash)
+        if (
+            data.get("version") != MANIFEST_VERSION
+            or data.get("config_hash") != config_hash
+        ):
+            logger.info(
+                "Converter or configuration changed since last run, "
+                "reconverting everything"
+            )
+            # Keep the old entries' outputs and tags around so they can be cleaned up
+            stale = {
+                rel: {"output": entry.get("output")}
+                for rel, entry in data.get("files", {}).items()
+            }
+            return cls(path, config_hash, stale, data.get("tags", []))
+        return cls(path, config_hash, data.get("files", {}), data.get("tags", []))
+
+    def save(self) -> bool:
+        """Write the manifest to disk, returning True on success"""
+        data = {
+            "version": MANIFEST_VERSION,
+            "config_hash": self.config_hash,
+            "tags": sorted(self.tags),
+            "files": self.files,
+        }
+        try:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, sort_keys=True)
+            os.replace(tmp_path, self.path)
+            return True
+        except Exception as e:
+            logger.error(f"Error writing manifest {self.path}: {e}")
+            return False
+
+    def is_up_to_date(
+        self, rel_path: str, content_hash: str, output: Optional[str], refs_digest: str
+    ) -> bool:
+        """Check whether a file's recorded conversion is still valid for these inputs"""
+        entry = self.files.get(rel_path)
+        return (
+            entry is not None
+            and entry.get("hash") == content_hash
+            and entry.get("output") == output
+            and entry.get("refs_digest") == refs_digest
+        )
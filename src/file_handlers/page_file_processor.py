@@ -1,5 +1,6 @@
 import os
-from .file_processor import FileProcessor
+import time
+from .file_processor import DEFAULT_STREAM_THRESHOLD, FileProcessor
 from ..processors import (
     LinkProcessor,
     PropertiesProcessor,
@@ -21,7 +22,10 @@ from ..processors.ordered_list_processor import OrderedListProcessor
 from ..processors.arrows_processor import ArrowsProcessor
 from ..processors.empty_line_processor import EmptyLineBetweenBulletsProcessor
 from ..processors.backlink_collector import BacklinkCollector
-from typing import Optional
+from ..processors.categories_config import CategoriesConfig
+from ..processors.base import WHOLE
+from ..processors.pipeline import ProcessorPipeline
+from typing import Optional, Tuple
 
 
 class PageFileProcessor(FileProcessor):
@@ -32,9 +36,17 @@ class PageFileProcessor(FileProcessor):
         block_references_replacer: Optional[BlockReferencesReplacer] = None,
         dry_run: bool = False,
         categories_config: str = None,
+        stream_threshold: Optional[int] = DEFAULT_STREAM_THRESHOLD,
     ):
         self.block_references_replacer = block_references_replacer
         self.categories_config = categories_config
+        config = CategoriesConfig.load(categories_config)
+        # One title processor for every page; the filename is passed per file
+        self.title_processor = PageTitleProcessor(config=config)
+        # Kept as attributes so callers can read what the last file contributed
+        self.tag_processor = TagToBacklinkProcessor(categories_config=categories_config)
+        self.backlink_collector = BacklinkCollector()
+        self.wikilink_processor = WikiLinkProcessor(categories_config=categories_config)
         processors = [LinkProcessor()]
         processors.append(PropertiesProcessor())
         processors.append(OrderedListProcessor())
@@ -50,55 +62,87 @@ class PageFileProcessor(FileProcessor):
                 CodeBlockProcessor(),
                 IndentedBulletPointsProcessor(),
                 HeadingProcessor(),
-                TagToBacklinkProcessor(categories_config=categories_config),
-                (
-                    WikiLinkProcessor(categories_config=categories_config)
-                    if categories_config
-                    else WikiLinkProcessor()
-                ),
-                BacklinkCollector(),
+                self.tag_processor,
+                self.wikilink_processor,
+                self.backlink_collector,
                 ArrowsProcessor(),
                 EmptyLineBetweenBulletsProcessor(),
                 FirstContentIndentationProcessor(),
                 ImageProcessor(),
             ]
         )
-        super().__init__(processors, dry_run)
+        super().__init__(processors, dry_run, stream_threshold)
 
-    def process_file(self, file_path: str, output_path: str) -> tuple[bool, bool]:
+    def _add_title(
+        self, content: str, filename: str, position: int = WHOLE
+    ) -> Tuple[str, bool]:
+        """Run the title processor on a page (or one of its blocks)"""
+        if not position & WHOLE:
+            # Blocks in the middle of the page keep their content
+            return content, False
+        profiler = ProcessorPipeline.profiler
+        start = time.perf_counter()
+        new_content, changed = self.title_processor.process_block(
+            content, position, filename
+        )
+        if profiler is not None:
+            profiler.record(
+                "PageTitleProcessor",
+                time.perf_counter() - start,
+                len(content.encode("utf-8")),
+                len(new_content.encode("utf-8")),
+                changed,
+            )
+        return new_content, changed
+
+    def _stream_file(self, content: str, filename: str, output_path: str):
+        """
+        Convert a large page block by block, unless its alias:: property (which
+        the title is built from) is past the first block.
+
+        Returns:
+            Whether the content changed, or None if the page must be converted
+            in one piece
+        """
+        _, head_end, _ = next(self._block_spans(content))
+        if content.find("alias:: ") >= head_end:
+            return None
+        return self._process_blocks(
+            content,
+            None if self.dry_run else output_path,
+            before=lambda block, position: self._add_title(block, filename, position),
+        )
+
+    def process_file(
+        self, file_path: str, output_path: str, content: Optional[str] = None
+    ) -> tuple[bool, bool]:
         """
         Process a page file, add a page title, and write the result to output_path.
+        If content is given (e.g. from a WorkspaceIndex), the file isn't read again.
         Returns:
             Tuple of (content_changed, success)
         """
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-            # Add PageTitleProcessor with the correct filename at the start
-            if self.categories_config:
-                uppercase_path = os.path.join(self.categories_config, "uppercase.txt")
-                types_path = os.path.join(self.categories_config, "types.txt")
-                lowercase_path = os.path.join(self.categories_config, "lowercase.txt")
-                title_processor = PageTitleProcessor(
-                    os.path.basename(file_path),
-                    uppercase_path=uppercase_path,
-                    types_path=types_path,
-                    lowercase_path=lowercase_path,
-                )
-            else:
-                title_processor = PageTitleProcessor(os.path.basename(file_path))
-            new_content, content_changed = title_processor.process(content)
-            new_content, changed = self.pipeline.process(new_content)
-            content_changed = content_changed or changed
+            if content is None:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    content = f.read()
+            filename = os.path.basename(file_path)
+            content_changed = None
+            if self._should_stream(content):
+                content_changed = self._stream_file(content, filename, output_path)
+            new_content = None
+            if content_changed is None:
+                new_content, content_changed = self._add_title(content, filename)
+                new_content, changed = self.pipeline.process(new_content)
+                content_changed = content_changed or changed
             if self.dry_run:
                 if content_changed:
                     print(f"Would update content in {file_path}")
                 print(f"Would save to {output_path}")
                 return content_changed, True
             else:
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                with open(output_path, "w", encoding="utf-8") as f:
-                    f.write(new_content)
+                if new_content is not None:
+                    self._write_output(output_path, new_content)
                 return content_changed, True
         except Exception as e:
             print(f"Error processing {file_path}: {e}")
@@ -0,0 +1,358 @@
+import copy
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from .file_processor import DEFAULT_STREAM_THRESHOLD
+from .journal_file_processor import JournalFileProcessor
+from .page_file_processor import PageFileProcessor
+from .shared_block_map import SharedBlockMap
+from ..processors.block_references import BlockReferencesReplacer
+from ..processors.backlink_collector import BacklinkCollector
+from ..processors.tag_to_backlink import TagToBacklinkProcessor, TagRegistry
+from ..processors.pipeline import ProcessorPipeline
+from ..processors.title_table import TitleTable
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class FileResult(NamedTuple):
+    """Result of converting one file in a worker"""
+
+    file_path: str
+    content_changed: bool
+    success: bool
+    tags: Set[str]
+    backlinks: Set[str]
+    date_backlinks: Dict[str, str]
+    error: Optional[str]
+    # The worker's profiler counters when profiling
+    profile: Optional[Dict[str, List[float]]]
+    # Links formatted as pages, not tags
+    untagged_links: Set[str]
+
+
+# A file for a worker to convert: (kind, file_path, output_path, content), where
+# kind is "journal" or "page" and content is the file's content when the parent
+# already has it (from a WorkspaceIndex), None for the worker to read the file
+Task = Tuple[str, str, str, Optional[str]]
+
+# Files of up to this many bytes are sent to workers in chunks of about this
+# size, so a journal of tiny files doesn't cost one round trip per file
+CHUNK_BYTES = 64 * 1024
+
+# Per-process state, populated by init_worker in each pool process
+_worker_processors: Dict[str, object] = {}
+
+
+def init_worker(
+    block_references_replacer: Optional[BlockReferencesReplacer],
+    dry_run: bool,
+    categories_config: Optional[str],
+    found_tags: Set[str],
+    date_backlinks: Dict[str, str],
+    profile: bool = False,
+    stream_threshold: Optional[int] = DEFAULT_STREAM_THRESHOLD,
+    graph_names: Set[str] = frozenset(),
+    block_map_path: Optional[str] = None,
+) -> None:
+    """
+    Initialize a pool process with its own file processors and a copy of the
+    registries built by the parent before the pool was started. If a block map
+    file is given, the replacer looks its blocks up there (see SharedBlockMap)
+    instead of in a block map of its own.
+    """
+    if profile:
+        ProcessorPipeline.enable_profiling()
+    else:
+        ProcessorPipeline.disable_profiling()
+    TagToBacklinkProcessor.found_tags = TagRegistry(found_tags)
+    BacklinkCollector.found_backlinks = set()
+    BacklinkCollector.date_backlinks = dict(date_backlinks)
+    TitleTable.graph_names = set(graph_names)
+    if block_map_path is not None:
+        block_references_replacer.block_map = SharedBlockMap(block_map_path)
+    _worker_processors["journal"] = JournalFileProcessor(
+        block_references_replacer,
+        dry_run,
+        categories_config=categories_config,
+        stream_threshold=stream_threshold,
+    )
+    _worker_processors["page"] = PageFileProcessor(
+        block_references_replacer,
+        dry_run,
+        categories_config=categories_config,
+        stream_threshold=stream_threshold,
+    )
+
+
+def reset_file_collections(processor) -> None:
+    """Reset what a file processor tracks per file (tags, backlinks, date mappings)"""
+    # The pipeline skips processors on empty content and when their triggers are
+    # absent, so stale values would leak
+    processor.tag_processor.file_tags = set()
+    processor.backlink_collector.file_backlinks = set()
+    processor.backlink_collector.file_date_backlinks = {}
+    processor.wikilink_processor.file_untagged_links = set()
+
+
+def get_file_collections(processor) -> Tuple[Set[str], Set[str], Dict[str, str]]:
+    """Return the (tags, backlinks, date_backlinks) found in the last processed file"""
+    return (
+        processor.tag_processor.file_tags,
+        processor.backlink_collector.file_backlinks,
+        processor.backlink_collector.file_date_backlinks,
+    )
+
+
+def convert_file(task: Task) -> FileResult:
+    """
+    Convert a single file inside a pool process.
+
+    Args:
+        task: Tuple of (kind, file_path, output_path, content) where kind is
+              "journal" or "page"; the file is read here when content is None
+
+    Returns:
+        FileResult with the tags and backlinks this file contributed
+    """
+    kind, file_path, output_path, content = task
+    processor = _worker_processors[kind]
+    reset_file_collections(processor)
+    profiler = ProcessorPipeline.profiler
+    try:
+        content_changed, success = processor.process_file(
+            file_path, output_path, content=content
+        )
+    except Exception as e:
+        profile = profiler.take() if profiler else None
+        return FileResult(
+            file_path, False, False, set(), set(), {}, str(e), profile, set()
+        )
+    tags, backlinks, date_backlinks = get_file_collections(processor)
+    profile = profiler.take() if profiler else None
+    return FileResult(
+        file_path,
+        content_changed,
+        success,
+        tags,
+        backlinks,
+        date_backlinks,
+        None,
+        profile,
+        processor.wikilink_processor.file_untagged_links,
+    )
+
+
+def convert_chunk(tasks: List[Task]) -> Tuple[List[FileResult], int, float, float]:
+    """
+    Convert a chunk of files inside a pool process.
+
+    Args:
+        tasks: List of (kind, file_path, output_path, content) tuples
+
+    Returns:
+        Tuple of (results, pid, start, end): one FileResult per task, and which
+        process converted the chunk from when to when (time.time() seconds)
+    """
+    start = time.time()
+    results = [convert_file(task) for task in tasks]
+    return results, os.getpid(), start, time.time()
+
+
+def plan_chunks(
+    sizes: List[int], jobs: int, chunk_bytes: int = CHUNK_BYTES
+) -> List[List[int]]:
+    """
+    Order tasks largest first and group the small ones into chunks.
+
+    Handing the largest remaining file to whichever worker is free first (the
+    LPT heuristic) leaves only small files for the end of the run, so the
+    workers finish close together instead of one of them converting a big page
+    while the others wait. Files smaller than chunk_bytes are grouped into
+    chunks of about chunk_bytes, and at most as many files as the fixed
+    chunksize used without sizes, which keeps the last chunks short.
+
+    Args:
+        sizes: Size in bytes of each task
+        jobs: Number of worker processes
+        chunk_bytes: Bytes of small files to send to a worker at once
+
+    Returns:
+        Chunks of task indexes, in the order they should be dispatched
+    """
+    max_files = max(1, len(sizes) // (jobs * 4))
+    order = sorted(range(len(sizes)), key=lambda index: -sizes[index])
+    chunks: List[List[int]] = []
+    chunk: List[int] = []
+    chunk_size = 0
+    for index in order:
+        chunk.append(index)
+        chunk_size += sizes[index]
+        if chunk_size >= chunk_bytes or len(chunk) >= max_files:
+            chunks.append(chunk)
+            chunk = []
+            chunk_size = 0
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+class PoolReport:
+    """
+    How busy the worker processes of one or more pool runs were, and in
+    particular how long they sat idle at the tail of each run, between
+    finishing their last chunk and the last worker finishing.
+    """
+
+    def __init__(self):
+        self.runs = 0
+        self.files = 0
+        self.chunks = 0
+        # Worker seconds available (jobs x wall time), spent converting, and
+        # spent idle at the tail of a run
+        self.worker_seconds = 0.0
+        self.busy_seconds = 0.0
+        self.tail_idle_seconds = 0.0
+        # Longest wait of a worker for the last one, over the runs
+        self.longest_tail = 0.0
+
+    def add_run(
+        self,
+        jobs: int,
+        start: float,
+        chunks: List[Tuple[int, float, float, int]],
+    ) -> None:
+        """
+        Add a pool run.
+
+        Args:
+            jobs: Number of worker processes
+            start: When the run started (time.time() seconds)
+            chunks: (pid, start, end, files) of every chunk converted
+        """
+        if not chunks:
+            return
+        finished: Dict[int, float] = {}
+        for pid, _, end, _ in chunks:
+            finished[pid] = max(end, finished.get(pid, end))
+        end = max(finished.values())
+        # Workers that never got a chunk were idle for the whole run
+        last_ends = list(finished.values()) + [start] * (jobs - len(finished))
+        tails = [end - last_end for last_end in last_ends]
+        self.runs += 1
+        self.files += sum(files for _, _, _, files in chunks)
+        self.chunks += len(chunks)
+        self.worker_seconds += jobs * (end - start)
+        self.busy_seconds += sum(
+            chunk_end - chunk_start for _, chunk_start, chunk_end, _ in chunks
+        )
+        self.tail_idle_seconds += sum(tails)
+        self.longest_tail = max(self.longest_tail, max(tails))
+
+    @property
+    def tail_idle_rate(self) -> float:
+        """Share of the worker time spent idle at the tail of the runs"""
+        if not self.worker_seconds:
+            return 0.0
+        return self.tail_idle_seconds / self.worker_seconds
+
+    def __str__(self) -> str:
+        busy = self.busy_seconds / self.worker_seconds if self.worker_seconds else 0
+        return (
+            f"{self.files} files in {self.chunks} chunks, workers busy "
+            f"{busy:.0%} of the time, idle at the tail "
+            f"{self.tail_idle_seconds:.2f}s ({self.tail_idle_rate:.0%}, "
+            f"longest wait {self.longest_tail:.2f}s)"
+        )
+
+
+def run_in_pool(
+    tasks: List[Task],
+    jobs: int,
+    block_references_replacer: Optional[BlockReferencesReplacer],
+    dry_run: bool,
+    categories_config: Optional[str],
+    stream_threshold: Optional[int] = DEFAULT_STREAM_THRESHOLD,
+    sizes: Optional[List[int]] = None,
+    report: Optional[PoolReport] = None,
+) -> Iterator[FileResult]:
+    """
+    Convert files in a process pool and merge what each worker found back into
+    the class-level tag and backlink registries (and profiler) of this process.
+
+    Args:
+        tasks: List of (kind, file_path, output_path, content) tuples, content
+               being the file's indexed content or None to read it in the worker
+        jobs: Number of worker processes
+        block_references_replacer: Block references processor with a collected block map
+        dry_run: If True, workers don't write any files
+        categories_config: Optional categories configuration
+        stream_threshold: Size from which workers convert files block by block
+        sizes: Size in bytes of each task's file, used to dispatch the largest
+               files first (see plan_chunks); without sizes files go in order
+        report: Optional PoolReport the run is added to
+
+    Yields:
+        One FileResult per task, as the chunks they were sent in finish
+    """
+    if not tasks:
+        return
+    chunks = plan_chunks(sizes if sizes is not None else [0] * len(tasks), jobs)
+    profiler = ProcessorPipeline.profiler
+    # Workers map the block map from a file instead of each unpickling a copy,
+    # and format the links of the blocks they meet themselves
+    block_map_path = None
+    worker_replacer = block_references_replacer
+    if block_references_replacer is not None and block_references_replacer.block_map:
+        block_map_path = SharedBlockMap.write_temporary(
+            block_references_replacer.block_map
+        )
+        worker_replacer = copy.copy(block_references_replacer)
+        worker_replacer.block_map = {}
+        worker_replacer.block_links = {}
+        worker_replacer.resolved_links = {}
+    start = time.time()
+    timeline = []
+    try:
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=init_worker,
+            initargs=(
+                worker_replacer,
+                dry_run,
+                categories_config,
+                TagToBacklinkProcessor.found_tags,
+                BacklinkCollector.date_backlinks,
+                profiler is not None,
+                stream_threshold,
+                TitleTable.graph_names,
+                block_map_path,
+            ),
+        ) as executor:
+            # The pool hands queued chunks out in submission order
+            pending = {
+                executor.submit(convert_chunk, [tasks[index] for index in chunk])
+                for chunk in chunks
+            }
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results, pid, chunk_start, chunk_end = future.result()
+                    timeline.append((pid, chunk_start, chunk_end, len(results)))
+                    for result in results:
+                        TagToBacklinkProcessor.register_tags(result.tags)
+                        BacklinkCollector.merge_backlinks(
+                            result.backlinks, result.date_backlinks
+                        )
+                        if profiler is not None:
+                            profiler.merge(result.profile)
+                        yield result
+    finally:
+        if block_map_path is not None:
+            os.remove(block_map_path)
+    if report is not None:
+        report.add_run(jobs, start, timeline)
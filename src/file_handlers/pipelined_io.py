@@ -0,0 +1,141 @@
+import os
+import queue
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Files read ahead (or outputs waiting to be written) per I/O thread
+PENDING_PER_THREAD = 4
+
+
+def read_file(file_path: str) -> str:
+    with open(file_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def write_file(output_path: str, content: str) -> None:
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+class PrefetchReader:
+    """
+    Read files on a thread pool ahead of the code consuming them, so that disk (or
+    network mount) latency overlaps with converting the previous files.
+
+    At most max_pending files are read ahead, which bounds the memory held by
+    contents nobody has asked for yet.
+    """
+
+    def __init__(self, threads: int, max_pending: Optional[int] = None):
+        """
+        Args:
+            threads: Number of reader threads
+            max_pending: Maximum number of files read ahead (default: 4 per thread)
+        """
+        self.threads = max(1, threads)
+        self.max_pending = max_pending or self.threads * PENDING_PER_THREAD
+
+    def read(self, paths: Iterable[str]) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        Read files in order, keeping up to max_pending reads in flight.
+
+        Args:
+            paths: Paths of the files to read
+
+        Yields:
+            Tuples of (file_path, content), content being None if reading failed
+        """
+        with ThreadPoolExecutor(
+            max_workers=self.threads, thread_name_prefix="reader"
+        ) as executor:
+            pending = deque()
+            for file_path in paths:
+                pending.append((file_path, executor.submit(read_file, file_path)))
+                if len(pending) >= self.max_pending:
+                    yield self._result(*pending.popleft())
+            while pending:
+                yield self._result(*pending.popleft())
+
+    @staticmethod
+    def _result(file_path: str, future) -> Tuple[str, Optional[str]]:
+        try:
+            return file_path, future.result()
+        except Exception as e:
+            logger.error(f"Error reading file {file_path}: {e}")
+            return file_path, None
+
+
+class WriteBehindWriter:
+    """
+    Write converted files on background threads while the next files are converted.
+
+    submit() blocks while max_pending outputs are queued, so a slow disk throttles
+    the conversion instead of letting converted contents pile up in memory.
+    Call close() (or use the writer as a context manager) to wait for every
+    queued write.
+    """
+
+    def __init__(self, threads: int = 1, max_pending: Optional[int] = None):
+        """
+        Args:
+            threads: Number of writer threads
+            max_pending: Maximum number of queued outputs (default: 4 per thread)
+        """
+        self.threads = max(1, threads)
+        self._queue: queue.Queue = queue.Queue(
+            max_pending or self.threads * PENDING_PER_THREAD
+        )
+        # Output paths whose write failed, with the error
+        self.errors: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+        self._workers = [
+            threading.Thread(target=self._work, name=f"writer-{i}", daemon=True)
+            for i in range(self.threads)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, output_path: str, content: str) -> None:
+        """Queue content for output_path, waiting while the queue is full"""
+        self._queue.put((output_path, content))
+
+    def _work(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            output_path, content = item
+            try:
+                write_file(output_path, content)
+            except Exception as e:
+                logger.error(f"Error writing {output_path}: {e}")
+                with self._lock:
+                    self.errors.append((output_path, str(e)))
+
+    def close(self) -> List[Tuple[str, str]]:
+        """
+        Wait for every queued write and stop the writer threads.
+
+        Returns:
+            List of (output_path, error) for the writes that failed
+        """
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        return self.errors
+
+    def __enter__(self) -> "WriteBehindWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
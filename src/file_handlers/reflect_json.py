@@ -0,0 +1,305 @@
+import os
+import re
+import json
+import uuid
+import logging
+import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Versions written by the Reflect exports in Exports/Reflect_JSON
+EXPORT_VERSION = "1.0"
+GRAPH_VERSION = 15
+DOCUMENT_VERSION = 6.1
+# Flush serialized notes to disk once this many characters are buffered
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+JOURNAL_OUTPUT_PATTERN = re.compile(r"^(\d{4})-(\d{2})-(\d{2})\.md$")
+BULLET_PATTERN = re.compile(r"^(\s*)- (.*)$")
+TASK_PATTERN = re.compile(r"^\[( |x|X)\] (.*)$")
+WIKILINK_PATTERN = re.compile(r"\[\[(.*?)\]\]")
+# Namespace for deterministic list item guids
+GUID_NAMESPACE = uuid.UUID("6f1c1f4e-8a36-4a59-9a8e-3c1b8f0a2d17")
+
+
+def slugify(text: str) -> str:
+    """Build a Reflect note id from a title ("Saving websites" -> "saving-websites")"""
+    slug = re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+    return slug or "note"
+
+
+def _inline_content(text: str) -> List[Dict[str, Any]]:
+    """Split text into text and backlink nodes"""
+    nodes: List[Dict[str, Any]] = []
+    position = 0
+    for match in WIKILINK_PATTERN.finditer(text):
+        if match.start() > position:
+            nodes.append({"type": "text", "text": text[position : match.start()]})
+        label = match.group(1)
+        nodes.append(
+            {"type": "backlink", "attrs": {"id": slugify(label), "label": label}}
+        )
+        position = match.end()
+    if position < len(text):
+        nodes.append({"type": "text", "text": text[position:]})
+    return nodes
+
+
+def _paragraph(text: str) -> Dict[str, Any]:
+    paragraph: Dict[str, Any] = {"type": "paragraph"}
+    content = _inline_content(text)
+    if content:
+        paragraph["content"] = content
+    return paragraph
+
+
+def _indent_width(indent: str) -> int:
+    return len(indent.replace("\t", "  "))
+
+
+def _finish_code_block(code: Dict[str, Any], lines: List[str]) -> None:
+    if lines:
+        code["content"] = [{"type": "text", "text": "\n".join(lines)}]
+
+
+def markdown_to_document(
+    note_id: str, title: str, lines: Iterable[str]
+) -> Dict[str, Any]:
+    """
+    Build a Reflect document (ProseMirror JSON) from converted markdown.
+
+    Bullets become nested list items (checkboxes become task items), [[links]]
+    become backlinks, code fences become code blocks and other lines become
+    paragraphs. Inline markdown is kept as text.
+
+    Args:
+        note_id: Id of the note, used to derive stable list item guids
+        title: Note title, emitted as the level 1 heading
+        lines: The note's markdown lines after the title heading
+    """
+    content: List[Dict[str, Any]] = [
+        {
+            "type": "heading",
+            "attrs": {"level": 1},
+            "content": [{"type": "text", "text": title}],
+        }
+    ]
+    # Stack of (indent width, list node) for the bullets currently open
+    stack: List[Tuple[int, Dict[str, Any]]] = []
+    code: Optional[Dict[str, Any]] = None
+    code_lines: List[str] = []
+    item_count = 0
+
+    def container() -> List[Dict[str, Any]]:
+        return stack[-1][1]["content"] if stack else content
+
+    for line in lines:
+        stripped = line.strip()
+        if code is not None:
+            if stripped.startswith("```"):
+                _finish_code_block(code, code_lines)
+                code, code_lines = None, []
+            else:
+                code_lines.append(line.strip("\r"))
+            continue
+        bullet = BULLET_PATTERN.match(line)
+        text = bullet.group(2) if bullet else stripped
+        if bullet:
+            width = _indent_width(bullet.group(1))
+            while stack and stack[-1][0] >= width:
+                stack.pop()
+            attrs: Dict[str, Any] = {"kind": "bullet", "checked": False}
+            task = TASK_PATTERN.match(text)
+            if task:
+                attrs = {"kind": "task", "checked": task.group(1) != " "}
+                text = task.group(2)
+            item_count += 1
+            guid = uuid.uuid5(GUID_NAMESPACE, f"{note_id}/{item_count}")
+            attrs.update({"collapsed": False, "guid": str(guid), "archived": False})
+            item: Dict[str, Any] = {"type": "list", "attrs": attrs, "content": []}
+            container().append(item)
+            stack.append((width, item))
+        elif not stripped:
+            continue
+        else:
+            # A continuation line belongs to the closest less indented bullet
+            width = _indent_width(line[: len(line) - len(line.lstrip())])
+            while stack and stack[-1][0] >= width:
+                stack.pop()
+        if text.startswith("```"):
+            language = text[3:].strip() or None
+            code = {"type": "codeBlock", "attrs": {"language": language}}
+            container().append(code)
+            continue
+        if text or bullet:
+            container().append(_paragraph(text))
+    if code is not None:
+        _finish_code_block(code, code_lines)
+    return {"type": "doc", "content": content, "attrs": {"version": DOCUMENT_VERSION}}
+
+
+def make_note(
+    note_id: str,
+    subject: str,
+    lines: Iterable[str],
+    modified: datetime.datetime,
+    daily_at: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Build a note record in the format of Reflect's JSON export"""
+    milliseconds = f"{modified.microsecond // 1000:03d}"
+    timestamp = modified.strftime("%Y-%m-%dT%H:%M:%S.") + milliseconds + "Z"
+    document = markdown_to_document(note_id, subject, lines)
+    return {
+        "id": note_id,
+        "subject": subject,
+        "document_json": json.dumps(
+            document, ensure_ascii=False, separators=(",", ":")
+        ),
+        "created_at": timestamp,
+        "updated_at": timestamp,
+        "edited_at": timestamp,
+        "daily_at": daily_at,
+        "backlinked_count": 0,
+    }
+
+
+class ReflectJsonWriter:
+    """
+    Streaming writer for a Reflect JSON export.
+
+    Notes are serialized one at a time and flushed to disk whenever the buffer
+    grows past buffer_size, so memory use doesn't depend on the number of notes.
+    The document is written to a temporary file and moved into place by close().
+    """
+
+    def __init__(self, path: str, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.notes_written = 0
+        self._tmp_path = path + ".tmp"
+        self._file = None
+        self._buffer: List[str] = []
+        self._buffered = 0
+
+    def __enter__(self) -> "ReflectJsonWriter":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.abort()
+        elif self._file is not None:
+            self.close()
+
+    def open(self) -> None:
+        parent = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(parent, exist_ok=True)
+        self._file = open(self._tmp_path, "w", encoding="utf-8")
+        self._file.write(
+            "{\n"
+            f'  "export_version": {json.dumps(EXPORT_VERSION)},\n'
+            f'  "graph_version": {GRAPH_VERSION},\n'
+            '  "notes": ['
+        )
+
+    def write_note(self, note: Dict[str, Any]) -> None:
+        """Append a note to the export"""
+        separator = ",\n    " if self.notes_written else "\n    "
+        serialized = separator + json.dumps(note, ensure_ascii=False)
+        self._buffer.append(serialized)
+        self._buffered += len(serialized)
+        self.notes_written += 1
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        self._file.write("".join(self._buffer))
+        self._buffer = []
+        self._buffered = 0
+
+    def close(self, tags: Iterable[str] = ()) -> None:
+        """Write the tags, finish the document and move it into place"""
+        self.flush()
+        closing = "\n  ],\n" if self.notes_written else "],\n"
+        self._file.write(
+            closing + f'  "tags": {json.dumps(sorted(tags), ensure_ascii=False)}\n}}\n'
+        )
+        self._file.close()
+        self._file = None
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        """Discard a partially written export"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+
+def _read_note_file(file_path: str) -> Tuple[Optional[str], List[str]]:
+    """Return (title, remaining lines) of a converted markdown file"""
+    with open(file_path, "r", encoding="utf-8") as f:
+        lines = f.read().split("\n")
+    if lines and lines[0].startswith("# "):
+        return lines[0][2:].strip(), lines[1:]
+    return None, lines
+
+
+def export_reflect_json(
+    output_dir: str,
+    json_path: str,
+    tags: Iterable[str],
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> int:
+    """
+    Stream the converted notes in output_dir/step_1 and output_dir/step_2 into
+    a single Reflect JSON export, reading one note at a time.
+
+    Args:
+        output_dir: Conversion output directory
+        json_path: Path of the JSON file to write
+        tags: Tags to list in the export (e.g. TagToBacklinkProcessor.found_tags)
+        buffer_size: Number of serialized characters buffered before writing
+
+    Returns:
+        Number of notes written
+    """
+    used_ids: Dict[str, int] = {}
+    with ReflectJsonWriter(json_path, buffer_size) as writer:
+        for step in ("step_1", "step_2"):
+            step_dir = os.path.join(output_dir, step)
+            if not os.path.isdir(step_dir):
+                continue
+            for name in sorted(os.listdir(step_dir)):
+                if not name.endswith(".md"):
+                    continue
+                file_path = os.path.join(step_dir, name)
+                try:
+                    title, lines = _read_note_file(file_path)
+                    modified = datetime.datetime.fromtimestamp(
+                        os.path.getmtime(file_path), datetime.timezone.utc
+                    )
+                except Exception as e:
+                    logger.error(f"Error reading {file_path} for JSON export: {e}")
+                    continue
+                subject = title or os.path.splitext(name)[0]
+                journal = JOURNAL_OUTPUT_PATTERN.match(name)
+                if journal and step == "step_2":
+                    year, month, day = journal.groups()
+                    note_id = f"{day}{month}{year}"
+                    daily_at = f"{year}-{month}-{day}"
+                else:
+                    note_id = slugify(subject.split(" // ")[0])
+                    daily_at = None
+                # Keep ids unique, as Reflect requires
+                count = used_ids.get(note_id, 0) + 1
+                used_ids[note_id] = count
+                if count > 1:
+                    note_id = f"{note_id}-{count}"
+                note = make_note(note_id, subject, lines, modified, daily_at)
+                writer.write_note(note)
+        writer.close(tags)
+    return writer.notes_written
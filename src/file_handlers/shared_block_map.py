@@ -0,0 +1,141 @@
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from typing import Iterator, Mapping, Tuple
+
+# Magic, number of blocks n, file offsets of the key offsets, value offsets and
+# the end of the blobs
+HEADER = struct.Struct("=8sQQQQ")
+MAGIC = b"LSRBMAP1"
+
+
+class SharedBlockMap(Mapping[str, Tuple[str, str]]):
+    """
+    Read-only block map (block ID -> (text, page_name)) stored in a file that
+    worker processes map into memory, so a large map is written once by the
+    parent instead of pickled into every worker, and the workers share its
+    pages through the OS page cache.
+
+    Layout (native byte order, offsets are from the start of the file):
+        header: magic, block count n and the section offsets
+        key offsets: n + 1 uint64; block i's ID is the UTF-8 bytes between
+            offsets i and i + 1, and the IDs are sorted
+        value offsets: 2n + 1 uint64; block i's text and page name are the UTF-8
+            strings between offsets 2i, 2i + 1 and 2i + 2
+        keys, then values
+    Only the entries looked up are copied out of the mapping.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: File written by SharedBlockMap.write
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, key_offsets, value_offsets, _ = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a block map file")
+        self._count = count
+        self._view = memoryview(self._mmap)
+        self._key_offsets = self._view[key_offsets:value_offsets].cast("Q")
+        self._value_offsets = self._view[
+            value_offsets : value_offsets + 8 * (2 * count + 1)
+        ].cast("Q")
+
+    @staticmethod
+    def write(block_map: Mapping[str, Tuple[str, str]], path: str) -> None:
+        """
+        Serialize a block map into a file for SharedBlockMap.
+
+        Args:
+            block_map: Block ID -> (text, page_name)
+            path: File to write
+        """
+        block_ids = sorted(block_map)
+        count = len(block_ids)
+        keys = [block_id.encode("utf-8") for block_id in block_ids]
+        values = []
+        for block_id in block_ids:
+            text, page_name = block_map[block_id]
+            values += [text.encode("utf-8"), page_name.encode("utf-8")]
+
+        key_offsets = HEADER.size
+        value_offsets = key_offsets + 8 * (count + 1)
+        position = value_offsets + 8 * (2 * count + 1)
+        offsets = array("Q")
+        for encoded in keys:
+            offsets.append(position)
+            position += len(encoded)
+        offsets.append(position)
+        for encoded in values:
+            offsets.append(position)
+            position += len(encoded)
+        offsets.append(position)
+
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, count, key_offsets, value_offsets, position))
+            f.write(offsets.tobytes())
+            f.write(b"".join(keys))
+            f.write(b"".join(values))
+
+    @classmethod
+    def write_temporary(cls, block_map: Mapping[str, Tuple[str, str]]) -> str:
+        """Serialize a block map into a new temporary file and return its path"""
+        fd, path = tempfile.mkstemp(prefix="logseq-blocks-", suffix=".map")
+        os.close(fd)
+        try:
+            cls.write(block_map, path)
+        except BaseException:
+            os.remove(path)
+            raise
+        return path
+
+    def _find(self, block_id: str) -> int:
+        """Return the index of a block ID, or -1 if it isn't in the map"""
+        target = block_id.encode("utf-8")
+        offsets = self._key_offsets
+        data = self._mmap
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            probe = data[offsets[middle] : offsets[middle + 1]]
+            if probe < target:
+                low = middle + 1
+            elif probe > target:
+                high = middle
+            else:
+                return middle
+        return -1
+
+    def __getitem__(self, block_id: str) -> Tuple[str, str]:
+        index = self._find(block_id) if isinstance(block_id, str) else -1
+        if index < 0:
+            raise KeyError(block_id)
+        offsets = self._value_offsets
+        data = self._mmap
+        start, middle, end = offsets[2 * index : 2 * index + 3]
+        return data[start:middle].decode("utf-8"), data[middle:end].decode("utf-8")
+
+    def __contains__(self, block_id: object) -> bool:
+        return isinstance(block_id, str) and self._find(block_id) >= 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        offsets = self._key_offsets
+        data = self._mmap
+        for index in range(self._count):
+            yield data[offsets[index] : offsets[index + 1]].decode("utf-8")
+
+    def close(self) -> None:
+        """Unmap the file; the map can't be used afterwards"""
+        self._key_offsets.release()
+        self._value_offsets.release()
+        self._view.release()
+        self._mmap.close()
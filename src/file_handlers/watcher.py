@@ -0,0 +1,341 @@
+import os
+import time
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+
+from .workspace_index import SCANNED_DIRECTORIES
+from .manifest import expand_block_refs, find_block_refs, find_link_targets
+from .reflect_json import export_reflect_json
+from ..processors.tag_to_backlink import TagToBacklinkProcessor
+from ..processors.backlink_collector import BacklinkCollector
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Seconds between two scans of the workspace
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Source path -> (mtime_ns, size, kind)
+Snapshot = Dict[str, Tuple[int, int, str]]
+
+
+def snapshot_workspace(workspace: str) -> Snapshot:
+    """
+    Stat every markdown file in the workspace's journals and pages directories,
+    without reading any of them.
+
+    Args:
+        workspace: Path to the LogSeq workspace
+
+    Returns:
+        Dict of absolute path -> (mtime_ns, size, kind)
+    """
+    snapshot: Snapshot = {}
+    for dir_name, kind in SCANNED_DIRECTORIES:
+        pending = [os.path.join(os.path.abspath(workspace), dir_name)]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.is_dir():
+                        # Links to directories aren't followed, as in
+                        # WorkspaceIndex.scan
+                        continue
+                    elif entry.name.lower().endswith(".md"):
+                        stat = entry.stat()
+                        snapshot[os.path.abspath(entry.path)] = (
+                            stat.st_mtime_ns,
+                            stat.st_size,
+                            kind,
+                        )
+                except OSError:
+                    # Deleted between listing and stat; the next scan settles it
+                    continue
+    return snapshot
+
+
+class WatchCycle:
+    """What one scan of the workspace found and reconverted"""
+
+    def __init__(self, changed: List[str], removed: List[str]):
+        self.changed = changed
+        self.removed = removed
+        # Every source file converted in this cycle, including dependents
+        self.converted: Set[str] = set()
+        self.seconds = 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{len(self.changed)} changed, {len(self.removed)} removed, "
+            f"{len(self.converted)} reconverted in {self.seconds * 1000:.0f} ms"
+        )
+
+
+class WorkspaceWatcher:
+    """
+    Keep a converter warm and reconvert files as the workspace changes.
+
+    After an initial full conversion, the watcher polls the journals and pages
+    directories with os.stat. The processors, the block map and the tag and
+    backlink registries stay in memory, so each change only costs reading and
+    converting the affected files:
+
+    - files that were added or modified
+    - files referencing a block whose text or page changed
+    - files linking to a tag that appeared or disappeared
+
+    Outputs of deleted sources and tag pages of tags that are gone are removed.
+    """
+
+    def __init__(self, converter, interval: float = DEFAULT_POLL_INTERVAL):
+        """
+        Args:
+            converter: LogSeqToReflectConverter to run and keep warm
+            interval: Seconds between two scans of the workspace
+        """
+        self.converter = converter
+        self.interval = interval
+        self.workspace = converter.workspace
+        self._snapshot: Snapshot = {}
+        # Per source file: blocks it defines, block ids and (lowercased) link
+        # targets it references, and the (tags, backlinks, date_backlinks) it
+        # contributed to the registries when it was last converted
+        self._blocks: Dict[str, List[Tuple[str, str, str]]] = {}
+        self._refs: Dict[str, Set[str]] = {}
+        self._links: Dict[str, Set[str]] = {}
+        self._contributions: Dict[str, Tuple[Set[str], Set[str], Dict[str, str]]] = {}
+
+    def start(self):
+        """
+        Run the initial conversion and record the state needed to apply changes.
+
+        Returns:
+            ConversionStats of the initial conversion
+        """
+        converter = self.converter
+        self._snapshot = snapshot_workspace(self.workspace)
+        if not converter.incremental:
+            converter.walker.file_results = {}
+        stats = converter.run()
+        if converter.incremental:
+            for rel_path, entry in converter.manifest.files.items():
+                self._contributions[os.path.join(self.workspace, rel_path)] = (
+                    set(entry.get("tags", [])),
+                    set(entry.get("backlinks", [])),
+                    entry.get("date_backlinks", {}),
+                )
+        else:
+            self._contributions.update(converter.walker.file_results)
+            converter.walker.file_results = None
+        for entry in converter.index.files:
+            self._index_file(entry.path, entry.content)
+        return stats
+
+    def _index_file(
+        self, file_path: str, content: Optional[str]
+    ) -> List[Tuple[str, str, str]]:
+        """
+        Record the blocks, block references and links of a file and add its blocks
+        to the block map.
+
+        Returns:
+            The (block_id, text, page_name) blocks defined in the file
+        """
+        content = content or ""
+        blocks = []
+        if "id::" in content:
+            replacer = self.converter.block_references_replacer
+            blocks = replacer.find_blocks(file_path, content)
+            for block_id, text, page_name in blocks:
+                replacer.add_block(block_id, text, page_name)
+            self._blocks[file_path] = blocks
+        self._refs[file_path] = find_block_refs(content) if "((" in content else set()
+        self._links[file_path] = (
+            find_link_targets(content) if "[[" in content else set()
+        )
+        return blocks
+
+    def _drop_blocks(self, file_path: str) -> List[Tuple[str, str, str]]:
+        """Remove the blocks a file defined from the block map, returning them"""
+        replacer = self.converter.block_references_replacer
+        blocks = self._blocks.pop(file_path, [])
+        for block_id, _, _ in blocks:
+            replacer.remove_block(block_id)
+        return blocks
+
+    def _forget_file(self, file_path: str) -> None:
+        """Drop everything recorded for a deleted file"""
+        self._refs.pop(file_path, None)
+        self._links.pop(file_path, None)
+        self._contributions.pop(file_path, None)
+
+    def poll(self) -> Optional[WatchCycle]:
+        """
+        Scan the workspace once and reconvert whatever the changes affect.
+
+        Returns:
+            WatchCycle describing the work done, or None if nothing changed
+        """
+        snapshot = snapshot_workspace(self.workspace)
+        changed = sorted(
+            path for path, stat in snapshot.items() if self._snapshot.get(path) != stat
+        )
+        removed = sorted(path for path in self._snapshot if path not in snapshot)
+        self._snapshot = snapshot
+        if not changed and not removed:
+            return None
+        start = time.perf_counter()
+        cycle = WatchCycle(changed, removed)
+        self._apply(cycle, snapshot)
+        cycle.seconds = time.perf_counter() - start
+        logger.info(f"Watch: {cycle}")
+        return cycle
+
+    def _apply(self, cycle: WatchCycle, snapshot: Snapshot) -> None:
+        converter = self.converter
+        walker = converter.walker
+        index = converter.index
+        journals_added = False
+        # Drop all old blocks before adding new ones, so a block moving between
+        # two files isn't removed again by the file it left
+        old_blocks = {
+            path: self._drop_blocks(path) for path in cycle.removed + cycle.changed
+        }
+        new_blocks: Dict[str, List[Tuple[str, str, str]]] = {}
+
+        for path in cycle.removed:
+            entry = index.remove(path)
+            if entry is not None:
+                self._remove_output(walker.get_output_path(entry))
+            self._forget_file(path)
+
+        for path in cycle.changed:
+            previous = index.get(path)
+            old_output = walker.get_output_path(previous) if previous else None
+            entry = index.refresh(path, snapshot[path][2])
+            if entry is None:
+                self._forget_file(path)
+                self._remove_output(old_output)
+                continue
+            if old_output != walker.get_output_path(entry):
+                self._remove_output(old_output)
+            journals_added |= previous is None and entry.kind == "journal"
+            new_blocks[path] = self._index_file(path, entry.content)
+
+        # Blocks whose text or page changed, or that were added or removed
+        changed_blocks = {
+            block[0]
+            for path, blocks in old_blocks.items()
+            for block in set(blocks) ^ set(new_blocks.get(path, []))
+        }
+
+        if journals_added:
+            BacklinkCollector.collect_dates_from_workspace(self.workspace, index)
+
+        selected = {path for path in cycle.changed if index.get(path) is not None}
+        # Files referencing a changed block directly or through the text of
+        # other blocks
+        block_map = converter.block_references_replacer.block_map
+        selected |= {
+            path
+            for path, refs in self._refs.items()
+            if refs and expand_block_refs(refs, block_map) & changed_blocks
+        }
+        found_tags = TagToBacklinkProcessor.found_tags
+        tags_before = set(found_tags)
+        backlinks_before = set(BacklinkCollector.found_backlinks)
+
+        # Drop what the reconverted and deleted files contributed last time, so
+        # that tags and backlinks no longer used anywhere disappear
+        for path in selected:
+            self._contributions.pop(path, None)
+        self._rebuild_registries()
+        self._convert(selected, cycle)
+
+        # Links to a tag that appeared or disappeared are formatted differently
+        changed_tags = {tag.lower() for tag in found_tags ^ tags_before}
+        if changed_tags:
+            dependents = {
+                path
+                for path, links in self._links.items()
+                if path not in cycle.converted and links & changed_tags
+            }
+            self._convert(dependents, cycle)
+        self._rebuild_registries()
+        self._write_shared_outputs(tags_before, backlinks_before)
+
+    def _rebuild_registries(self) -> None:
+        """Set the tag and backlink registries to what the converted files contain"""
+        found_tags = TagToBacklinkProcessor.found_tags
+        found_tags.clear()
+        BacklinkCollector.found_backlinks.clear()
+        for tags, backlinks, date_backlinks in self._contributions.values():
+            found_tags.update(tags)
+            BacklinkCollector.merge_backlinks(backlinks, date_backlinks)
+
+    def _convert(self, paths: Set[str], cycle: WatchCycle) -> None:
+        """Convert the given source files in this process with the warm processors"""
+        if not paths:
+            return
+        converter = self.converter
+        walker = converter.walker
+        jobs = walker.jobs
+        walker.selected_paths = paths
+        walker.file_results = {}
+        walker.jobs = 1
+        try:
+            converter._process_journal_directories(walker.find_directories("journals"))
+            converter._process_pages_directories(walker.find_directories("pages"))
+            self._contributions.update(walker.file_results)
+            cycle.converted |= paths
+        finally:
+            walker.selected_paths = None
+            walker.file_results = None
+            walker.jobs = jobs
+
+    def _remove_output(self, output_path: Optional[str]) -> None:
+        if output_path:
+            self.converter._remove_output(
+                os.path.relpath(output_path, self.converter.output_dir)
+            )
+
+    def _write_shared_outputs(
+        self, tags_before: Set[str], backlinks_before: Set[str]
+    ) -> None:
+        """Update the tag pages, the backlinks file and the JSON export"""
+        converter = self.converter
+        found_tags = TagToBacklinkProcessor.found_tags
+        for tag in tags_before - found_tags:
+            converter._remove_output(os.path.join("step_1", f"{tag}.md"))
+        if converter.dry_run:
+            return
+        for tag in found_tags - tags_before:
+            tag_path = os.path.join(converter.output_dir, "step_1", f"{tag}.md")
+            with open(tag_path, "w", encoding="utf-8") as f:
+                f.write(f"# {tag}\n\n#inline-tag\n")
+        if BacklinkCollector.found_backlinks != backlinks_before:
+            BacklinkCollector.write_to_file(
+                os.path.join(converter.output_dir, "all_backlinks")
+            )
+        if converter.json_export:
+            export_reflect_json(converter.output_dir, converter.json_export, found_tags)
+
+    def watch(self, max_cycles: Optional[int] = None) -> None:
+        """
+        Poll the workspace until interrupted (or until max_cycles changes were applied).
+
+        Args:
+            max_cycles: Optional number of change cycles after which to stop
+        """
+        cycles = 0
+        while max_cycles is None or cycles < max_cycles:
+            if self.poll() is not None:
+                cycles += 1
+            else:
+                time.sleep(self.interval)
@@ -0,0 +1,192 @@
+import os
+import logging
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .pipelined_io import PrefetchReader
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Top-level workspace directories that are scanned, and the kind of file they hold
+SCANNED_DIRECTORIES = (("journals", "journal"), ("pages", "page"))
+
+
+def has_aliases(filename: str, content: Optional[str]) -> bool:
+    """
+    Check if a page has aliases (triple underscores in filename or an alias:: property).
+
+    Args:
+        filename: Base name of the file
+        content: Decoded file content, or None if it couldn't be read
+
+    Returns:
+        True if the page has aliases, False otherwise
+    """
+    if "___" in filename:
+        return True
+    return content is not None and "alias::" in content
+
+
+class IndexedFile:
+    """A markdown file found while scanning the workspace"""
+
+    def __init__(
+        self,
+        path: str,
+        size: int,
+        mtime: float,
+        kind: str,
+        content: Optional[str],
+    ):
+        """
+        Args:
+            path: Absolute path to the file
+            size: File size in bytes
+            mtime: Modification time (seconds since the epoch)
+            kind: "journal" or "page"
+            content: Decoded content, or None if the file couldn't be read
+        """
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.kind = kind
+        self.content = content
+        self.filename = os.path.basename(path)
+        self.has_aliases = kind == "page" and has_aliases(self.filename, content)
+
+
+class WorkspaceIndex:
+    """
+    In-memory index of every markdown file in the workspace's journals and pages
+    directories, built with a single os.scandir pass. Later phases (date collection,
+    block collection, alias counting, conversion) read from the index instead of
+    walking and reading the workspace again.
+    """
+
+    def __init__(self, workspace: str, files: List[IndexedFile]):
+        self.workspace = os.path.abspath(workspace)
+        self.files = files
+        self._by_path: Dict[str, IndexedFile] = {f.path: f for f in files}
+
+    @classmethod
+    def scan(cls, workspace: str, io_threads: int = 0) -> "WorkspaceIndex":
+        """
+        Scan the journals and pages directories that are direct children of the workspace.
+
+        Args:
+            workspace: Path to the LogSeq workspace
+            io_threads: If set, read the files on this many threads instead of one
+                        after the other (helps on network-mounted disks)
+
+        Returns:
+            WorkspaceIndex with one entry per markdown file
+        """
+        workspace = os.path.abspath(workspace)
+        found: List[Tuple[str, os.stat_result, str]] = []
+        for dir_name, kind in SCANNED_DIRECTORIES:
+            dir_path = os.path.join(workspace, dir_name)
+            if os.path.isdir(dir_path):
+                found.extend(cls._scan_directory(dir_path, kind))
+        if io_threads:
+            reader = PrefetchReader(io_threads)
+            contents = (content for _, content in reader.read(f[0] for f in found))
+        else:
+            contents = (cls._read(path) for path, _, _ in found)
+        files = [
+            IndexedFile(path, stat.st_size, stat.st_mtime, kind, content)
+            for (path, stat, kind), content in zip(found, contents)
+        ]
+        return cls(workspace, files)
+
+    @classmethod
+    def _scan_directory(
+        cls, dir_path: str, kind: str
+    ) -> Iterator[Tuple[str, os.stat_result, str]]:
+        """
+        Stat the markdown files under dir_path in the same order as os.walk.
+
+        Yields:
+            Tuples of (absolute_path, stat, kind)
+        """
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError as e:
+            logger.error(f"Error scanning directory {dir_path}: {e}")
+            return
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_dir():
+                    # Like os.walk, don't follow links to directories, which
+                    # may point back up the tree
+                    continue
+                elif entry.name.lower().endswith(".md"):
+                    yield os.path.abspath(entry.path), entry.stat(), kind
+            except OSError as e:
+                logger.error(f"Error scanning {entry.path}: {e}")
+        for subdir in subdirs:
+            yield from cls._scan_directory(subdir, kind)
+
+    @staticmethod
+    def _read(file_path: str) -> Optional[str]:
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                return f.read()
+        except Exception as e:
+            logger.error(f"Error reading file {file_path}: {e}")
+            return None
+
+    def refresh(self, file_path: str, kind: str) -> Optional[IndexedFile]:
+        """
+        Stat and read a file again, replacing its entry (or adding one for a new file).
+
+        Args:
+            file_path: Path to the file
+            kind: "journal" or "page"
+
+        Returns:
+            The new entry, or None if the file no longer exists (its entry is removed)
+        """
+        file_path = os.path.abspath(file_path)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            self.remove(file_path)
+            return None
+        entry = IndexedFile(
+            file_path, stat.st_size, stat.st_mtime, kind, self._read(file_path)
+        )
+        previous = self._by_path.get(file_path)
+        if previous is None:
+            self.files.append(entry)
+        else:
+            self.files[self.files.index(previous)] = entry
+        self._by_path[file_path] = entry
+        return entry
+
+    def remove(self, file_path: str) -> Optional[IndexedFile]:
+        """Drop a file from the index, returning its entry if it was indexed"""
+        entry = self._by_path.pop(os.path.abspath(file_path), None)
+        if entry is not None:
+            self.files.remove(entry)
+        return entry
+
+    def get(self, file_path: str) -> Optional[IndexedFile]:
+        """Return the indexed entry for a path, or None if it isn't indexed"""
+        return self._by_path.get(os.path.abspath(file_path))
+
+    def journals(self) -> List[IndexedFile]:
+        """All indexed journal files"""
+        return [f for f in self.files if f.kind == "journal"]
+
+    def pages(self) -> List[IndexedFile]:
+        """All indexed page files"""
+        return [f for f in self.files if f.kind == "page"]
+
+    def files_under(self, dir_path: str) -> List[IndexedFile]:
+        """All indexed files located in dir_path or one of its subdirectories"""
+        prefix = os.path.join(os.path.abspath(dir_path), "")
+        return [f for f in self.files if f.path.startswith(prefix)]
@@ -2,6 +2,7 @@ import sys
 import os
 from src.utils import find_markdown_files
 from src.processors.page_title import PageTitleProcessor
+from src.processors.title_table import TitleTable
 from collections import defaultdict
 
 # List of known collection/type categories (case-insensitive, title-cased for output)
@@ -62,12 +63,13 @@ def list_disambiguated_pages(workspace_dir):
     results = []
     print(f"{'Filename':<60} | Would-be Title")
     print("-" * 90)
-    for file_path in find_markdown_files(workspace_dir):
-        filename = os.path.basename(file_path)
+    processor = PageTitleProcessor()
+    filenames = [os.path.basename(path) for path in find_markdown_files(workspace_dir)]
+    TitleTable.register_names(filenames)
+    for filename in filenames:
         if "___" in filename:
             found = True
-            processor = PageTitleProcessor(filename)
-            title = processor._format_title_from_filename()
+            title = processor._format_title_from_filename(filename)
             results.append((filename, title))
     if not found:
         print("No files with triple underscores found.")
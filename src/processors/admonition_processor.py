@@ -1,6 +1,8 @@
-from .base import ContentProcessor
+from .base import LineProcessor
 import re
 
+BEGIN_PATTERN = re.compile(r"^(\s*-\s*)?#\+BEGIN_([A-Z]+)")
+
 ADMONITION_MAP = {
     "IMPORTANT": ("‼️", "##"),
     "WARNING": ("⚠️", "##"),
@@ -9,27 +11,31 @@ ADMONITION_MAP = {
 }
 
 
-class AdmonitionProcessor(ContentProcessor):
+class AdmonitionProcessor(LineProcessor):
     """Convert LogSeq admonition blocks to Reflect blockquote format."""
 
-    def process(self, content):
-        lines = content.split("\n")
+    triggers = ("#+BEGIN_",)
+    # Dropping an empty admonition doesn't count as a change
+    reports_all_changes = False
+
+    def process_lines(self, lines):
         new_lines = []
         i = 0
         changed = False
         while i < len(lines):
             line = lines[i]
             # Detect admonition start (allow any leading whitespace, optional dash)
-            m = re.match(r"^(\s*-\s*)?#\+BEGIN_([A-Z]+)", line)
+            m = BEGIN_PATTERN.match(line) if "#+BEGIN_" in line else None
             if m and m.group(2) in ADMONITION_MAP:
                 typ = m.group(2)
                 emoji, heading = ADMONITION_MAP[typ]
                 list_prefix = m.group(1) or ""
+                end_marker = f"#+END_{typ}"
                 block = []
                 i += 1
                 while i < len(lines):
                     block_line = lines[i].lstrip()
-                    if re.match(rf"^#\+END_{typ}", block_line):
+                    if block_line.startswith(end_marker):
                         break
                     block.append(block_line)
                     i += 1
@@ -65,5 +71,4 @@ class AdmonitionProcessor(ContentProcessor):
                 continue
             new_lines.append(line)
             i += 1
-        new_content = "\n".join(new_lines)
-        return new_content, changed
+        return new_lines, changed
@@ -1,13 +1,19 @@
 from .base import ContentProcessor
-import re
 
 
 class ArrowsProcessor(ContentProcessor):
     """Replace all '->' and '=>' in the text with '→', and all '<-' and '<=' with '←'."""
 
+    triggers = ("->", "=>", "<-", "<=")
+
     def process(self, content):
-        # Replace right arrows
-        new_content = re.sub(r"(->|=>)", "→", content)
-        # Replace left arrows
-        new_content = re.sub(r"(<-|<=)", "←", new_content)
+        # The arrows can't overlap, so plain replacements match what a single
+        # (->|=>) or (<-|<=) regex substitution would do
+        new_content = content
+        if ">" in new_content:
+            # Replace right arrows
+            new_content = new_content.replace("->", "→").replace("=>", "→")
+        if "<" in new_content:
+            # Replace left arrows
+            new_content = new_content.replace("<-", "←").replace("<=", "←")
         return new_content, new_content != content
@@ -1,4 +1,4 @@
-from .base import ContentProcessor
+from .base import HEAD, ContentProcessor
 import re
 import os
 from typing import Set, Dict, Optional
@@ -10,6 +10,8 @@ class BacklinkCollector(ContentProcessor):
     Dates are stored in YYYY/MM/DD format instead of their formatted representation.
     """
 
+    triggers = ("[[",)
+
     # Collection of all backlinks found across processing
     found_backlinks: Set[str] = set()
 
@@ -28,21 +30,37 @@ class BacklinkCollector(ContentProcessor):
             r"^([A-Za-z]{3}), ([A-Za-z]+) (\d{1,2})(?:st|nd|rd|th), (\d{4})$"
         )
 
+        # Backlinks and date mappings found by the most recent call to process()
+        # (or in every block of the last page converted block by block)
+        self.file_backlinks: Set[str] = set()
+        self.file_date_backlinks: Dict[str, str] = {}
+
     @classmethod
-    def collect_dates_from_workspace(cls, workspace_path: str) -> None:
+    def collect_dates_from_workspace(cls, workspace_path: str, index=None) -> None:
         """
         Pre-collect dates from journal files in the workspace to build the date mapping.
 
         Args:
             workspace_path: Path to the LogSeq workspace
+            index: Optional WorkspaceIndex to take journal file names from instead
+                   of listing the journals directory
         """
         # Check for journal directories
         journals_dir = os.path.join(workspace_path, "journals")
-        if not os.path.isdir(journals_dir):
+        if index is not None:
+            journals_dir = os.path.abspath(journals_dir)
+            file_names = [
+                f.filename
+                for f in index.journals()
+                if os.path.dirname(f.path) == journals_dir
+            ]
+        elif os.path.isdir(journals_dir):
+            file_names = os.listdir(journals_dir)
+        else:
             return
 
         # Process all journal files
-        for file_name in os.listdir(journals_dir):
+        for file_name in file_names:
             if not file_name.endswith(".md"):
                 continue
 
@@ -66,6 +84,17 @@ class BacklinkCollector(ContentProcessor):
         Extract all backlinks from content and add them to the collection.
         This doesn't modify the content.
         """
+        self.file_backlinks = set()
+        self.file_date_backlinks = {}
+        return self._collect(content)
+
+    def process_block(self, content: str, position: int):
+        if position & HEAD:
+            self.file_backlinks = set()
+            self.file_date_backlinks = {}
+        return self._collect(content)
+
+    def _collect(self, content: str):
         # Find all backlinks in the content
         for match in self.backlink_pattern.finditer(content):
             backlink = match.group(1)
@@ -76,7 +105,7 @@ class BacklinkCollector(ContentProcessor):
                 year, month, day = date_match.groups()
                 # Store as YYYY/MM/DD format
                 standardized_date = f"{year}/{month}/{day}"
-                BacklinkCollector.found_backlinks.add(standardized_date)
+                self._add_backlink(standardized_date)
 
                 # Also record the mapping from formatted to standardized
                 from ..utils import DateFormatter
@@ -84,22 +113,43 @@ class BacklinkCollector(ContentProcessor):
                 formatted_date = DateFormatter.format_date_for_header(year, month, day)
                 if formatted_date:
                     BacklinkCollector.date_backlinks[formatted_date] = standardized_date
+                    self.file_date_backlinks[formatted_date] = standardized_date
             # Check if this is a formatted date (e.g., "Thu, April 17th, 2025")
             elif self.formatted_date_pattern.match(backlink):
                 # This is a formatted date, check if we have its standardized form
                 if backlink in BacklinkCollector.date_backlinks:
                     standardized_date = BacklinkCollector.date_backlinks[backlink]
-                    BacklinkCollector.found_backlinks.add(standardized_date)
+                    self._add_backlink(standardized_date)
                 else:
                     # Just add it as-is if we don't have a mapping
-                    BacklinkCollector.found_backlinks.add(backlink)
+                    self._add_backlink(backlink)
             else:
                 # Regular backlink
-                BacklinkCollector.found_backlinks.add(backlink)
+                self._add_backlink(backlink)
 
         # Don't modify the content
         return content, False
 
+    def _add_backlink(self, backlink: str) -> None:
+        """Record a backlink both globally and for the current file"""
+        BacklinkCollector.found_backlinks.add(backlink)
+        self.file_backlinks.add(backlink)
+
+    @classmethod
+    def merge_backlinks(
+        cls, backlinks: Set[str], date_backlinks: Optional[Dict[str, str]] = None
+    ) -> None:
+        """
+        Merge backlinks collected elsewhere (e.g. in a worker process) into the collection.
+
+        Args:
+            backlinks: Backlinks to add
+            date_backlinks: Optional formatted date -> YYYY/MM/DD mappings to add
+        """
+        cls.found_backlinks.update(backlinks)
+        if date_backlinks:
+            cls.date_backlinks.update(date_backlinks)
+
     @classmethod
     def write_to_file(cls, output_path: str) -> bool:
         """
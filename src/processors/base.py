@@ -1,12 +1,75 @@
 from abc import ABC, abstractmethod
+from typing import List, Tuple
+
+# Where a block sits in a page that is converted block by block (see
+# blocks.split_blocks). A page converted in one piece is both HEAD and TAIL.
+HEAD = 1
+TAIL = 2
+WHOLE = HEAD | TAIL
+# Set for a block that starts inside a fenced code block (see code_fence_flags)
+FENCED = 4
 
 
 class ContentProcessor(ABC):
     """Base class for content processors"""
 
+    # Substrings the processor needs in order to change anything. When set and
+    # none of them occur in the content, ProcessorPipeline skips the processor,
+    # so it must leave such content unchanged. Empty means always run.
+    triggers: Tuple[str, ...] = ()
+
+    # False if process() may change the content without returning changed=True
+    # (e.g. whitespace cleanups). ProcessorPipeline keeps a processor's output
+    # only when it reports a change, so such changes depend on the whole page
+    # (see the reported argument of ProcessorPipeline.process).
+    reports_all_changes = True
+
     @abstractmethod
     def process(self, content):
         """
         Process the content and return a tuple of (new_content, changed).
         """
         pass
+
+    def process_block(self, content: str, position: int) -> Tuple[str, bool]:
+        """
+        Process one block of a page converted block by block.
+
+        Blocks are split so that processors working line by line or within a
+        bullet give the same result either way, which is what this default
+        assumes. Processors that look at the start or the end of the page
+        override it and use position (HEAD, TAIL, FENCED) to decide what applies.
+        """
+        return self.process(content)
+
+
+class LineProcessor(ContentProcessor):
+    """
+    Base class for processors that work line by line.
+
+    ProcessorPipeline passes line processors the content's lines directly, so a
+    run of them shares one split and one join. The lines they return must not
+    contain newlines.
+    """
+
+    def process(self, content):
+        new_lines, changed = self.process_lines(content.split("\n"))
+        return "\n".join(new_lines), changed
+
+    def process_block(self, content: str, position: int) -> Tuple[str, bool]:
+        new_lines, changed = self.process_block_lines(content.split("\n"), position)
+        return "\n".join(new_lines), changed
+
+    def process_block_lines(
+        self, lines: List[str], position: int
+    ) -> Tuple[List[str], bool]:
+        """Line-based process_block (see ContentProcessor.process_block)"""
+        return self.process_lines(lines)
+
+    @abstractmethod
+    def process_lines(self, lines: List[str]) -> Tuple[List[str], bool]:
+        """
+        Process the lines and return a tuple of (new_lines, changed).
+        The given list must not be modified.
+        """
+        pass
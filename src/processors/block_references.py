@@ -1,9 +1,23 @@
 from .base import ContentProcessor
 import re
 import os
+import time
 import urllib.parse
+from concurrent.futures import ProcessPoolExecutor
 from ..utils import find_markdown_files, DateFormatter
-from typing import Dict, Tuple, List, Optional, Match, Pattern
+from .categories_config import CategoriesConfig
+from .title_table import TitleTable
+from typing import Dict, Iterable, Tuple, List, Optional, Match, Pattern
+
+# (block_id, text, page_name)
+Block = Tuple[str, str, str]
+
+# Files without this marker define no blocks, and aren't decoded or scanned
+ID_MARKER = "id::"
+ID_MARKER_BYTES = ID_MARKER.encode("utf-8")
+
+# Fewer files than this are scanned in this process even with several jobs
+MIN_PARALLEL_FILES = 64
 
 
 # Common patterns used for block references
@@ -21,27 +35,53 @@ class BlockReferencePatterns:
     # ID extraction pattern
     ID_PATTERN = r"^(\s*.*?)id::\s*([a-f0-9-]+)(.*)$"
 
+    # Compiled once, shared by every processor and call
+    _BLOCK_REF_RE = re.compile(BLOCK_REF.replace("{UUID}", UUID_PATTERN))
+    _BLOCK_REF_ID_RE = re.compile(BLOCK_REF.replace("{UUID}", f"({UUID_PATTERN})"))
+    _EMBED_REF_RE = re.compile(EMBED_REF.replace("{UUID}", UUID_PATTERN))
+    _ID_RE = re.compile(ID_PATTERN)
+    VALID_BLOCK_ID_RE = re.compile(f"^{UUID_PATTERN}$")
+    EMBED_REF_ID_RE = re.compile(
+        r"\{\{embed\s+\(\(([a-f0-9\-]{7,8}-[a-f0-9\-]{4}-[a-f0-9\-]{4}-[a-f0-9\-]{4}-[a-f0-9\-]{12})\)\)\}\}"
+    )
+    EMBED_GENERIC_RE = re.compile(EMBED_GENERIC)
+    QUERY_BLOCK_RE = re.compile(QUERY_BLOCK, re.MULTILINE)
+    # Only #+BEGIN_SRC...#+END_SRC and #+BEGIN_QUERY...#+END_QUERY blocks
+    # (allowing leading whitespace) are removed
+    SRC_BLOCK_RE = re.compile(
+        r"^\s*#\+BEGIN_SRC.*?^\s*#\+END_SRC", re.DOTALL | re.MULTILINE
+    )
+    QUERY_SECTION_RE = re.compile(
+        r"^\s*#\+BEGIN_QUERY.*?^\s*#\+END_QUERY", re.DOTALL | re.MULTILINE
+    )
+    LEADING_BULLET_RE = re.compile(r"^\s*-\s*")
+
     @classmethod
     def get_block_ref_pattern(cls) -> Pattern:
         """Get compiled regex for block references"""
-        pattern = cls.BLOCK_REF.replace("{UUID}", cls.UUID_PATTERN)
-        return re.compile(pattern)
+        return cls._BLOCK_REF_RE
+
+    @classmethod
+    def get_block_ref_id_pattern(cls) -> Pattern:
+        """Get compiled regex for block references, capturing the block ID"""
+        return cls._BLOCK_REF_ID_RE
 
     @classmethod
     def get_embed_ref_pattern(cls) -> Pattern:
         """Get compiled regex for embedded block references"""
-        pattern = cls.EMBED_REF.replace("{UUID}", cls.UUID_PATTERN)
-        return re.compile(pattern)
+        return cls._EMBED_REF_RE
 
     @classmethod
     def get_id_pattern(cls) -> Pattern:
         """Get compiled regex for block ID extraction"""
-        return re.compile(cls.ID_PATTERN)
+        return cls._ID_RE
 
 
 class BlockReferencesCleaner(ContentProcessor):
     """Clean up LogSeq block references"""
 
+    triggers = ("((", "{{", "#+BEGIN_")
+
     def process(self, content: str) -> Tuple[str, bool]:
         original_content = content
         new_content = content
@@ -86,26 +126,31 @@ class BlockReferencesReplacer(ContentProcessor):
     Replace LogSeq block references with their actual content and a link to the source page.
     """
 
+    triggers = ("((", "{{", "#+BEGIN_")
+
     def __init__(self):
         # Dictionary to store block IDs and their associated text and page names
         # Format: {block_id: (text, page_name)}
         self.block_map: Dict[str, Tuple[str, str]] = {}
-        # Load type definitions if available
-        self.types = self._load_types()
-
-    def _load_types(self) -> set:
-        """Load type definitions from the types.txt file if it exists"""
-        try:
-            categories_dir = os.path.join(
-                os.path.dirname(os.path.dirname(__file__)), "..", "categories_config"
-            )
-            types_path = os.environ.get(
-                "LOGSEQ2REFLECT_TYPES_PATH", os.path.join(categories_dir, "types.txt")
-            )
-            with open(types_path, "r", encoding="utf-8") as f:
-                return set(line.strip().lower() for line in f if line.strip())
-        except Exception:
-            return set()
+        # Replacement text for each block ID, formatted once at collection time
+        # Format: {block_id: "_text ([[Formatted Page Name]])_"}
+        self.block_links: Dict[str, str] = {}
+        # Replacement text for each block ID with the references in the block's
+        # text resolved too, filled as references are replaced (see
+        # _resolve_block_link) and cleared whenever a block changes
+        self.resolved_links: Dict[str, str] = {}
+        self.block_ref_pattern = BlockReferencePatterns.get_block_ref_id_pattern()
+        # Type definitions, shared with the other processors
+        self.types = CategoriesConfig.load().types
+        # Page name -> name used in links to its blocks, computed once per page
+        self.page_link_names = TitleTable(self._page_name_for_link)
+        # Filled by collect_blocks: files scanned for blocks, files skipped as
+        # they have no id:: property, IDs defined in more than one file, and
+        # how long the collection took
+        self.files_scanned = 0
+        self.files_skipped = 0
+        self.duplicate_block_ids = 0
+        self.collect_seconds = 0.0
 
     def _is_direct_child(self, parent: str, child: str) -> bool:
         """Return True if 'child' is an immediate subdirectory of 'parent'"""
@@ -113,21 +158,183 @@ class BlockReferencesReplacer(ContentProcessor):
         child = os.path.abspath(child)
         return os.path.dirname(child) == parent
 
-    def collect_blocks(self, workspace_path: str) -> None:
-        """Scan only 'journals' and 'pages' directories that are direct children of the workspace for block IDs and their text"""
+    def collect_blocks(
+        self, workspace_path: str, index=None, block_index=None, jobs: int = 1
+    ) -> None:
+        """
+        Scan only 'journals' and 'pages' directories that are direct children of the workspace for block IDs and their text.
+        If a WorkspaceIndex is given, the already-loaded file contents are scanned instead.
+        If a PersistentBlockIndex is given, files unchanged since it was written aren't rescanned.
+
+        Args:
+            workspace_path: Path to the LogSeq workspace
+            index: Optional WorkspaceIndex of the workspace
+            block_index: Optional PersistentBlockIndex caching the blocks of each file
+            jobs: Number of processes scanning the files (see scan_files)
+        """
+        start = time.perf_counter()
+        self.files_scanned = 0
+        self.files_skipped = 0
+        self.duplicate_block_ids = 0
+        if block_index is not None:
+            block_index.collect(
+                self, self._list_source_files(workspace_path, index), jobs
+            )
+        else:
+            if index is not None:
+                files = [(f.path, f.content) for f in index.files if f.content]
+            else:
+                files = [
+                    (file_path, None)
+                    for file_path, _, _, _ in self._list_source_files(workspace_path)
+                ]
+            scanned = self.scan_files(files, jobs)
+            self.add_file_blocks(
+                (file_path, blocks)
+                for (file_path, _), blocks in zip(files, scanned)
+                if blocks is not None
+            )
+        self.collect_seconds = time.perf_counter() - start
+
+    def scan_files(
+        self, files: List[Tuple[str, Optional[str]]], jobs: int = 1
+    ) -> List[Optional[List[Block]]]:
+        """
+        Find the blocks defined in each file, without adding them to the block map.
+
+        With several jobs and enough files, the files are scanned in a process
+        pool; the results still come back in the order of the files, so that
+        merging them gives the same block map as a scan in this process.
+
+        Args:
+            files: List of (file_path, content_or_None) tuples; files without
+                   content are read as bytes and only decoded if they contain
+                   an id:: property
+            jobs: Number of processes scanning the files
+
+        Returns:
+            For each file, its blocks, or None if it couldn't be read
+        """
+        # Loaded files without an id:: property aren't sent to the pool at all
+        results: List[Tuple[Optional[List[Block]], Optional[str]]] = [
+            (None, None)
+        ] * len(files)
+        pending = [
+            index
+            for index, (_, content) in enumerate(files)
+            if content is None or ID_MARKER in content
+        ]
+        tasks = [files[index] for index in pending]
+        if jobs > 1 and len(tasks) >= MIN_PARALLEL_FILES:
+            chunksize = max(1, len(tasks) // (jobs * 4))
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                found = executor.map(_scan_file_in_worker, tasks, chunksize=chunksize)
+                for index, result in zip(pending, found):
+                    results[index] = result
+        else:
+            for index, (file_path, content) in zip(pending, tasks):
+                results[index] = self._scan_file(file_path, content)
+        scanned = []
+        for (file_path, _), (blocks, error) in zip(files, results):
+            if error is not None:
+                print(f"Error processing {file_path}: {error}")
+            elif blocks is None:
+                self.files_skipped += 1
+                blocks = []
+            else:
+                self.files_scanned += 1
+            scanned.append(blocks)
+        return scanned
+
+    def _scan_file(
+        self, file_path: str, content: Optional[str]
+    ) -> Tuple[Optional[List[Block]], Optional[str]]:
+        """
+        Find the blocks defined in a file, reading it if its content isn't given.
+
+        Returns:
+            Tuple of (blocks, error); blocks is None if the file was skipped
+            because it has no id:: property, or couldn't be read
+        """
+        try:
+            if content is None:
+                content = read_block_source(file_path)
+            if content is None or ID_MARKER not in content:
+                return None, None
+            return self.find_blocks(file_path, content), None
+        except Exception as e:
+            return None, str(e)
+
+    def add_file_blocks(self, files: Iterable[Tuple[str, List[Block]]]) -> None:
+        """
+        Add the blocks found in files to the block map, in the given order.
+
+        When two files define the same block ID, the later one wins, however
+        the files were scanned. The number of such IDs is kept in
+        duplicate_block_ids.
+
+        Args:
+            files: Iterable of (file_path, blocks) tuples, in scan order
+        """
+        origins: Dict[str, str] = {}
+        duplicates = set()
+        for file_path, blocks in files:
+            for block_id, text, page_name in blocks:
+                if origins.setdefault(block_id, file_path) != file_path:
+                    duplicates.add(block_id)
+                self.add_block(block_id, text, page_name)
+        self.duplicate_block_ids += len(duplicates)
+
+    def _list_source_files(
+        self, workspace_path: str, index=None
+    ) -> List[Tuple[str, int, float, Optional[str]]]:
+        """
+        List the files to collect blocks from, without reading them unless they come
+        from a WorkspaceIndex.
+
+        Returns:
+            List of (file_path, size, mtime, content_or_None) tuples
+        """
+        if index is not None:
+            return [(f.path, f.size, f.mtime, f.content) for f in index.files]
+        files = []
         for subdir in ("journals", "pages"):
             dir_path = os.path.join(workspace_path, subdir)
-            if os.path.isdir(dir_path) and self._is_direct_child(
-                workspace_path, dir_path
-            ):
+            if os.path.isdir(dir_path):
                 for file_path in find_markdown_files(dir_path):
                     try:
-                        with open(file_path, "r", encoding="utf-8") as f:
-                            content = f.read()
-                        page_name = self._extract_page_name(file_path, content)
-                        self._extract_block_ids(content, page_name)
-                    except Exception as e:
+                        stat = os.stat(file_path)
+                    except OSError as e:
                         print(f"Error processing {file_path}: {e}")
+                        continue
+                    file_path = os.path.abspath(file_path)
+                    files.append((file_path, stat.st_size, stat.st_mtime, None))
+        return files
+
+    def find_blocks(self, file_path: str, content: str) -> List[Tuple[str, str, str]]:
+        """
+        Find the blocks defined in a file, without adding them to the block map.
+
+        Returns:
+            List of (block_id, text, page_name) tuples, in file order
+        """
+        page_name = self._extract_page_name(file_path, content)
+        return [
+            (block_id, text, page_name)
+            for block_id, text in self._find_block_texts(content)
+        ]
+
+    def add_block(self, block_id: str, text: str, page_name: str) -> None:
+        """Add a block to the block map, formatting its replacement link"""
+        self.block_map[block_id] = (text, page_name)
+        self.block_links[block_id] = self._format_block_link(text, page_name)
+        self.resolved_links.clear()
+
+    def remove_block(self, block_id: str) -> None:
+        """Remove a block from the block map"""
+        self.block_map.pop(block_id, None)
+        self.block_links.pop(block_id, None)
+        self.resolved_links.clear()
 
     def _extract_page_name(self, file_path: str, content: str) -> str:
         """Extract the page name from the file path or content"""
@@ -146,6 +353,10 @@ class BlockReferencesReplacer(ContentProcessor):
         return base_name.replace("_", " ")
 
     def _format_page_name_for_link(self, page_name: str) -> str:
+        """Return the name used in links to a page, formatted once per page name"""
+        return self.page_link_names[page_name]
+
+    def _page_name_for_link(self, page_name: str) -> str:
         """Format the page name for use in a link, removing type prefixes if present, and formatting journal dates."""
         from ..utils import DateFormatter
 
@@ -182,18 +393,39 @@ class BlockReferencesReplacer(ContentProcessor):
 
     def _extract_block_ids(self, content: str, page_name: str) -> None:
         """Extract all block IDs and their associated text from the content"""
+        for block_id, clean_text in self._find_block_texts(content):
+            self.add_block(block_id, clean_text, page_name)
+
+    def _find_block_texts(self, content: str) -> List[Tuple[str, str]]:
+        """Return (block_id, text) for every valid block ID in the content"""
         id_pattern = BlockReferencePatterns.get_id_pattern()
         lines = content.split("\n")
+        blocks = []
 
         for i, line in enumerate(lines):
-            match = id_pattern.search(line)
+            match = id_pattern.search(line) if "id::" in line else None
             if match:
                 block_id = match.group(2).strip()
                 if not self._is_valid_block_id(block_id):
                     continue
 
                 clean_text = self._extract_block_text(lines, i, match)
-                self.block_map[block_id] = (clean_text, page_name)
+                blocks.append((block_id, clean_text))
+        return blocks
+
+    def _format_block_link(self, text: str, page_name: str) -> str:
+        """Format the replacement for a reference to a block: its text and source page"""
+        formatted_page_name = self._format_page_name_for_link(page_name)
+        return f"_{text} ([[{formatted_page_name}]])_"
+
+    def _get_block_link(self, block_id: str) -> Optional[str]:
+        """Return the replacement for a block ID, or None if the block is unknown"""
+        link = self.block_links.get(block_id)
+        if link is None and block_id in self.block_map:
+            # block_map was filled without going through _extract_block_ids
+            link = self._format_block_link(*self.block_map[block_id])
+            self.block_links[block_id] = link
+        return link
 
     def _extract_block_text(self, lines: List[str], index: int, match: Match) -> str:
         """Extract the text associated with a block ID"""
@@ -217,7 +449,7 @@ class BlockReferencesReplacer(ContentProcessor):
                 i -= 1
 
         # Clean up the text (remove leading/trailing whitespace, bullet points, etc.)
-        clean_text = re.sub(r"^\s*-\s*", "", line_text).strip()
+        clean_text = BlockReferencePatterns.LEADING_BULLET_RE.sub("", line_text).strip()
 
         # Convert LogSeq task markers to Reflect format if present
         if clean_text.startswith("TODO "):
@@ -229,7 +461,9 @@ class BlockReferencesReplacer(ContentProcessor):
 
         # If we still have no content, try to get it from the beginning of the current line
         if not clean_text and match.group(1):
-            clean_text = re.sub(r"^\s*-\s*", "", match.group(1)).strip()
+            clean_text = BlockReferencePatterns.LEADING_BULLET_RE.sub(
+                "", match.group(1)
+            ).strip()
 
         # If the block is a heading (starts with one or more #), bold it and remove the # symbols
         if clean_text.startswith("#"):
@@ -241,30 +475,22 @@ class BlockReferencesReplacer(ContentProcessor):
 
     def _is_valid_block_id(self, block_id: str) -> bool:
         """Check if the block ID matches the expected UUID format"""
-        return bool(
-            re.match(
-                r"^[a-f0-9]{7,8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}$",
-                block_id,
-            )
-        )
+        return bool(BlockReferencePatterns.VALID_BLOCK_ID_RE.match(block_id))
 
     def _replace_embedded_references(self, content: str) -> str:
         """Replace embedded block references while preserving indentation and formatting (optimized)"""
+        if "{{embed" not in content:
+            return content
         lines = content.split("\n")
         modified = False
-        # Precompile the embed pattern to extract block_ids
-        embed_pattern = re.compile(
-            r"\{\{embed\s+\(\(([a-f0-9\-]{7,8}-[a-f0-9\-]{4}-[a-f0-9\-]{4}-[a-f0-9\-]{4}-[a-f0-9\-]{12})\)\)\}\}"
-        )
+        embed_pattern = BlockReferencePatterns.EMBED_REF_ID_RE
 
         for i, line in enumerate(lines):
-            match = embed_pattern.search(line)
+            match = embed_pattern.search(line) if "{{embed" in line else None
             if match:
                 block_id = match.group(1)
-                if block_id in self.block_map:
-                    text, page_name = self.block_map[block_id]
-                    # Format page name for the link
-                    formatted_page_name = self._format_page_name_for_link(page_name)
+                block_link = self._get_block_link(block_id)
+                if block_link is not None:
                     modified = True
                     # Extract indentation and context
                     indent_ws = line[
@@ -278,30 +504,98 @@ class BlockReferencesReplacer(ContentProcessor):
                     # Format the replacement line preserving context
                     if before_embed.strip():
                         # Preserve existing line content
-                        lines[i] = (
-                            f"{before_embed}_{text} ([[{formatted_page_name}]])_{after_embed}"
-                        )
+                        lines[i] = f"{before_embed}{block_link}{after_embed}"
                     else:
                         # No text before the embed, just indentation
                         if is_bullet:
                             # Preserve the bullet point
-                            lines[i] = (
-                                f"{indent_ws}- _{text} ([[{formatted_page_name}]])_{after_embed}"
-                            )
+                            lines[i] = f"{indent_ws}- {block_link}{after_embed}"
                         else:
                             # Just add the content
-                            lines[i] = (
-                                f"{indent_ws}_{text} ([[{formatted_page_name}]])_{after_embed}"
-                            )
+                            lines[i] = f"{indent_ws}{block_link}{after_embed}"
         return "\n".join(lines) if modified else content
 
+    def _resolve_block_link(self, block_id: str) -> Optional[str]:
+        """
+        Return the replacement for a block ID with the references in its own
+        text replaced too, or None if the block is unknown. A reference back to
+        a block whose text is being resolved is left as-is.
+
+        The references are followed depth first with an explicit stack, so long
+        chains don't hit the recursion limit, and the resolution of every block
+        that isn't part of a reference cycle is kept in resolved_links, so
+        blocks referenced from many others are resolved once.
+        """
+        resolved = self.resolved_links.get(block_id)
+        if resolved is not None:
+            return resolved
+        block_link = self._get_block_link(block_id)
+        if block_link is None or "((" not in block_link:
+            return block_link
+        # Frames of [block_id, link, matches, replacements, low], low being the
+        # stack position of the lowest block a reference led back to
+        no_cycle = float("inf")
+        stack = [[block_id, block_link, None, [], no_cycle]]
+        positions = {block_id: 0}
+        while stack:
+            frame = stack[-1]
+            inner_id, link, matches, replacements, low = frame
+            if matches is None:
+                matches = frame[2] = list(self.block_ref_pattern.finditer(link))
+            if len(replacements) < len(matches):
+                match = matches[len(replacements)]
+                ref_id = match.group(1)
+                if ref_id in positions:
+                    frame[4] = min(low, positions[ref_id])
+                    replacements.append(match.group(0))
+                    continue
+                ref_link = self.resolved_links.get(ref_id)
+                if ref_link is None:
+                    ref_link = self._get_block_link(ref_id)
+                    if ref_link is not None and "((" in ref_link:
+                        positions[ref_id] = len(stack)
+                        stack.append([ref_id, ref_link, None, [], no_cycle])
+                        continue
+                if ref_link is None:
+                    ref_link = match.group(0)
+                replacements.append(ref_link)
+                continue
+            parts = []
+            end = 0
+            for match, replacement in zip(matches, replacements):
+                parts.append(link[end : match.start()])
+                parts.append(replacement)
+                end = match.end()
+            parts.append(link[end:])
+            resolved = "".join(parts)
+            stack.pop()
+            del positions[inner_id]
+            # A block in a reference cycle resolves differently depending on
+            # which block of the cycle was reached first, any other block the
+            # same way wherever it's referenced from
+            if low > len(stack):
+                self.resolved_links[inner_id] = resolved
+            if stack:
+                stack[-1][3].append(resolved)
+                stack[-1][4] = min(stack[-1][4], low)
+        return resolved
+
     def _replace_regular_references(self, content: str) -> str:
-        """Replace regular ((block-id)) references"""
-        for block_id, (text, page_name) in self.block_map.items():
-            pattern = r"\(\(" + re.escape(block_id) + r"\)\)"
-            formatted_page_name = self._format_page_name_for_link(page_name)
-            content = re.sub(pattern, f"_{text} ([[{formatted_page_name}]])_", content)
-        return content
+        """
+        Replace regular ((block-id)) references in a single pass over the content.
+        Each reference is looked up in block_links, so the cost doesn't grow with
+        the number of known blocks, and references in the text of a referenced
+        block are resolved the same way. References to unknown blocks are left
+        as-is.
+        """
+        if "((" not in content:
+            return content
+
+        def replacer(match: Match) -> str:
+            block_link = self._resolve_block_link(match.group(1))
+            return block_link if block_link is not None else match.group(0)
+
+        return self.block_ref_pattern.sub(replacer, content)
 
     def _clean_orphaned_references(self, content: str) -> str:
         """Clean up any orphaned references not found in the block map"""
@@ -313,23 +607,14 @@ class BlockReferencesReplacer(ContentProcessor):
             content = BlockReferencePatterns.get_embed_ref_pattern().sub("", content)
 
         # Clean up common patterns regardless
-        # Only remove #+BEGIN_SRC...#+END_SRC and #+BEGIN_QUERY...#+END_QUERY blocks (allow leading whitespace)
-        content = re.sub(
-            r"^\s*#\+BEGIN_SRC.*?^\s*#\+END_SRC",
-            "",
-            content,
-            flags=re.DOTALL | re.MULTILINE,
-        )
-        content = re.sub(
-            r"^\s*#\+BEGIN_QUERY.*?^\s*#\+END_QUERY",
-            "",
-            content,
-            flags=re.DOTALL | re.MULTILINE,
-        )
-        content = re.sub(
-            BlockReferencePatterns.QUERY_BLOCK, "", content, flags=re.MULTILINE
-        )
-        content = re.sub(BlockReferencePatterns.EMBED_GENERIC, "", content)
+        if "#+BEGIN_SRC" in content:
+            content = BlockReferencePatterns.SRC_BLOCK_RE.sub("", content)
+        if "#+BEGIN_QUERY" in content:
+            content = BlockReferencePatterns.QUERY_SECTION_RE.sub("", content)
+        if "{{query" in content:
+            content = BlockReferencePatterns.QUERY_BLOCK_RE.sub("", content)
+        if "{{embed" in content:
+            content = BlockReferencePatterns.EMBED_GENERIC_RE.sub("", content)
 
         return content
 
@@ -347,3 +632,36 @@ class BlockReferencesReplacer(ContentProcessor):
         content = self._clean_orphaned_references(content)
 
         return content, content != original_content
+
+
+def read_block_source(file_path: str) -> Optional[str]:
+    """
+    Read a file to collect its blocks, decoding it only if it contains an id::
+    property.
+
+    Returns:
+        The content with newlines translated as by open() in text mode, or None
+        if the file defines no blocks
+    """
+    with open(file_path, "rb") as f:
+        data = f.read()
+    if ID_MARKER_BYTES not in data:
+        return None
+    content = data.decode("utf-8")
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content
+
+
+# Per-process replacer of the pool processes scanning files for blocks
+_worker_replacer: Optional[BlockReferencesReplacer] = None
+
+
+def _scan_file_in_worker(
+    task: Tuple[str, Optional[str]]
+) -> Tuple[Optional[List[Block]], Optional[str]]:
+    """Find the blocks of a (file_path, content_or_None) task in a pool process"""
+    global _worker_replacer
+    if _worker_replacer is None:
+        _worker_replacer = BlockReferencesReplacer()
+    return _worker_replacer._scan_file(*task)
@@ -0,0 +1,318 @@
+import re
+from typing import Iterator, Optional, Set, Tuple
+
+from .base import FENCED, HEAD, TAIL
+
+# A bullet followed by this property becomes a numbered item, numbered after
+# the items above it, so it can't start a block. Any other top-level bullet
+# ends all numbered lists, so the numbering never depends on an earlier block
+ORDER_LIST_PROPERTY = "logseq.order-list-type"
+BEGIN_PATTERN = re.compile(r"#\+BEGIN_(\w+)")
+FENCES = ("```", "~~~")
+# Properties, block references, embeds, queries and #+BEGIN/#+END sections are
+# rewritten or removed together with the lines around them, so lines containing
+# these never sit next to a block boundary
+BOUNDARY_BLOCKERS = ("::", "((", "{{", "#+")
+# Lines containing these may be removed or merged into other lines before a
+# processor sees them
+UNSTABLE_MARKERS = ("::", "{{", "#+", ":LOGBOOK:", ":END:")
+# EmptyLineBetweenBulletsProcessor reads up to this many lines at the top of a
+# page as its title and tags, so they must all be in the first block
+HEADER_LINES = 4
+
+
+def _pair_fences(line: str, open_fence: Optional[str]) -> Optional[str]:
+    """
+    Follow ``` and ~~~ pairs through a line the way TagToBacklinkProcessor
+    matches them (anywhere in a line, each fence closed by the next same fence).
+
+    Returns:
+        The fence left open at the end of the line, if any
+    """
+    i = 0
+    while True:
+        if open_fence is None:
+            found = [(line.find(fence, i), fence) for fence in FENCES]
+            found = [(pos, fence) for pos, fence in found if pos >= 0]
+            if not found:
+                return None
+            pos, open_fence = min(found)
+        else:
+            pos = line.find(open_fence, i)
+            if pos < 0:
+                return open_fence
+            open_fence = None
+        i = pos + 3
+
+
+def _follow_image(line: str, state: Optional[str]) -> Optional[str]:
+    """
+    Follow ![alt](url){attributes} images through a line; ImageProcessor's
+    pattern lets the alt text, the url and the attributes span lines.
+
+    Returns:
+        The part of an image left open at the end of the line, if any
+    """
+    i = 0
+    while True:
+        if state is None:
+            pos = line.find("![", i)
+            if pos < 0:
+                return None
+            state, i = "alt", pos + 2
+        elif state == "alt":
+            pos = line.find("]", i)
+            if pos < 0:
+                return state
+            if line.startswith("(", pos + 1):
+                state, i = "url", pos + 2
+            else:
+                state, i = None, pos + 1
+        elif state == "url":
+            pos = line.find(")", i)
+            if pos < 0:
+                return state
+            if line.startswith("{", pos + 1):
+                state, i = "attributes", pos + 2
+            else:
+                state, i = None, pos + 1
+        else:
+            pos = line.find("}", i)
+            if pos < 0:
+                return state
+            state, i = None, pos + 1
+
+
+class _OutlineState:
+    """
+    Follows the multi-line constructs the processors handle as a whole (code
+    blocks, #+BEGIN/#+END sections, logbooks, images) through the raw lines of a
+    page.
+
+    The processors see the lines after earlier processors changed them, so where
+    a raw line can't tell what a processor will make of it (e.g. a fence on a
+    property line that will be removed), a state holds every possibility and a
+    block boundary is only allowed once all of them agree that it's outside.
+    """
+
+    def __init__(self, code_blocks: bool):
+        self.code_blocks = code_blocks
+        # (inside a fenced block as code_fence_flags sees it, inside a code block
+        # moved into its own bullet by CodeBlockProcessor)
+        self.code: Set[Tuple[bool, bool]] = {(False, False)}
+        # Fence left open by TagToBacklinkProcessor's fence pairing
+        self.fence: Set[Optional[str]] = {None}
+        # Part of an image link left open by ImageProcessor's pattern
+        self.image: Set[Optional[str]] = {None}
+        # Types of the #+BEGIN_ sections not closed yet
+        self.sections: Set[str] = set()
+        self.logbook = False
+        self.previous: Optional[str] = None
+        # Whether the previous line reaches the processors as it is
+        self.previous_stable = False
+        # Number of lines before that reach the processors as they are
+        self.stable_lines = 0
+
+    def outside(self) -> bool:
+        """
+        Whether a block may start here. It may start in a fenced block as
+        code_fence_flags sees it (see fenced()), as long as that's certain.
+        """
+        return (
+            self.code in ({(False, False)}, {(True, False)})
+            and self.fence == {None}
+            and self.image == {None}
+            and not self.sections
+            and not self.logbook
+        )
+
+    def fenced(self) -> bool:
+        return self.code == {(True, False)}
+
+    def feed(self, line: str) -> None:
+        stripped = line.strip()
+        # LinkProcessor merges indented content into a "- key:: true" line above
+        merged = (
+            self.previous is not None
+            and "::" in self.previous
+            and line[:1].isspace()
+            and not stripped.startswith("-")
+        )
+        unstable = (
+            bool(self.sections)
+            or self.logbook
+            or any(marker in line for marker in UNSTABLE_MARKERS)
+            or merged
+        )
+
+        if "```" in line or "~~~" in line:
+            fences = {_pair_fences(line, state) for state in self.fence}
+            self.fence = fences | self.fence if unstable else fences
+        if "~" in line and "CANCEL" in line:
+            # Cancelled tasks are struck through with "~~", which may add a fence
+            self.fence = {None, *FENCES}
+        if stripped.startswith("```") or self.code != {(False, False)}:
+            self.code = self._follow_code(stripped, unstable)
+        if "![" in line or self.image != {None}:
+            images = {_follow_image(line, state) for state in self.image}
+            self.image = images | self.image if unstable else images
+
+        if "#+" in line:
+            # An end marker in a logbook is removed with it, one after a
+            # property line may be merged into it, and one nested in another
+            # section may be removed with that section (#+BEGIN_SRC)
+            if (
+                stripped.startswith("#+END_")
+                and len(self.sections) == 1
+                and not self.logbook
+                and not merged
+            ):
+                (section,) = self.sections
+                if stripped.startswith(f"#+END_{section}"):
+                    self.sections.clear()
+            for match in BEGIN_PATTERN.finditer(line):
+                self.sections.add(match.group(1))
+        if ":LOGBOOK:" in line or self.logbook:
+            self._follow_logbook(line)
+
+        self.previous = line
+        self.previous_stable = (
+            bool(stripped) and stripped != "-" and not unstable and "((" not in line
+        )
+        self.stable_lines += self.previous_stable
+
+    def _follow_code(self, stripped: str, unstable: bool) -> Set[Tuple[bool, bool]]:
+        """
+        Next code states. CodeBlockProcessor puts a fence that follows a bullet
+        in a bullet of its own (so code_fence_flags no longer counts it) and
+        moves the lines up to the next bare ``` line with it.
+        """
+        fence = stripped.startswith("```")
+        opens = {False}
+        if fence and self.code_blocks and self.previous is not None:
+            if self.previous_stable:
+                opens = {self.previous.lstrip().startswith("- ")}
+            else:
+                opens = {False, True}
+        states = set()
+        for toggled, moved in self.code:
+            if moved:
+                states.add((toggled != fence, stripped != "```"))
+            elif not fence:
+                states.add((toggled, False))
+            else:
+                for opened in opens:
+                    states.add((toggled, True) if opened else (not toggled, False))
+                # EmptyLineBetweenBulletsProcessor doesn't count a fence on the
+                # first line, nor on the second one if the third looks like a
+                # tag line; this one may become either if lines before are
+                # removed
+                if self.stable_lines < 2:
+                    states.add((toggled, False))
+        if unstable:
+            states |= self.code
+        return states
+
+    def _follow_logbook(self, line: str) -> None:
+        """Follow :LOGBOOK: ... :END: drawers (each closed by the first :END:)"""
+        i = 0
+        while True:
+            marker = ":END:" if self.logbook else ":LOGBOOK:"
+            pos = line.find(marker, i)
+            if pos < 0:
+                return
+            self.logbook = not self.logbook
+            i = pos + len(marker)
+
+
+def _can_start_block(line: str, previous: Optional[str]) -> bool:
+    """Check the lines on both sides of a possible block boundary"""
+    if previous is None or not line.startswith("- ") or not line[2:].strip():
+        return False
+    stripped_previous = previous.strip()
+    if not stripped_previous or stripped_previous == "-":
+        return False
+    return not any(
+        blocker in line or blocker in previous for blocker in BOUNDARY_BLOCKERS
+    )
+
+
+def split_blocks(
+    text: str, code_blocks: bool = True, min_size: int = 0
+) -> Iterator[Tuple[str, int]]:
+    """
+    Split a page into blocks that can be converted one at a time, so that a
+    very large page never has to be held in memory as a whole while converting.
+
+    Blocks start at top-level bullets ("- " at column 0). A bullet only starts a
+    block when the processors are known to treat both sides of it separately:
+    it's past the title and tag lines, outside code blocks, #+BEGIN/#+END
+    sections and logbooks, and neither it nor the line before it is blank, an
+    empty bullet, a property, a block reference, an embed, a query or a section
+    marker. Block references are assumed not to expand to code fences.
+
+    Only EmptyLineBetweenBulletsProcessor pairs fences from the start of the
+    page, line by line, so a block may start between two of its fences as long
+    as every processor before it agrees; such blocks are marked FENCED.
+
+    Args:
+        text: Content of the page
+        code_blocks: Whether the pipeline moves code blocks into bullets of
+                     their own (CodeBlockProcessor)
+        min_size: Blocks shorter than this are joined with the ones after them
+
+    Yields:
+        Tuples of (block, position) in order, position being HEAD for the first
+        block, TAIL for the last one and FENCED for blocks that start in a
+        fenced block; "\\n".join() of the blocks gives back text
+    """
+    for start, end, position in block_spans(text, code_blocks, min_size):
+        yield text[start:end], position
+
+
+def block_spans(
+    text: str, code_blocks: bool = True, min_size: int = 0
+) -> Iterator[Tuple[int, int, int]]:
+    """
+    Same as split_blocks, giving (start, end, position) for each block so
+    that text[start:end] is the block.
+    """
+    start, fenced, position = 0, False, HEAD
+    for boundary, boundary_fenced in _boundaries(text, code_blocks):
+        if boundary - start > min_size:
+            yield start, boundary - 1, position | (FENCED if fenced else 0)
+            start, fenced, position = boundary, boundary_fenced, 0
+    yield start, len(text), position | TAIL | (FENCED if fenced else 0)
+
+
+def _boundaries(text: str, code_blocks: bool) -> Iterator[Tuple[int, bool]]:
+    """
+    Yield (offset, starts in a fenced block) for the lines that start a
+    block other than the first
+    """
+    state = _OutlineState(code_blocks)
+    # Start of a line that begins the next block unless it turns out to be a
+    # numbered item (decided at the next non-blank line)
+    candidate = -1
+    candidate_fenced = False
+    pos = 0
+    length = len(text)
+    while pos <= length:
+        end = text.find("\n", pos)
+        if end < 0:
+            end = length
+        line = text[pos:end]
+        if candidate >= 0 and line.strip():
+            if ORDER_LIST_PROPERTY not in line:
+                yield candidate, candidate_fenced
+            candidate = -1
+        if (
+            state.stable_lines >= HEADER_LINES
+            and state.outside()
+            and _can_start_block(line, state.previous)
+        ):
+            candidate, candidate_fenced = pos, state.fenced()
+        state.feed(line)
+        pos = end + 1
+    if candidate >= 0:
+        yield candidate, candidate_fenced
@@ -0,0 +1,133 @@
+import os
+from typing import Dict, Optional, Tuple
+
+# Use environment variables for config paths if set, else default
+CATEGORIES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "..", "categories_config"
+)
+UPPERCASE_PATH = os.environ.get(
+    "LOGSEQ2REFLECT_UPPERCASE_PATH", os.path.join(CATEGORIES_DIR, "uppercase.txt")
+)
+TYPES_PATH = os.environ.get(
+    "LOGSEQ2REFLECT_TYPES_PATH", os.path.join(CATEGORIES_DIR, "types.txt")
+)
+LOWERCASE_PATH = os.path.join(CATEGORIES_DIR, "lowercase.txt")
+
+
+def default_uppercase_path() -> str:
+    """Path of uppercase.txt, read from LOGSEQ2REFLECT_UPPERCASE_PATH at call time"""
+    return os.environ.get(
+        "LOGSEQ2REFLECT_UPPERCASE_PATH", os.path.join(CATEGORIES_DIR, "uppercase.txt")
+    )
+
+
+def default_types_path() -> str:
+    """Path of types.txt, read from LOGSEQ2REFLECT_TYPES_PATH at call time"""
+    return os.environ.get(
+        "LOGSEQ2REFLECT_TYPES_PATH", os.path.join(CATEGORIES_DIR, "types.txt")
+    )
+
+
+def load_uppercase_terms(uppercase_path=UPPERCASE_PATH):
+    try:
+        with open(uppercase_path, "r", encoding="utf-8") as f:
+            return set(line.strip().upper() for line in f if line.strip())
+    except Exception:
+        return set()
+
+
+def load_types(types_path=TYPES_PATH):
+    try:
+        with open(types_path, "r", encoding="utf-8") as f:
+            return set(line.strip().lower() for line in f if line.strip())
+    except Exception:
+        return set()
+
+
+def load_lowercase_words(lowercase_path=None):
+    if lowercase_path is None:
+        lowercase_path = LOWERCASE_PATH
+    try:
+        with open(lowercase_path, "r", encoding="utf-8") as f:
+            return set(line.strip().lower() for line in f if line.strip())
+    except Exception as e:
+        raise RuntimeError(
+            f"Could not load lowercase words from {lowercase_path}: {e}. Please provide a valid lowercase.txt file."
+        )
+
+
+class CategoriesConfig:
+    """
+    Word lists from a categories config directory (uppercase.txt, types.txt,
+    lowercase.txt), loaded once per set of files and shared by every processor.
+
+    Instances are immutable; use CategoriesConfig.load() or from_paths() rather
+    than the constructor so the files are only read the first time.
+    """
+
+    # (uppercase_path, types_path, lowercase_path) -> loaded config
+    _cache: Dict[Tuple[str, str, str], "CategoriesConfig"] = {}
+
+    def __init__(self, uppercase_path: str, types_path: str, lowercase_path: str):
+        self.uppercase_path = uppercase_path
+        self.types_path = types_path
+        self.lowercase_path = lowercase_path
+        self.uppercase_terms = frozenset(load_uppercase_terms(uppercase_path))
+        self.types = frozenset(load_types(types_path))
+        # Only the page title processor needs lowercase words, and a missing file
+        # is an error for it alone, so the error is kept until they are requested
+        try:
+            self._lowercase_words = frozenset(load_lowercase_words(lowercase_path))
+            self._lowercase_error = None
+        except RuntimeError as e:
+            self._lowercase_words = None
+            self._lowercase_error = e
+
+    @property
+    def lowercase_words(self) -> frozenset:
+        """Words kept lowercase in titles; raises RuntimeError if the file is missing"""
+        if self._lowercase_words is None:
+            raise self._lowercase_error
+        return self._lowercase_words
+
+    @classmethod
+    def load(cls, config_dir: Optional[str] = None) -> "CategoriesConfig":
+        """
+        Return the config for a categories config directory.
+
+        Args:
+            config_dir: Directory containing uppercase.txt, types.txt and
+                        lowercase.txt. If None, the default files (or the
+                        LOGSEQ2REFLECT_* environment variables) are used.
+        """
+        if config_dir:
+            return cls.from_paths(
+                os.path.join(config_dir, "uppercase.txt"),
+                os.path.join(config_dir, "types.txt"),
+                os.path.join(config_dir, "lowercase.txt"),
+            )
+        return cls.from_paths()
+
+    @classmethod
+    def from_paths(
+        cls,
+        uppercase_path: Optional[str] = None,
+        types_path: Optional[str] = None,
+        lowercase_path: Optional[str] = None,
+    ) -> "CategoriesConfig":
+        """Return the config for individual files, loading them on first use"""
+        key = (
+            os.path.abspath(uppercase_path or default_uppercase_path()),
+            os.path.abspath(types_path or default_types_path()),
+            os.path.abspath(lowercase_path or LOWERCASE_PATH),
+        )
+        config = cls._cache.get(key)
+        if config is None:
+            config = cls(*key)
+            cls._cache[key] = config
+        return config
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Forget loaded configs, e.g. after the files were edited"""
+        cls._cache.clear()
@@ -1,5 +1,5 @@
 from ..utils import DateFormatter
-from .base import ContentProcessor
+from .base import HEAD, ContentProcessor
 
 
 class DateHeaderProcessor(ContentProcessor):
@@ -13,3 +13,8 @@ class DateHeaderProcessor(ContentProcessor):
         if not first_line.startswith("# "):
             return f"# {self.formatted_date}\n\n{content}", True
         return content, False
+
+    def process_block(self, content, position):
+        if not position & HEAD:
+            return content, False
+        return self.process(content)
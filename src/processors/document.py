@@ -0,0 +1,95 @@
+from typing import Dict, List, Optional
+
+
+def is_code_fence(line: str) -> bool:
+    """Check whether a line opens or closes a fenced code block"""
+    return line.strip().startswith("```")
+
+
+def code_fence_flags(
+    lines: List[str], start: int = 0, inside: bool = False
+) -> List[bool]:
+    """
+    Mark which lines are inside a fenced code block.
+
+    Fence lines toggle the state and are themselves marked as inside, so an
+    unclosed fence extends to the end of the content.
+
+    Args:
+        lines: Lines of the content
+        start: Index of the first line to consider; earlier lines are never in code
+        inside: Whether the line at start is already inside a fenced block
+
+    Returns:
+        One flag per line
+    """
+    flags = [False] * len(lines)
+    in_code_block = inside
+    for i in range(start, len(lines)):
+        if is_code_fence(lines[i]):
+            in_code_block = not in_code_block
+            flags[i] = True
+        else:
+            flags[i] = in_code_block
+    return flags
+
+
+class Document:
+    """
+    The content of one file as it moves through a ProcessorPipeline.
+
+    Holds the text, the list of lines, or both, and converts between them only
+    when a processor needs the other form. A run of line processors therefore
+    shares one split and one join instead of splitting and joining each time.
+    """
+
+    def __init__(self, text: str):
+        self._text: Optional[str] = text
+        self._lines: Optional[List[str]] = None
+        # Substring checks against the current content, see contains()
+        self._contains: Dict[str, bool] = {}
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = "\n".join(self._lines)
+        return self._text
+
+    @text.setter
+    def text(self, text: str) -> None:
+        self._text = text
+        self._lines = None
+        self._contains = {}
+
+    @property
+    def lines(self) -> List[str]:
+        if self._lines is None:
+            self._lines = self._text.split("\n")
+        return self._lines
+
+    @lines.setter
+    def lines(self, lines: List[str]) -> None:
+        # An empty list and [""] are the same (empty) text
+        self._lines = lines or [""]
+        self._text = None
+        self._contains = {}
+
+    def contains(self, needle: str) -> bool:
+        """
+        Check whether the content contains a substring.
+
+        Results are remembered until the content changes, so processors that share
+        a trigger only cost one scan between two changes.
+        """
+        found = self._contains.get(needle)
+        if found is None:
+            found = self._contains[needle] = needle in self.text
+        return found
+
+    def size(self) -> int:
+        """Size of the content in UTF-8 bytes"""
+        if self._text is not None:
+            return len(self._text.encode("utf-8"))
+        return sum(len(line.encode("utf-8")) for line in self._lines) + max(
+            len(self._lines) - 1, 0
+        )
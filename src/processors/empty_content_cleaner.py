@@ -1,17 +1,18 @@
-from .base import ContentProcessor
+from .base import LineProcessor
 import re
 
+TASK_LINE_PATTERN = re.compile(r"^\s*-\s*\[[ x]\]")
 
-class EmptyContentCleaner(ContentProcessor):
+
+class EmptyContentCleaner(LineProcessor):
     """Clean up empty lines and empty bullet points left after content removal"""
 
-    def process(self, content):
-        lines = content.split("\n")
+    def process_lines(self, lines):
         new_lines = []
 
         for i, line in enumerate(lines):
             # Skip empty bullet points (just "- " with possible whitespace)
-            if re.match(r"^\s*-\s*$", line):
+            if line.strip() == "-":
                 continue
 
             # Add non-empty lines or lines that aren't just whitespace after a task
@@ -19,7 +20,7 @@ class EmptyContentCleaner(ContentProcessor):
             if (
                 i > 0
                 and not line.strip()
-                and re.match(r"^\s*-\s*\[[ x]\]", lines[i - 1])
+                and TASK_LINE_PATTERN.match(lines[i - 1])
             ):
                 # Check if this empty line is followed by a heading
                 if i < len(lines) - 1 and lines[i + 1].strip().startswith("#"):
@@ -28,5 +29,4 @@ class EmptyContentCleaner(ContentProcessor):
 
             new_lines.append(line)
 
-        new_content = "\n".join(new_lines)
-        return new_content, new_content != content
+        return new_lines, new_lines != lines
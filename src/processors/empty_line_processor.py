@@ -1,8 +1,9 @@
-from .base import ContentProcessor
+from .base import FENCED, HEAD, TAIL, LineProcessor
+from .document import code_fence_flags
 import re
 
 
-class EmptyLineBetweenBulletsProcessor(ContentProcessor):
+class EmptyLineBetweenBulletsProcessor(LineProcessor):
     """
     Removes empty lines between bullet points while preserving:
     1. Empty lines within a bullet's content
@@ -10,24 +11,35 @@ class EmptyLineBetweenBulletsProcessor(ContentProcessor):
     3. Empty lines after title and tags
     """
 
-    def process(self, content):
-        if not content:
-            return content, False
+    # Rewriting the title and tag lines doesn't count as a change
+    reports_all_changes = False
 
-        lines = content.split("\n")
+    def process_lines(self, lines):
+        return self._process(lines, header=True, fenced=False, bullet_after=False)
+
+    def process_block_lines(self, lines, position):
+        # The title and tags are at the top of the first block; blocks other than
+        # the last are followed by a bullet (see split_blocks)
+        return self._process(
+            lines,
+            header=bool(position & HEAD),
+            fenced=bool(position & FENCED),
+            bullet_after=not position & TAIL,
+        )
+
+    def _process(self, lines, header, fenced, bullet_after):
         result = []
         changes_made = False
-        in_code_block = False
         i = 0
 
         # Title and tag handling (first 2-4 lines)
-        if len(lines) > 0:
+        if header and len(lines) > 0:
             result.append(lines[0])
             i += 1
-        if len(lines) > 1 and lines[1].strip() == "":
+        if header and len(lines) > 1 and lines[1].strip() == "":
             result.append(lines[1])
             i += 1
-        if len(lines) > 2 and re.match(r"^#\w+", lines[2].strip()):
+        if header and len(lines) > 2 and re.match(r"^#\w+", lines[2].strip()):
             result.append(lines[2])
             i += 1
             if len(lines) > 3 and lines[3].strip() == "":
@@ -35,20 +47,14 @@ class EmptyLineBetweenBulletsProcessor(ContentProcessor):
                 i += 1
 
         # Main processing
+        in_code_block = code_fence_flags(lines, start=i, inside=fenced)
         while i < len(lines):
             line = lines[i]
             current_line = line.strip()
 
-            # Track code blocks
-            if current_line.startswith("```"):
-                in_code_block = not in_code_block
-                result.append(line)
-                i += 1
-                continue
-
             # Handle empty lines
             if current_line == "":
-                if in_code_block:
+                if in_code_block[i]:
                     result.append(line)
                     i += 1
                     continue
@@ -57,7 +63,10 @@ class EmptyLineBetweenBulletsProcessor(ContentProcessor):
                 next_idx = i + 1
                 while next_idx < len(lines) and lines[next_idx].strip() == "":
                     next_idx += 1
-                next_line = lines[next_idx] if next_idx < len(lines) else ""
+                if next_idx < len(lines):
+                    next_line = lines[next_idx]
+                else:
+                    next_line = "- " if bullet_after else ""
                 next_is_bullet = next_line.lstrip().startswith("-")
 
                 # Remove the empty line if the next non-empty line is a bullet
@@ -72,5 +81,4 @@ class EmptyLineBetweenBulletsProcessor(ContentProcessor):
                 result.append(line)
             i += 1
 
-        new_content = "\n".join(result)
-        return new_content, changes_made
+        return result, changes_made
@@ -1,16 +1,24 @@
-from .base import ContentProcessor
+from .base import HEAD, LineProcessor
 import re
 
+TITLE_PATTERN = re.compile(r"^#\s+.+")
+INDENTED_BULLET_PATTERN = re.compile(r"^\s+(-\s+)")
 
-class FirstContentIndentationProcessor(ContentProcessor):
+
+class FirstContentIndentationProcessor(LineProcessor):
     """
     Handles edge cases where the first line of content is incorrectly indented.
     This typically happens after properties are processed, which can leave the first
     content line with indentation that should be removed.
     """
 
-    def process(self, content):
-        lines = content.split("\n")
+    def process_block_lines(self, lines, position):
+        # The first content line is in the first block
+        if not position & HEAD:
+            return lines, False
+        return self.process_lines(lines)
+
+    def process_lines(self, lines):
         new_lines = []
         title_found = False
         first_content_found = False
@@ -18,22 +26,24 @@ class FirstContentIndentationProcessor(ContentProcessor):
 
         for i, line in enumerate(lines):
             # Check if this is a title line
-            if re.match(r"^#\s+.+", line.strip()):
+            stripped = line.strip()
+            if stripped.startswith("#") and TITLE_PATTERN.match(stripped):
                 title_found = True
                 new_lines.append(line)
                 continue
 
             # Skip empty lines
-            if not line.strip():
+            if not stripped:
                 new_lines.append(line)
                 continue
 
             # If we already found the title and this is the first non-empty line after it
             # and it's indented, remove the indentation
-            if title_found and not first_content_found and line.strip():
+            if title_found and not first_content_found:
                 # If line starts with indentation + bullet, remove indentation
-                if re.match(r"^\s+-\s+", line):
-                    unindented_line = re.sub(r"^\s+(-\s+)", r"\1", line)
+                bullet_match = INDENTED_BULLET_PATTERN.match(line)
+                if bullet_match:
+                    unindented_line = line[bullet_match.start(1) :]
                     new_lines.append(unindented_line)
                     first_content_found = True
                     changed = unindented_line != line
@@ -41,8 +51,6 @@ class FirstContentIndentationProcessor(ContentProcessor):
 
             # Add all other lines as-is
             new_lines.append(line)
-            if line.strip():
-                first_content_found = True
+            first_content_found = True
 
-        new_content = "\n".join(new_lines)
-        return new_content, changed
+        return new_lines, changed
@@ -1,20 +1,23 @@
-from .base import ContentProcessor
+from .base import HEAD, LineProcessor
 import re
 
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.*?)$")
 
-class HeadingProcessor(ContentProcessor):
+
+class HeadingProcessor(LineProcessor):
     """
     Process headings in the content:
     1. Preserve H1 headings that start the file instead of replacing them
     2. Put first heading of file in a bullet if not already
     """
 
-    def process(self, content):
-        # Skip empty content
-        if not content:
-            return content, False
+    def process_block_lines(self, lines, position):
+        # Only the first heading of the page is affected
+        if not position & HEAD:
+            return lines, False
+        return self.process_lines(lines)
 
-        lines = content.split("\n")
+    def process_lines(self, lines):
         new_lines = lines.copy()
         changed = False
 
@@ -49,7 +52,7 @@ class HeadingProcessor(ContentProcessor):
 
             # Check if the line is a heading (starts with one or more #)
             # Match any heading, including H1 headings (we now want to put H1 headings in bullets too)
-            heading_match = re.match(r"^(#{1,6})\s+(.*?)$", line)
+            heading_match = HEADING_PATTERN.match(line)
 
             if heading_match and not line.strip().startswith("- "):
                 # It's a heading not in a bullet - convert it
@@ -58,4 +61,4 @@ class HeadingProcessor(ContentProcessor):
                 new_lines[first_content_idx] = f"- {heading_level} {heading_content}"
                 changed = True
 
-        return "\n".join(new_lines), changed
+        return new_lines, changed
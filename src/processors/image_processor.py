@@ -6,6 +6,8 @@ import os
 class ImageProcessor(ContentProcessor):
     """Process LogSeq image links for Reflect compatibility"""
 
+    triggers = ("![",)
+
     def __init__(self):
         # Regular expression to match both patterns:
         # 1. With attributes: ![IMG_1667...jpg](../assets/IMG_1667...jpg){:height 325, :width 423}
@@ -1,132 +1,24 @@
-from .base import ContentProcessor
-import re
+from .base import LineProcessor
 
 
-class IndentedBulletPointsProcessor(ContentProcessor):
+class IndentedBulletPointsProcessor(LineProcessor):
     """
-    Process indented bullet points with tabs and convert them to a format compatible with Reflect.
+    Process indented bullet points with tabs and keep them in a format compatible
+    with Reflect.
 
-    1. Removes one level of tab indentation from bullet points directly under headings
-    2. Preserves the hierarchical structure of nested bullet points
-    3. Ensures proper indentation levels are maintained throughout bullet hierarchies
-    4. Preserves indentation for list items that contain headings with tasks
-    5. Preserves code blocks and their internal indentation, including hashtags
-    """
-
-    def process(
-        self,
-        content,
-        parent_is_heading=False,
-        heading_child_level=None,
-        heading_root=False,
-        heading_root_level=0,
-    ):
-        # --- Tree Node definition ---
-        class Node:
-            def __init__(self, line, indent):
-                self.line = line
-                self.indent = indent
-                self.children = []
-                # Check if line is None (for root node)
-                if line is not None:
-                    self.is_code_block_start = line.strip().startswith("```")
-                    self.is_code_block_end = (
-                        line.strip() == "```" and not self.is_code_block_start
-                    )
-                else:
-                    self.is_code_block_start = False
-                    self.is_code_block_end = False
-                self.in_code_block = False
-
-        # --- Parse lines into a tree ---
-        def parse_tree(lines):
-            root = Node(None, -1)
-            stack = [root]
-            in_code_block = False
-            for line in lines:
-                indent = 0
-                for char in line:
-                    if char == "\t":
-                        indent += 1
-                    else:
-                        break
-
-                # Create new node with proper indentation
-                node = Node(line.lstrip("\t"), indent)
-
-                # Toggle code block state
-                if node.is_code_block_start:
-                    in_code_block = True
-                elif node.is_code_block_end:
-                    in_code_block = False
-
-                # Mark the node as part of a code block
-                node.in_code_block = in_code_block
-
-                # Find parent (only find parent outside code blocks)
-                if not in_code_block and not node.is_code_block_start:
-                    while stack and stack[-1].indent >= indent:
-                        stack.pop()
-
-                stack[-1].children.append(node)
-                if not in_code_block and not node.is_code_block_end:
-                    stack.append(node)
+    Reflect reads LogSeq's tab-indented bullet hierarchies as they are, so every
+    line is kept unchanged:
 
-            return root
+    1. Bullet points directly under headings keep their tab indentation
+    2. The hierarchical structure of nested bullet points is preserved
+    3. List items that contain headings with tasks keep their indentation
+    4. Code blocks keep their internal indentation, including hashtags
 
-        # --- Process the tree recursively ---
-        def process_node(
-            node,
-            parent_is_heading=False,
-            heading_root=False,
-            heading_root_level=0,
-            in_code_block=False,
-        ):
-            output = []
-
-            # Track if we're in a code block for this subtree
-            current_in_code_block = in_code_block
-
-            for child in node.children:
-                # Toggle code block state
-                if child.is_code_block_start:
-                    current_in_code_block = True
-
-                # If we're in a code block, preserve the line exactly as is with proper indentation
-                if current_in_code_block or child.is_code_block_start:
-                    output.append(("\t" * child.indent) + child.line)
-                else:
-                    # For non-code blocks, handle as normal
-                    trimmed = child.line.lstrip()
-                    is_section_heading = child.line.strip().startswith("#")
-                    is_bullet = trimmed.startswith("- ")
-
-                    # No more bullet promotion or indentation removal logic
-                    output.append(("\t" * child.indent) + child.line)
-                    output.extend(
-                        process_node(
-                            child,
-                            parent_is_heading=False,
-                            heading_root=False,
-                            heading_root_level=0,
-                            in_code_block=False,
-                        )
-                    )
-
-                # Toggle code block state back if this was the end
-                if child.is_code_block_end:
-                    current_in_code_block = False
-
-            return output
+    This used to rebuild a tree of the outline and re-emit it, which gave back the
+    input line for line but cost a node per line and recursed once per
+    indentation level (deep outlines hit the recursion limit). The lines are now
+    returned as they are, in constant time and at any depth.
+    """
 
-        lines = content.split("\n") if content else []
-        tree = parse_tree(lines)
-        processed_lines = process_node(
-            tree,
-            parent_is_heading=parent_is_heading,
-            heading_root=heading_root,
-            heading_root_level=heading_root_level,
-            in_code_block=False,
-        )
-        new_content = "\n".join(processed_lines)
-        return new_content, new_content != content
+    def process_lines(self, lines):
+        return lines, False
@@ -1,18 +1,35 @@
 from .base import ContentProcessor
 import re
 
+# LogSeq block ID lines (entire line, any indentation, 7 or 8 char UUID)
+BLOCK_ID_LINE_PATTERN = re.compile(
+    r"^\s*id:: [a-f0-9]{7,8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}\s*$",
+    re.MULTILINE,
+)
+# Boolean properties such as "collapsed:: true", alone or after a bullet
+PROPERTY_LINE_PATTERN = re.compile(r"^\s*[a-z]+::\s+(?:true|false)\s*$")
+BULLET_PROPERTY_LINE_PATTERN = re.compile(r"^(\s*)-\s+[a-z]+::\s+(?:true|false)\s*$")
+BULLET_PROPERTY_PREFIX_PATTERN = re.compile(
+    r"^(\s*-\s+)[a-z]+::\s+(?:true|false)\s+(.+)$"
+)
+INLINE_PROPERTY_PATTERN = re.compile(r"\s+[a-z]+::\s+(?:true|false)")
+LEADING_WHITESPACE_PATTERN = re.compile(r"^\s+")
+TRAILING_WHITESPACE_PATTERN = re.compile(r"[ \t]+$", re.MULTILINE)
+EXTRA_NEWLINES_PATTERN = re.compile(r"\n{3,}")
+EMPTY_BULLET_PATTERN = re.compile(r"^(\s*)-\s*$", re.MULTILINE)
+
 
 class LinkProcessor(ContentProcessor):
     """Process LogSeq links for Reflect compatibility"""
 
+    # The whitespace and empty bullet cleanups don't count as changes
+    reports_all_changes = False
+
     def process(self, content):
         # Remove LogSeq block IDs (entire line, any indentation, 7 or 8 char UUID)
-        new_content = re.sub(
-            r"^\s*id:: [a-f0-9]{7,8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}\s*$",
-            "",
-            content,
-            flags=re.MULTILINE,
-        )
+        new_content = content
+        if "id:: " in content:
+            new_content = BLOCK_ID_LINE_PATTERN.sub("", content)
         changed = new_content != content
 
         # Process the content line by line for more precise handling
@@ -23,75 +40,71 @@ class LinkProcessor(ContentProcessor):
             line = lines[i]
             i += 1
 
+            # Every case below is about a "key:: value" property
+            if "::" not in line:
+                new_lines.append(line)
+                continue
+
             # Case 1: Line only contains a property (no bullet point)
-            if re.match(r"^\s*[a-z]+::\s+(?:true|false)\s*$", line):
+            if PROPERTY_LINE_PATTERN.match(line):
                 changed = True
                 continue
 
             # Case 2: Line starts with a bullet and only contains a property followed by indented content on next line
             # Example: "- collapsed:: true\n  content..."
-            if (
-                re.match(r"^\s*-\s+[a-z]+::\s+(?:true|false)\s*$", line)
-                and i < len(lines)
-                and lines[i].strip()
-            ):
-                indent_match = re.match(
-                    r"^(\s*)-\s+[a-z]+::\s+(?:true|false)\s*$", line
-                )
-                if indent_match:
-                    indentation = indent_match.group(1)
-                    # We found a property line with content on next line
-                    bullet_line = f"{indentation}- "
-
-                    # If next line is indented content that belongs to this bullet
-                    if (
-                        i < len(lines)
-                        and re.match(r"^\s+", lines[i])
-                        and not lines[i].lstrip().startswith("-")
-                    ):
-                        # Add the bullet followed directly by the content (without a newline between)
-                        next_line = lines[i]
-                        # Make sure we maintain the proper indentation for the content
-                        if next_line.strip():
-                            next_line_content = next_line.lstrip()
-                            bullet_line += next_line_content
-                            new_lines.append(bullet_line)
+            indent_match = BULLET_PROPERTY_LINE_PATTERN.match(line)
+            if indent_match and i < len(lines) and lines[i].strip():
+                indentation = indent_match.group(1)
+                # We found a property line with content on next line
+                bullet_line = f"{indentation}- "
+
+                # If next line is indented content that belongs to this bullet
+                if (
+                    i < len(lines)
+                    and LEADING_WHITESPACE_PATTERN.match(lines[i])
+                    and not lines[i].lstrip().startswith("-")
+                ):
+                    # Add the bullet followed directly by the content (without a newline between)
+                    next_line = lines[i]
+                    # Make sure we maintain the proper indentation for the content
+                    if next_line.strip():
+                        next_line_content = next_line.lstrip()
+                        bullet_line += next_line_content
+                        new_lines.append(bullet_line)
+                        i += 1
+
+                        # Handle additional lines of content for this bullet
+                        while (
+                            i < len(lines)
+                            and lines[i].strip()
+                            and not lines[i].lstrip().startswith("-")
+                        ):
+                            new_lines.append(lines[i])
                             i += 1
 
-                            # Handle additional lines of content for this bullet
-                            while (
-                                i < len(lines)
-                                and lines[i].strip()
-                                and not lines[i].lstrip().startswith("-")
-                            ):
-                                new_lines.append(lines[i])
-                                i += 1
-
-                        else:
-                            # Empty line case
-                            new_lines.append(bullet_line)
                     else:
-                        # No content case
+                        # Empty line case
                         new_lines.append(bullet_line)
+                else:
+                    # No content case
+                    new_lines.append(bullet_line)
 
-                    changed = True
-                    continue
+                changed = True
+                continue
 
             # Case 3: Line contains a bullet with a property followed by content on same line
             # Example: "- collapsed:: true Some content"
-            if re.match(r"^\s*-\s+[a-z]+::\s+(?:true|false)\s+.+", line):
+            prefix_match = BULLET_PROPERTY_PREFIX_PATTERN.match(line)
+            if prefix_match:
                 # Keep the bullet and the content, removing just the property
-                new_line = re.sub(
-                    r"^(\s*-\s+)[a-z]+::\s+(?:true|false)\s+(.+)$", r"\1\2", line
-                )
-                new_lines.append(new_line)
+                new_lines.append(prefix_match.group(1) + prefix_match.group(2))
                 changed = True
                 continue
 
             # Case 4: Line contains an inline property within it
-            if re.search(r"\s+[a-z]+::\s+(?:true|false)", line):
-                # Remove just the property part
-                new_line = re.sub(r"\s+[a-z]+::\s+(?:true|false)", "", line)
+            new_line = INLINE_PROPERTY_PATTERN.sub("", line)
+            if new_line != line:
+                # Removed just the property part
                 new_lines.append(new_line)
                 changed = True
                 continue
@@ -102,17 +115,12 @@ class LinkProcessor(ContentProcessor):
         new_content = "\n".join(new_lines)
 
         # Clean up any extra whitespace while preserving indentation
-        new_content = re.sub(
-            r"[ \t]+$", "", new_content, flags=re.MULTILINE
-        )  # Remove trailing spaces
-        new_content = re.sub(
-            r"^[ \t]+$", "", new_content, flags=re.MULTILINE
-        )  # Remove lines with only spaces
-        new_content = re.sub(
-            r"\n{3,}", "\n\n", new_content
-        )  # Collapse multiple newlines
+        # (removing trailing spaces also empties lines that only had spaces)
+        new_content = TRAILING_WHITESPACE_PATTERN.sub("", new_content)
+        if "\n\n\n" in new_content:
+            new_content = EXTRA_NEWLINES_PATTERN.sub("\n\n", new_content)
 
         # Fix empty bullet points
-        new_content = re.sub(r"^(\s*)-\s*$", r"\1- ", new_content, flags=re.MULTILINE)
+        new_content = EMPTY_BULLET_PATTERN.sub(r"\1- ", new_content)
 
         return new_content, changed
@@ -1,20 +1,75 @@
-from .base import ContentProcessor
+from .base import LineProcessor
 import re
 
+ORDER_LIST_PROPERTY = "logseq.order-list-type"
+ORDER_LIST_PROPERTY_PATTERN = re.compile(
+    r"^\s*logseq\.order-list-type::\s*number\s*$"
+)
+# A bullet with content on the same line
+BULLET_PATTERN = re.compile(r"^(\s*)-\s+(\S.*?)\r?$")
 
-class OrderedListProcessor(ContentProcessor):
-    """Convert LogSeq ordered-list property into Markdown numbered list items."""
 
-    def process(self, content):
-        # Find bullets followed by logseq.order-list-type:: number property and convert them
-        pattern = re.compile(
-            r"(?m)^(?P<indent>\s*)-\s+(?P<item>.+?)\r?\n\s*logseq\.order-list-type::\s*number\r?\n?"
-        )
+class OrderedListProcessor(LineProcessor):
+    """
+    Convert LogSeq ordered-list property into Markdown numbered list items.
 
-        def repl(m):
-            indent = m.group("indent") or ""
-            item = m.group("item")
-            return f"{indent}1. {item}\n"
+    A bullet whose next non-blank line is "logseq.order-list-type:: number"
+    becomes a numbered item and the property line is dropped. Items are numbered
+    by their position among consecutive numbered siblings (1., 2., 3.), so
+    nested lists are numbered on their own; a sibling that isn't numbered, or
+    text at the same or a shallower indentation, starts the numbering again.
+    """
 
-        new_content = pattern.sub(repl, content)
-        return new_content, new_content != content
+    triggers = (ORDER_LIST_PROPERTY,)
+
+    def process_lines(self, lines):
+        # Bullet line -> (its property line, bullet match), found by looking
+        # back from each property line past blank lines
+        items = {}
+        for i in [i for i, line in enumerate(lines) if ORDER_LIST_PROPERTY in line]:
+            if not ORDER_LIST_PROPERTY_PATTERN.match(lines[i]):
+                continue
+            j = i - 1
+            while j >= 0 and not lines[j].strip():
+                j -= 1
+            match = BULLET_PATTERN.match(lines[j]) if j >= 0 else None
+            if match:
+                items[j] = i, match
+        if not items:
+            return lines, False
+
+        # Only the lines from the first item to the last property can change
+        i = next(iter(items))
+        end = items[next(reversed(items))][0]
+        result = lines[:i]
+        # (indentation width, number of the last item) for each numbered list
+        # still open, innermost last
+        open_lists = []
+        while i <= end:
+            line = lines[i]
+            stripped = line.lstrip()
+            if not stripped:
+                result.append(line)
+                i += 1
+                continue
+
+            indent = len(line) - len(stripped)
+            while open_lists and open_lists[-1][0] > indent:
+                open_lists.pop()
+            number = 0
+            if open_lists and open_lists[-1][0] == indent:
+                number = open_lists.pop()[1]
+
+            item = items.get(i)
+            if item is None:
+                result.append(line)
+                i += 1
+                continue
+            number += 1
+            open_lists.append((indent, number))
+            property_line, match = item
+            result.append(f"{match.group(1)}{number}. {match.group(2)}")
+            # Drop the property line (and any blank lines before it)
+            i = property_line + 1
+        result += lines[end + 1 :]
+        return result, True
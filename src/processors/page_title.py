@@ -1,51 +1,16 @@
-from .base import ContentProcessor
+from .base import HEAD, TAIL, WHOLE, ContentProcessor
 import os
 import re
 import urllib.parse
 import string
 
-# Use environment variables for config paths if set, else default
-CATEGORIES_DIR = os.path.join(
-    os.path.dirname(os.path.dirname(__file__)), "..", "categories_config"
+from .categories_config import (
+    CategoriesConfig,
+    CATEGORIES_DIR,
+    UPPERCASE_PATH,
+    TYPES_PATH,
 )
-UPPERCASE_PATH = os.environ.get(
-    "LOGSEQ2REFLECT_UPPERCASE_PATH", os.path.join(CATEGORIES_DIR, "uppercase.txt")
-)
-TYPES_PATH = os.environ.get(
-    "LOGSEQ2REFLECT_TYPES_PATH", os.path.join(CATEGORIES_DIR, "types.txt")
-)
-
-
-def load_uppercase_terms(uppercase_path=UPPERCASE_PATH):
-    try:
-        with open(uppercase_path, "r", encoding="utf-8") as f:
-            return set(line.strip().upper() for line in f if line.strip())
-    except Exception:
-        return set()
-
-
-def load_types(types_path=TYPES_PATH):
-    try:
-        with open(types_path, "r", encoding="utf-8") as f:
-            return set(line.strip().lower() for line in f if line.strip())
-    except Exception:
-        return set()
-
-
-def load_lowercase_words(lowercase_path=None):
-    if lowercase_path is None:
-        # Default path
-        CATEGORIES_DIR = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)), "..", "categories_config"
-        )
-        lowercase_path = os.path.join(CATEGORIES_DIR, "lowercase.txt")
-    try:
-        with open(lowercase_path, "r", encoding="utf-8") as f:
-            return set(line.strip().lower() for line in f if line.strip())
-    except Exception as e:
-        raise RuntimeError(
-            f"Could not load lowercase words from {lowercase_path}: {e}. Please provide a valid lowercase.txt file."
-        )
+from .title_table import TitleTable
 
 
 class PageTitleProcessor(ContentProcessor):
@@ -53,15 +18,32 @@ class PageTitleProcessor(ContentProcessor):
 
     def __init__(
         self,
-        filename,
-        uppercase_path=UPPERCASE_PATH,
-        types_path=TYPES_PATH,
+        filename=None,
+        uppercase_path=None,
+        types_path=None,
         lowercase_path=None,
+        config=None,
     ):
+        """
+        Args:
+            filename: Default filename to build the title from; can be overridden
+                      per call so one processor serves every page
+            uppercase_path, types_path, lowercase_path: Word list files, used when
+                      no config is given (default: the categories_config files)
+            config: Shared CategoriesConfig to take the word lists from
+        """
         self.filename = filename
-        self.uppercase_terms = load_uppercase_terms(uppercase_path)
-        self.types = load_types(types_path)
-        self.lowercase_words = load_lowercase_words(lowercase_path)
+        if config is None:
+            config = CategoriesConfig.from_paths(
+                uppercase_path, types_path, lowercase_path
+            )
+        self.uppercase_terms = config.uppercase_terms
+        self.types = config.types
+        self.lowercase_words = config.lowercase_words
+        # (title line, type) of each filename and flattened title of each alias,
+        # computed once per name
+        self.titles = TitleTable(self._title_from_filename)
+        self.alias_titles = TitleTable(self._alias_title)
 
     def _title_case(self, text):
         """Apply proper title case to text, capitalizing after punctuation like : or quotes, and if a word starts with a quote."""
@@ -128,9 +110,13 @@ class PageTitleProcessor(ContentProcessor):
 
         return re.sub(r"\[\[(.*?)\]\]", replacer, text)
 
-    def _format_title_from_filename(self):
+    def _format_title_from_filename(self, filename=None):
+        """Return the (title line, type) of a filename, formatted once per filename"""
+        return self.titles[filename or self.filename]
+
+    def _title_from_filename(self, filename):
         """Format the title based on the filename without the extension, flattening any hierarchy and removing backlinks."""
-        base_name = os.path.splitext(self.filename)[0]
+        base_name = os.path.splitext(filename)[0]
         # Decode URL-encoded characters for the title only
         base_name_decoded = urllib.parse.unquote(base_name)
         # Remove backlinks before splitting
@@ -170,6 +156,13 @@ class PageTitleProcessor(ContentProcessor):
         flat = re.sub(r"\s+", " ", flat).strip()
         return self._title_case(flat)
 
+    def _alias_title(self, alias):
+        """Flatten an alias into a title, removing any type from it"""
+        alias_parts = re.split(r"___|/|_", alias)
+        alias_parts = [p.strip() for p in alias_parts if p.strip()]
+        _, alias_parts = self._extract_type(alias_parts)
+        return self._title_case(" ".join(alias_parts))
+
     def _extract_alias(self, content):
         """Extract the alias from the content if it exists"""
         alias_match = re.search(r"alias:: (.*?)($|\n)", content)
@@ -177,21 +170,24 @@ class PageTitleProcessor(ContentProcessor):
             return alias_match.group(1).strip(), alias_match.start(), alias_match.end()
         return None, -1, -1
 
-    def process(self, content):
+    def process(self, content, filename=None):
+        return self.process_block(content, WHOLE, filename)
+
+    def process_block(self, content, position, filename=None):
+        if not position & HEAD:
+            # Later blocks are only stripped at the end of the page
+            new_content = content.rstrip() if position & TAIL else content
+            return new_content, new_content != content
         # Remove leading blank lines from content
         content = content.lstrip("\n")
-        title, type_found = self._format_title_from_filename()
+        title, type_found = self._format_title_from_filename(filename)
         main_title = title[2:].strip()  # Remove '# '
         alias_text, alias_start, alias_end = self._extract_alias(content)
         if alias_text:
             aliases = [a.strip() for a in alias_text.split(",")]
             unique_aliases = []
             for alias in aliases:
-                # Remove type from alias as well
-                alias_parts = re.split(r"___|/|_", alias)
-                alias_parts = [p.strip() for p in alias_parts if p.strip()]
-                _, alias_parts = self._extract_type(alias_parts)
-                flattened_alias = self._title_case(" ".join(alias_parts))
+                flattened_alias = self.alias_titles[alias]
                 if (
                     flattened_alias != main_title
                     and flattened_alias not in unique_aliases
@@ -210,6 +206,6 @@ class PageTitleProcessor(ContentProcessor):
             new_content += f"{type_tag_line}\n\n"
 
         # Keep the existing content, including any existing H1 headings
-        new_content += f"{content.strip()}"
+        new_content += content.strip() if position & TAIL else content.lstrip()
 
         return new_content, new_content != content
@@ -1,6 +1,9 @@
-from typing import List, Tuple, Optional
-from .base import ContentProcessor
+from typing import List, Set, Tuple, Optional
+from .base import WHOLE, ContentProcessor, LineProcessor
+from .document import Document
+from .profiler import PipelineProfiler
 import logging
+import time
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -10,8 +13,20 @@ class ProcessorPipeline:
     """
     Pipeline that sequentially applies multiple content processors to a text.
     Provides unified error handling and performance tracking.
+
+    The content is kept in a Document, so consecutive LineProcessors work on the
+    same list of lines and the text is only rebuilt when a text processor needs it.
+    Processors that declare triggers are skipped when none of them occur in the
+    current content.
+
+    Performance tracking is opt-in: while ProcessorPipeline.profiler is set, every
+    processor call is recorded in it (see enable_profiling).
     """
 
+    # Shared by every pipeline in the process, so workers and file processors
+    # don't need to be handed a profiler explicitly
+    profiler: Optional[PipelineProfiler] = None
+
     def __init__(self, processors: List[ContentProcessor]):
         """
         Initialize the pipeline with a list of processors.
@@ -21,12 +36,36 @@ class ProcessorPipeline:
         """
         self.processors = processors
 
-    def process(self, content: str) -> Tuple[str, bool]:
+    @classmethod
+    def enable_profiling(cls) -> PipelineProfiler:
+        """Start recording per-processor statistics in a new profiler"""
+        cls.profiler = PipelineProfiler()
+        return cls.profiler
+
+    @classmethod
+    def disable_profiling(cls) -> None:
+        cls.profiler = None
+
+    def process(
+        self,
+        content: str,
+        position: int = WHOLE,
+        reported: Optional[Set[int]] = None,
+        found: Optional[Set[int]] = None,
+    ) -> Tuple[str, bool]:
         """
         Process content through all processors in sequence.
 
         Args:
             content: The content to process
+            position: Position flags (HEAD, TAIL, FENCED) when content is one
+                      block of a page converted block by block (default: the
+                      whole page)
+            reported: For a block, the indexes of the processors that don't
+                      report all their changes whose output is kept (those
+                      that report a change somewhere in the page)
+            found: If given, the indexes of the processors that don't report
+                   all their changes and report one are added to it
 
         Returns:
             Tuple of (processed_content, was_changed)
@@ -35,17 +74,39 @@ class ProcessorPipeline:
             return content, False
 
         changed = False
-        current_content = content
+        document = Document(content)
+        profiler = ProcessorPipeline.profiler
 
-        for idx, processor in enumerate(self.processors):
+        for index, processor in enumerate(self.processors):
+            keep = None
+            if reported is not None and not processor.reports_all_changes:
+                keep = index in reported
             try:
                 processor_name = processor.__class__.__name__
-                new_content, did_change = processor.process(current_content)
+                triggers = processor.triggers
+                if triggers and not any(map(document.contains, triggers)):
+                    if profiler is not None:
+                        profiler.record_skip(processor_name)
+                    continue
+                if profiler is None:
+                    did_change = self._apply(processor, document, position, keep)
+                else:
+                    bytes_in = document.size()
+                    start = time.perf_counter()
+                    did_change = self._apply(processor, document, position, keep)
+                    profiler.record(
+                        processor_name,
+                        time.perf_counter() - start,
+                        bytes_in,
+                        document.size(),
+                        did_change,
+                    )
 
                 if did_change:
                     logger.debug(f"Processor {processor_name} changed content")
                     changed = True
-                    current_content = new_content
+                    if found is not None and not processor.reports_all_changes:
+                        found.add(index)
 
             except Exception as e:
                 # Log error but continue with pipeline
@@ -53,4 +114,46 @@ class ProcessorPipeline:
                     f"Error in processor {processor.__class__.__name__}: {str(e)}"
                 )
 
-        return current_content, changed
+        return document.text, changed
+
+    def inexact_indexes(self) -> Set[int]:
+        """
+        Indexes of the processors that don't report all their changes (see
+        ContentProcessor.reports_all_changes)
+        """
+        return {
+            index
+            for index, processor in enumerate(self.processors)
+            if not processor.reports_all_changes
+        }
+
+    @staticmethod
+    def _apply(
+        processor: ContentProcessor,
+        document: Document,
+        position: int = WHOLE,
+        keep: Optional[bool] = None,
+    ) -> bool:
+        """
+        Run one processor, updating the document if it changed the content (or,
+        if keep is given, according to keep)
+        """
+        if isinstance(processor, LineProcessor):
+            if position == WHOLE:
+                new_lines, did_change = processor.process_lines(document.lines)
+            else:
+                new_lines, did_change = processor.process_block_lines(
+                    document.lines, position
+                )
+            if did_change if keep is None else keep:
+                document.lines = new_lines
+        else:
+            if position == WHOLE:
+                new_content, did_change = processor.process(document.text)
+            else:
+                new_content, did_change = processor.process_block(
+                    document.text, position
+                )
+            if did_change if keep is None else keep:
+                document.text = new_content
+        return did_change
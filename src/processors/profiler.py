@@ -0,0 +1,153 @@
+import json
+import logging
+from typing import Dict, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class ProcessorStats:
+    """Counters for one processor class across a run"""
+
+    FIELDS = (
+        "calls",
+        "seconds",
+        "bytes_in",
+        "bytes_out",
+        "changes",
+        "skips",
+        "cache_hits",
+        "cache_misses",
+    )
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.changes = 0
+        # Files on which the processor wasn't called because its triggers were absent
+        self.skips = 0
+        # Lookups in the processor's memo cache, for processors that have one
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def change_rate(self) -> float:
+        """Fraction of calls that changed the content"""
+        return self.changes / self.calls if self.calls else 0.0
+
+    @property
+    def cache_hit_rate(self) -> Optional[float]:
+        """Fraction of memo cache lookups that hit, or None without lookups"""
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else None
+
+    def as_list(self) -> List[float]:
+        return [getattr(self, field) for field in self.FIELDS]
+
+    def add(self, values: List[float]) -> None:
+        """Add counters in as_list() order (e.g. reported by a worker process)"""
+        for field, value in zip(self.FIELDS, values):
+            setattr(self, field, getattr(self, field) + value)
+
+
+class PipelineProfiler:
+    """
+    Per-processor instrumentation for ProcessorPipeline: wall time, call count,
+    bytes in/out and how often each processor class changed the content.
+    """
+
+    def __init__(self):
+        self.stats: Dict[str, ProcessorStats] = {}
+
+    def _stats(self, name: str) -> ProcessorStats:
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = ProcessorStats()
+        return stats
+
+    def record(
+        self, name: str, seconds: float, bytes_in: int, bytes_out: int, changed: bool
+    ) -> None:
+        """Record one processor call"""
+        stats = self._stats(name)
+        stats.calls += 1
+        stats.seconds += seconds
+        stats.bytes_in += bytes_in
+        stats.bytes_out += bytes_out
+        if changed:
+            stats.changes += 1
+
+    def record_skip(self, name: str) -> None:
+        """Record that a processor was skipped because its triggers were absent"""
+        self._stats(name).skips += 1
+
+    def record_cache(self, name: str, hits: int, misses: int) -> None:
+        """Record lookups in a processor's memo cache"""
+        stats = self._stats(name)
+        stats.cache_hits += hits
+        stats.cache_misses += misses
+
+    def take(self) -> Dict[str, List[float]]:
+        """Return the counters recorded so far as plain lists and reset them"""
+        taken = {name: stats.as_list() for name, stats in self.stats.items()}
+        self.stats = {}
+        return taken
+
+    def merge(self, counters: Optional[Dict[str, List[float]]]) -> None:
+        """Merge counters returned by take() in another process"""
+        for name, values in (counters or {}).items():
+            self._stats(name).add(values)
+
+    def sorted_stats(self) -> List[tuple]:
+        """(name, stats) pairs, slowest processor first"""
+        return sorted(self.stats.items(), key=lambda item: -item[1].seconds)
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {
+                "calls": stats.calls,
+                "seconds": stats.seconds,
+                "bytes_in": stats.bytes_in,
+                "bytes_out": stats.bytes_out,
+                "changes": stats.changes,
+                "change_rate": stats.change_rate,
+                "skips": stats.skips,
+                "cache_hits": stats.cache_hits,
+                "cache_misses": stats.cache_misses,
+            }
+            for name, stats in self.sorted_stats()
+        }
+
+    def format_table(self) -> str:
+        """Format the counters as a table, slowest processor first"""
+        total = sum(stats.seconds for stats in self.stats.values()) or 1.0
+        header = (
+            f"{'Processor':<34} {'calls':>8} {'total ms':>10} {'%':>6} "
+            f"{'us/call':>9} {'MB in':>8} {'MB out':>8} {'changed':>8} "
+            f"{'skipped':>8} {'cache hit':>9}"
+        )
+        lines = [header, "-" * len(header)]
+        for name, stats in self.sorted_stats():
+            per_call = stats.seconds * 1_000_000 / stats.calls if stats.calls else 0
+            hit_rate = stats.cache_hit_rate
+            cache = "-" if hit_rate is None else f"{hit_rate:.0%}"
+            lines.append(
+                f"{name:<34} {stats.calls:>8} {stats.seconds * 1000:>10.1f} "
+                f"{stats.seconds * 100 / total:>5.1f}% {per_call:>9.1f} "
+                f"{stats.bytes_in / 1_000_000:>8.2f} "
+                f"{stats.bytes_out / 1_000_000:>8.2f} "
+                f"{stats.change_rate:>7.0%} {stats.skips:>8} {cache:>9}"
+            )
+        return "\n".join(lines)
+
+    def write_json(self, path: str) -> bool:
+        """Write the counters to a JSON file, returning True on success"""
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.as_dict(), f, indent=2)
+            return True
+        except Exception as e:
+            logger.error(f"Error writing profile to {path}: {e}")
+            return False
@@ -1,34 +1,46 @@
-from .base import ContentProcessor
+from .base import LineProcessor
 import re
 
+BACKGROUND_COLOR_PATTERN = re.compile(r"^\s*background-color::")
+PROPERTY_PATTERN = re.compile(r"^\s*([a-zA-Z0-9_-]+)::")
+BULLET_PATTERN = re.compile(r"^(\s*-\s*)(.*)$")
+HEADING_PATTERN = re.compile(r"(#+\s+)(.*)$")
 
-class PropertiesProcessor(ContentProcessor):
+
+class PropertiesProcessor(LineProcessor):
     """Remove unwanted LogSeq property lines like 'filters::' from content, highlight bullets with background-color, and delete extra properties. Also ensure only one blank line in a row."""
 
-    def process(self, content):
-        lines = content.split("\n")
+    # Collapsing blank lines doesn't count as a change
+    reports_all_changes = False
+
+    def process_lines(self, lines):
         new_lines = []
         i = 0
         changed = False
         while i < len(lines):
             line = lines[i]
+            # Every property line contains "::"
+            if "::" not in line:
+                new_lines.append(line)
+                i += 1
+                continue
             # Check for background-color property
-            if re.match(r"^\s*background-color::", line):
+            if BACKGROUND_COLOR_PATTERN.match(line):
                 # Find the previous non-property, non-empty line
                 j = len(new_lines) - 1
                 while j >= 0 and (
-                    re.match(r"^\s*([a-zA-Z0-9_-]+)::", new_lines[j])
+                    PROPERTY_PATTERN.match(new_lines[j])
                     or new_lines[j].strip() == ""
                 ):
                     j -= 1
                 if j >= 0:
                     # Wrap the previous line's content (after bullet marker) with == ==
                     prev_line = new_lines[j]
-                    bullet_match = re.match(r"^(\s*-\s*)(.*)$", prev_line)
+                    bullet_match = BULLET_PATTERN.match(prev_line)
                     if bullet_match:
                         prefix, content_part = bullet_match.groups()
                         # Check if content_part starts with heading markers (e.g., '### ')
-                        heading_match = re.match(r"(#+\s+)(.*)$", content_part)
+                        heading_match = HEADING_PATTERN.match(content_part)
                         if heading_match:
                             heading_prefix, heading_text = heading_match.groups()
                             new_lines[j] = f"{prefix}{heading_prefix}=={heading_text}=="
@@ -39,13 +51,8 @@ class PropertiesProcessor(ContentProcessor):
                 changed = True
                 i += 1
                 continue
-            # Remove filters:: property lines
-            if re.match(r"^\s*filters::", line):
-                changed = True
-                i += 1
-                continue
-            # Remove any other property lines (e.g. 'priority::', 'id::', etc.)
-            if re.match(r"^\s*[a-zA-Z0-9_-]+::", line):
+            # Remove filters:: and any other property lines (e.g. 'priority::', 'id::')
+            if PROPERTY_PATTERN.match(line):
                 changed = True
                 i += 1
                 continue
@@ -62,5 +69,4 @@ class PropertiesProcessor(ContentProcessor):
             else:
                 cleaned_lines.append(l)
                 prev_blank = False
-        new_content = "\n".join(cleaned_lines)
-        return new_content, changed
+        return cleaned_lines, changed
@@ -1,21 +1,98 @@
-from .base import ContentProcessor
+from .base import HEAD, ContentProcessor
 import re
-import os
+from typing import Dict, Iterable
+from .categories_config import CategoriesConfig
 
-CATEGORIES_DIR = os.path.join(
-    os.path.dirname(os.path.dirname(__file__)), "..", "categories_config"
-)
-TYPES_PATH = os.environ.get(
-    "LOGSEQ2REFLECT_TYPES_PATH", os.path.join(CATEGORIES_DIR, "types.txt")
-)
+# Code between ``` or ~~~ pairs, inline spans included, whose tags are left alone
+FENCED_PATTERN = re.compile(r"(```[\s\S]*?```|~~~[\s\S]*?~~~)", re.MULTILINE)
 
 
-def load_types(types_path=TYPES_PATH):
-    try:
-        with open(types_path, "r", encoding="utf-8") as f:
-            return set(line.strip().lower() for line in f if line.strip())
-    except Exception:
-        return set()
+class TagRegistry(set):
+    """
+    Set of found tags that also keeps a lowercase index, updated as tags are
+    added or removed, so case-insensitive lookups are O(1).
+    """
+
+    def __init__(self, tags: Iterable[str] = ()):
+        super().__init__(tags)
+        self._rebuild_lowercase()
+
+    def _rebuild_lowercase(self) -> None:
+        # Lowercase tag -> number of tags in the set with that lowercase form
+        self._lowercase: Dict[str, int] = {}
+        for tag in self:
+            self._count(tag, 1)
+
+    def _count(self, tag: str, delta: int) -> None:
+        lower = tag.lower()
+        count = self._lowercase.get(lower, 0) + delta
+        if count > 0:
+            self._lowercase[lower] = count
+        else:
+            self._lowercase.pop(lower, None)
+
+    def contains_lowercase(self, text: str) -> bool:
+        """Check whether any tag matches text case-insensitively"""
+        return text.lower() in self._lowercase
+
+    def add(self, tag: str) -> None:
+        if tag not in self:
+            super().add(tag)
+            self._count(tag, 1)
+
+    def update(self, *others: Iterable[str]) -> None:
+        for other in others:
+            for tag in other:
+                self.add(tag)
+
+    def discard(self, tag: str) -> None:
+        if tag in self:
+            super().discard(tag)
+            self._count(tag, -1)
+
+    def remove(self, tag: str) -> None:
+        super().remove(tag)
+        self._count(tag, -1)
+
+    def pop(self) -> str:
+        tag = super().pop()
+        self._count(tag, -1)
+        return tag
+
+    def clear(self) -> None:
+        super().clear()
+        self._lowercase = {}
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __isub__(self, other):
+        super().__isub__(other)
+        self._rebuild_lowercase()
+        return self
+
+    def __iand__(self, other):
+        super().__iand__(other)
+        self._rebuild_lowercase()
+        return self
+
+    def __ixor__(self, other):
+        super().__ixor__(other)
+        self._rebuild_lowercase()
+        return self
+
+    def difference_update(self, *others: Iterable[str]) -> None:
+        super().difference_update(*others)
+        self._rebuild_lowercase()
+
+    def intersection_update(self, *others: Iterable[str]) -> None:
+        super().intersection_update(*others)
+        self._rebuild_lowercase()
+
+    def symmetric_difference_update(self, other: Iterable[str]) -> None:
+        super().symmetric_difference_update(other)
+        self._rebuild_lowercase()
 
 
 class TagToBacklinkProcessor(ContentProcessor):
@@ -23,23 +100,42 @@ class TagToBacklinkProcessor(ContentProcessor):
     Replace #tag with [[tag]] (lowercase) and collect unique tags, skipping type tags.
     """
 
-    found_tags = set()
+    triggers = ("#",)
+    found_tags = TagRegistry()
     TAG_PATTERN = re.compile(r"(^|\s)#([a-zA-Z0-9\-_]+)")
 
     def __init__(self, categories_config: str = None):
-        if categories_config:
-            types_path = os.path.join(categories_config, "types.txt")
-            self.types = load_types(types_path)
-        else:
-            self.types = load_types()
+        self.types = CategoriesConfig.load(categories_config).types
+        # Tags found by the most recent call to process() (or in every block of
+        # the last page converted block by block)
+        self.file_tags = set()
+
+    @classmethod
+    def register_tags(cls, tags):
+        """Merge tags found elsewhere (e.g. in a worker process) into the registry"""
+        cls.found_tags.update(tags)
+
+    @classmethod
+    def is_tag(cls, text: str) -> bool:
+        """Check whether text is a found tag, ignoring case"""
+        return cls.found_tags.contains_lowercase(text)
 
     def process(self, content):
+        self.file_tags = set()
+        return self._replace_tags(content)
+
+    def process_block(self, content, position):
+        if position & HEAD:
+            self.file_tags = set()
+        return self._replace_tags(content)
+
+    def _replace_tags(self, content):
+        # Code is found by pairing ``` and ~~~ anywhere in the text, inline spans
+        # included, rather than with the line-based code_fence_flags, which only
+        # knows ``` fences at the start of a line
         changed = False
         # Split content into code and non-code blocks
-        code_block_pattern = re.compile(r"(\n?)(```|~~~)(.*?)(\2)(.*?)(\2)", re.DOTALL)
-        # We'll use a simpler approach: split on fenced code blocks
-        fenced_pattern = re.compile(r"(```[\s\S]*?```|~~~[\s\S]*?~~~)", re.MULTILINE)
-        parts = fenced_pattern.split(content)
+        parts = FENCED_PATTERN.split(content)
         result = []
         for i, part in enumerate(parts):
             if i % 2 == 1 and (part.startswith("```") or part.startswith("~~~")):
@@ -54,6 +150,7 @@ class TagToBacklinkProcessor(ContentProcessor):
                     if tag_lower in self.types:
                         return f"{prefix}#{tag}"  # Leave as-is
                     TagToBacklinkProcessor.found_tags.add(tag_lower)
+                    self.file_tags.add(tag_lower)
                     nonlocal changed
                     changed = True
                     return f"{prefix}[[{tag_lower}]]"
@@ -1,52 +1,134 @@
 from .base import ContentProcessor
 import re
 
+LOGBOOK_START = ":LOGBOOK:"
+LOGBOOK_END = ":END:"
+# The common bullet markers, replaced as plain text before TASK_PATTERN runs.
+# No text TASK_PATTERN matches contains one of these markers, and their
+# replacements create no TASK_PATTERN match, so the two passes are independent
+MARKER_REPLACEMENTS = (
+    ("- TODO ", "- [ ] "),
+    ("- DONE ", "- [x] "),
+    ("- DOING ", "- [ ] "),
+)
+# Every other task marker rewrite, as one alternation so the content is scanned
+# once. Bullets: "- CANCELLED x" -> "- [x] ~~x~~", "- WAITING x" -> "- [ ] x".
+# Headings lose the marker, with or without a bullet ("## TODO x" -> "## x",
+# "- ## TODO x" -> "- ## x"). Only the first marker of a heading goes: in
+# "## TODO CANCELLED x", CANCELLED is kept as text. The whitespace around a
+# marker ([^\S\n], whitespace but line breaks) never reaches into the next line.
+TASK_PATTERN = re.compile(
+    r"-[^\S\n]+(?:(?P<cancelled>CANCELL?ED)|WAITING"
+    r"|(?P<bullet_heading>#+)[^\S\n]+(?:TODO|DONE|DOING|WAITING"
+    r"|(?P<bullet_heading_cancelled>CANCELL?ED)))[^\S\n]+"
+    r"|^(?P<heading>#+)[^\S\n]+(?:TODO|DONE|DOING|WAITING"
+    r"|(?P<heading_cancelled>CANCELL?ED))[^\S\n]+",
+    re.MULTILINE,
+)
+# Every task marker contains one of these
+TASK_KEYWORDS = ("TODO", "DONE", "DOING", "WAITING", "CANCEL")
+
 
 class TaskCleaner(ContentProcessor):
-    """Clean up tasks in LogSeq format for Reflect"""
+    """
+    Clean up tasks in LogSeq format for Reflect.
+
+    Removes :LOGBOOK: ... :END: drawers together with the whitespace before
+    them and rewrites the task markers of bullets and headings. The drawers go
+    in one linear scan and the markers in one combined substitution (after the
+    plain "- TODO " style replacements), so a drawer without its :END:, which
+    is left as it is, can't make the cleaner scan the rest of the page again.
+    A marker is rewritten only with text after it on its line.
+    """
+
+    triggers = (LOGBOOK_START,) + TASK_KEYWORDS
 
     def process(self, content):
-        # Remove LOGBOOK sections
-        new_content = re.sub(r"\s+:LOGBOOK:.*?:END:", "", content, flags=re.DOTALL)
-
-        # Convert cancelled tasks to completed strikethrough
-        new_content = re.sub(
-            r"-\s+(?:CANCELLED|CANCELED)\s+(.*)", r"- [x] ~~\1~~", new_content
-        )
-
-        # Convert waiting tasks to normal todos
-        new_content = re.sub(r"-\s+WAITING\s+(.*)", r"- [ ] \1", new_content)
-
-        # Replace task markers in bullet lists
-        new_content = re.sub(r"- TODO ", "- [ ] ", new_content)
-        new_content = re.sub(r"- DONE ", "- [x] ", new_content)
-        new_content = re.sub(r"- DOING ", "- [ ] ", new_content)
-
-        # Remove task keywords from headings (e.g., "## TODO Task" -> "## Task")
-        # For headings that don't start with bullets
-        new_content = re.sub(
-            r"^(?!-\s+)(#+)\s+(?:TODO|DONE|DOING|WAITING)\s+(.*)",
-            r"\1 \2",
-            new_content,
-            flags=re.MULTILINE,
-        )
-        new_content = re.sub(
-            r"^(?!-\s+)(#+)\s+(?:CANCELLED|CANCELED)\s+(.*)",
-            r"\1 \2",
-            new_content,
-            flags=re.MULTILINE,
-        )
-
-        # Remove task keywords from headings that already have bullets (e.g., "- ## TODO Task" -> "- ## Task")
-        new_content = re.sub(
-            r"-\s+(#+)\s+(?:TODO|DONE|DOING|WAITING)\s+(.*)",
-            r"- \1 \2",
-            new_content,
-        )
-        new_content = re.sub(
-            r"-\s+(#+)\s+(?:CANCELLED|CANCELED)\s+(.*)",
-            r"- \1 \2",
-            new_content,
-        )
+        new_content = content
+        if LOGBOOK_START in content:
+            new_content = self._remove_logbooks(content)
+
+        if not any(keyword in new_content for keyword in TASK_KEYWORDS):
+            return new_content, new_content != content
 
+        for marker, replacement in MARKER_REPLACEMENTS:
+            new_content = new_content.replace(marker, replacement)
+        if "CANCEL" in new_content or "WAITING" in new_content or "#" in new_content:
+            new_content = self._replace_markers(new_content)
         return new_content, new_content != content
+
+    @staticmethod
+    def _remove_logbooks(content: str) -> str:
+        """
+        Remove each drawer from the whitespace before its :LOGBOOK: line to the
+        first :END: after it. A drawer needs whitespace before it, and once one
+        has no :END: after it neither has any later drawer.
+        """
+        pieces = []
+        # End of the content copied (or removed) so far
+        copied = 0
+        start = content.find(LOGBOOK_START)
+        while start >= 0:
+            end = content.find(LOGBOOK_END, start + len(LOGBOOK_START))
+            if end < 0:
+                break
+            begin = start
+            while begin > copied and content[begin - 1].isspace():
+                begin -= 1
+            if begin == start:
+                start = content.find(LOGBOOK_START, start + 1)
+                continue
+            pieces.append(content[copied:begin])
+            copied = end + len(LOGBOOK_END)
+            start = content.find(LOGBOOK_START, copied)
+        if not pieces:
+            return content
+        pieces.append(content[copied:])
+        return "".join(pieces)
+
+    @staticmethod
+    def _replace_markers(content: str) -> str:
+        """
+        Rewrite the task markers. A cancelled marker strikes the rest of its
+        line through, and only the first marker of each kind on a line is
+        rewritten (the markers of other kinds after it still are)
+        """
+        pieces = []
+        copied = 0
+        # Kind of marker -> end of the line its last rewrite took
+        line_ends = {}
+        # End of the line struck through by the last cancelled marker, where
+        # its closing "~~" goes
+        struck_end = -1
+        for match in TASK_PATTERN.finditer(content):
+            start = match.start()
+            if struck_end >= 0 and start >= struck_end:
+                pieces += [content[copied:struck_end], "~~"]
+                copied, struck_end = struck_end, -1
+            pieces.append(content[copied:start])
+            copied = match.end()
+
+            cancelled, bullet_heading, _, heading, _ = match.groups()
+            if cancelled:
+                kind, replacement = "cancelled", "- [x] ~~"
+            elif bullet_heading:
+                kind, replacement = match.lastgroup, f"- {bullet_heading} "
+            elif heading:
+                kind, replacement = match.lastgroup, f"{heading} "
+            else:
+                kind, replacement = "waiting", "- [ ] "
+            if start < line_ends.get(kind, -1):
+                replacement = match.group()
+            else:
+                line_end = content.find("\n", copied)
+                line_ends[kind] = len(content) if line_end < 0 else line_end
+                if kind == "cancelled":
+                    struck_end = line_ends[kind]
+            pieces.append(replacement)
+        if not pieces:
+            return content
+        if struck_end >= 0:
+            pieces += [content[copied:struck_end], "~~"]
+            copied = struck_end
+        pieces.append(content[copied:])
+        return "".join(pieces)
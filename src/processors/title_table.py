@@ -0,0 +1,101 @@
+import os
+import re
+import urllib.parse
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Iterable, Set, TypeVar
+
+T = TypeVar("T")
+
+# Titles kept for names the workspace scan didn't register
+DEFAULT_MAX_UNMATCHED = 4096
+ALIAS_PATTERN = re.compile(r"alias:: (.*?)$", re.MULTILINE)
+
+
+class TitleTable(Generic[T]):
+    """
+    Formatted titles of one title formatter, computed once per name.
+
+    Each formatter (page titles, wikilink targets, block reference page links)
+    has its own rules and therefore its own table. Names of the graph (page
+    filenames, page names and aliases, registered once from the initial
+    workspace scan) keep their title for the whole run; any other name, such
+    as a link to a page that doesn't exist, goes into a bounded LRU so one-off
+    names can't grow the table without limit.
+    """
+
+    # Lowercase names of the graph, shared by every table (and copied to
+    # worker processes with the other registries)
+    graph_names: Set[str] = set()
+
+    def __init__(
+        self,
+        format_title: Callable[[str], T],
+        max_unmatched: int = DEFAULT_MAX_UNMATCHED,
+    ):
+        """
+        Args:
+            format_title: Formatter computing the title of a name
+            max_unmatched: Number of titles kept for names outside the graph
+        """
+        self.format_title = format_title
+        self.max_unmatched = max_unmatched
+        self._titles: Dict[str, T] = {}
+        self._unmatched: "OrderedDict[str, T]" = OrderedDict()
+        # Lookups answered from the table, and names that had to be formatted
+        self.hits = 0
+        self.misses = 0
+
+    def __getitem__(self, name: str) -> T:
+        try:
+            title = self._titles[name]
+            self.hits += 1
+            return title
+        except KeyError:
+            pass
+        unmatched = self._unmatched
+        if name in unmatched:
+            self.hits += 1
+            unmatched.move_to_end(name)
+            return unmatched[name]
+        self.misses += 1
+        if name.lower() in self.graph_names:
+            title = self._titles[name] = self.format_title(name)
+            return title
+        title = unmatched[name] = self.format_title(name)
+        if len(unmatched) > self.max_unmatched:
+            unmatched.popitem(last=False)
+        return title
+
+    def __len__(self) -> int:
+        return len(self._titles) + len(self._unmatched)
+
+    @classmethod
+    def register_names(cls, names: Iterable[str]) -> None:
+        """Add names to the graph names shared by every table"""
+        cls.graph_names.update(name.lower() for name in names)
+
+    @classmethod
+    def register_workspace(cls, index) -> None:
+        """
+        Replace the graph names with those of an indexed workspace: every file
+        name, the page name it stands for ("a___b.md" -> "a/b", as decoded,
+        flattened and written with spaces) and the aliases of the pages.
+
+        Args:
+            index: WorkspaceIndex of the workspace
+        """
+        cls.graph_names = set()
+        for entry in index.files:
+            stem = urllib.parse.unquote(os.path.splitext(entry.filename)[0])
+            cls.register_names(
+                (
+                    entry.filename,
+                    stem,
+                    stem.replace("___", "/"),
+                    stem.replace("_", " "),
+                )
+            )
+            if entry.kind == "page" and entry.content and "alias::" in entry.content:
+                for match in ALIAS_PATTERN.finditer(entry.content):
+                    aliases = match.group(1).split(",")
+                    cls.register_names(alias.strip() for alias in aliases)
@@ -1,41 +1,37 @@
 from .base import ContentProcessor
 import re
 from typing import List
-import os
 from .tag_to_backlink import TagToBacklinkProcessor
+from .categories_config import CategoriesConfig
+from .title_table import DEFAULT_MAX_UNMATCHED, TitleTable
+from .pipeline import ProcessorPipeline
 
-# Use environment variables for config paths if set, else default
-CATEGORIES_DIR = os.path.join(
-    os.path.dirname(os.path.dirname(__file__)), "..", "categories_config"
-)
-UPPERCASE_PATH = os.environ.get(
-    "LOGSEQ2REFLECT_UPPERCASE_PATH", os.path.join(CATEGORIES_DIR, "uppercase.txt")
-)
-TYPES_PATH = os.environ.get(
-    "LOGSEQ2REFLECT_TYPES_PATH", os.path.join(CATEGORIES_DIR, "types.txt")
-)
-
-
-def load_uppercase_terms(uppercase_path=UPPERCASE_PATH):
-    try:
-        with open(uppercase_path, "r", encoding="utf-8") as f:
-            return set(line.strip().upper() for line in f if line.strip())
-    except Exception:
-        return set()
-
-
-def load_types(types_path=TYPES_PATH):
-    try:
-        with open(types_path, "r", encoding="utf-8") as f:
-            return set(line.strip().lower() for line in f if line.strip())
-    except Exception:
-        return set()
+WIKILINK_PATTERN = re.compile(r"\[\[(.*?)\]\]")
+NAME_SEPARATOR_PATTERN = re.compile(r"___|/|_")
+WHITESPACE_PATTERN = re.compile(r"\s+")
 
 
 class WikiLinkProcessor(ContentProcessor):
-    """Process wikilinks using the same formatting rules as page titles"""
-
-    def __init__(self, categories_config: str = None):
+    """
+    Process wikilinks using the same formatting rules as page titles.
+
+    Formatted link targets are memoized per processor (and so per config). A
+    link that names a tag is checked against the tag registry before the memo
+    is consulted, so the memo never holds a result the registry decides and
+    needs no invalidation when tags are found.
+    """
+
+    triggers = ("[[",)
+
+    def __init__(
+        self, categories_config: str = None, cache_size: int = DEFAULT_MAX_UNMATCHED
+    ):
+        """
+        Args:
+            categories_config: Path to categories config directory
+            cache_size: Number of formatted link targets kept for targets that
+                        aren't pages or aliases of the graph
+        """
         self.lowercase_words = {
             "a",
             "an",
@@ -59,14 +55,15 @@ class WikiLinkProcessor(ContentProcessor):
             "to",
             "with",
         }
-        if categories_config:
-            uppercase_path = os.path.join(categories_config, "uppercase.txt")
-            types_path = os.path.join(categories_config, "types.txt")
-            self.uppercase_terms = load_uppercase_terms(uppercase_path)
-            self.types = load_types(types_path)
-        else:
-            self.uppercase_terms = load_uppercase_terms()
-            self.types = load_types()
+        config = CategoriesConfig.load(categories_config)
+        self.uppercase_terms = config.uppercase_terms
+        self.types = config.types
+        # Formatted link targets, computed once per target
+        self.titles = TitleTable(self._flatten_and_title_case, cache_size)
+        # Lowercase targets of the links formatted as pages rather than tags
+        # since the file collections were last reset: they have to be formatted
+        # again if one of them turns out to be a tag found in a later file
+        self.file_untagged_links = set()
 
     def _title_case_words(self, words: List[str]) -> List[str]:
         """Apply title case rules to a list of words"""
@@ -113,25 +110,33 @@ class WikiLinkProcessor(ContentProcessor):
         return "/".join(path_parts)
 
     def _flatten_and_title_case(self, text: str) -> str:
-        parts = re.split(r"___|/|_", text)
+        parts = NAME_SEPARATOR_PATTERN.split(text)
         parts = [p.strip() for p in parts if p.strip()]
         # Remove type if present
         parts = [p for p in parts if p.lower() not in self.types]
         flat = " ".join(parts)
-        flat = re.sub(r"\s+", " ", flat).strip()
+        flat = WHITESPACE_PATTERN.sub(" ", flat).strip()
         return self._title_case(flat)
 
     def _format_wikilink(self, match):
         """Format a wikilink match"""
         link_text = match.group(1)
         # If the text is already a tag (previously was /tag/ format), leave untouched
-        found_tags_lower = {t.lower() for t in TagToBacklinkProcessor.found_tags}
-        if link_text.lower() in found_tags_lower:
+        if TagToBacklinkProcessor.is_tag(link_text):
             return f"[[{link_text.lower()}]]"
-        formatted_text = self._flatten_and_title_case(link_text)
-        return f"[[{formatted_text}]]"
+        self.file_untagged_links.add(link_text.lower())
+        return f"[[{self.titles[link_text]}]]"
 
     def process(self, content):
         """Process wikilinks in content"""
-        new_content = re.sub(r"\[\[(.*?)\]\]", self._format_wikilink, content)
+        if "[[" not in content:
+            return content, False
+        titles = self.titles
+        hits, misses = titles.hits, titles.misses
+        new_content = WIKILINK_PATTERN.sub(self._format_wikilink, content)
+        profiler = ProcessorPipeline.profiler
+        if profiler is not None:
+            profiler.record_cache(
+                type(self).__name__, titles.hits - hits, titles.misses - misses
+            )
         return new_content, new_content != content
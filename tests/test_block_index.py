@@ -0,0 +1,96 @@
+import pytest
+import os
+from src.file_handlers.block_index import PersistentBlockIndex, BLOCK_INDEX_FILENAME
+from src.file_handlers.workspace_index import WorkspaceIndex
+from src.processors.block_references import BlockReferencesReplacer
+
+FIRST_ID = "67a45c2e-529c-4831-b069-dd6f8e8d1234"
+SECOND_ID = "67a45c2e-529c-4831-b069-dd6f8e8d5678"
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    """Create a workspace with a block in a page and one in a journal"""
+    journals_dir = tmp_path / "workspace" / "journals"
+    pages_dir = tmp_path / "workspace" / "pages"
+    journals_dir.mkdir(parents=True)
+    pages_dir.mkdir()
+    (journals_dir / "2023_01_01.md").write_text(
+        f"- Journal block\n  id:: {FIRST_ID}\n"
+    )
+    (pages_dir / "source.md").write_text(f"- Page block\n  id:: {SECOND_ID}\n")
+    (pages_dir / "other.md").write_text("- No blocks here\n")
+    return str(tmp_path / "workspace")
+
+
+def collect(workspace, index_path, use_workspace_index=False):
+    replacer = BlockReferencesReplacer()
+    block_index = PersistentBlockIndex(index_path)
+    index = WorkspaceIndex.scan(workspace) if use_workspace_index else None
+    replacer.collect_blocks(workspace, index, block_index)
+    return replacer, block_index
+
+
+def touch(path, content, mtime):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.utime(path, (mtime, mtime))
+
+
+class TestPersistentBlockIndex:
+    """Tests for the SQLite-backed block index"""
+
+    @pytest.mark.parametrize("use_workspace_index", [False, True])
+    def test_cached_collection_matches_full_scan(
+        self, workspace, tmp_path, use_workspace_index
+    ):
+        fresh = BlockReferencesReplacer()
+        fresh.collect_blocks(workspace)
+        index_path = str(tmp_path / BLOCK_INDEX_FILENAME)
+
+        first, first_index = collect(workspace, index_path, use_workspace_index)
+        second, second_index = collect(workspace, index_path, use_workspace_index)
+
+        assert first_index.files_scanned == 3
+        assert second_index.files_scanned == 0
+        assert second_index.files_reused == 3
+        assert first.block_map == fresh.block_map
+        assert second.block_map == fresh.block_map
+        assert second.block_links == fresh.block_links
+
+    def test_only_changed_files_are_rescanned(self, workspace, tmp_path):
+        index_path = str(tmp_path / BLOCK_INDEX_FILENAME)
+        source = os.path.join(workspace, "pages", "source.md")
+        os.utime(source, (1000, 1000))
+        collect(workspace, index_path)
+
+        touch(source, f"- Edited block\n  id:: {SECOND_ID}\n", 2000)
+        replacer, block_index = collect(workspace, index_path)
+
+        assert block_index.files_scanned == 1
+        assert block_index.files_reused == 2
+        assert replacer.block_map[SECOND_ID] == ("Edited block", "source")
+        assert replacer.block_map[FIRST_ID][0] == "Journal block"
+
+    def test_deleted_file_blocks_are_dropped(self, workspace, tmp_path):
+        index_path = str(tmp_path / BLOCK_INDEX_FILENAME)
+        collect(workspace, index_path)
+
+        os.remove(os.path.join(workspace, "pages", "source.md"))
+        replacer, _ = collect(workspace, index_path)
+        assert SECOND_ID not in replacer.block_map
+
+        # The vanished file's rows are gone, not just skipped
+        os.remove(os.path.join(workspace, "journals", "2023_01_01.md"))
+        replacer, block_index = collect(workspace, index_path)
+        assert replacer.block_map == {}
+        assert block_index.files_reused == 1
+
+    def test_read_only_index_is_not_created(self, workspace, tmp_path):
+        index_path = str(tmp_path / BLOCK_INDEX_FILENAME)
+        replacer = BlockReferencesReplacer()
+        block_index = PersistentBlockIndex(index_path, read_only=True)
+        replacer.collect_blocks(workspace, block_index=block_index)
+
+        assert not os.path.exists(index_path)
+        assert set(replacer.block_map) == {FIRST_ID, SECOND_ID}
@@ -0,0 +1,69 @@
+from src.processors.base import FENCED, HEAD, TAIL
+from src.processors.blocks import split_blocks
+
+HEADER = "- first\n- second\n- third\n- fourth\n"
+
+
+def blocks_of(text, code_blocks=True):
+    blocks = list(split_blocks(text, code_blocks))
+    assert "\n".join(block for block, _ in blocks) == text
+    return blocks
+
+
+class TestSplitBlocks:
+    def test_single_block_is_whole_page(self):
+        assert blocks_of("- only") == [("- only", HEAD | TAIL)]
+        assert blocks_of("") == [("", HEAD | TAIL)]
+
+    def test_splits_at_top_level_bullets(self):
+        blocks = blocks_of(HEADER + "- fifth\n  - child\n- sixth\n")
+        assert blocks == [
+            ("- first\n- second\n- third\n- fourth", HEAD),
+            ("- fifth\n  - child", 0),
+            ("- sixth\n", TAIL),
+        ]
+
+    def test_title_and_tags_stay_in_first_block(self):
+        blocks = blocks_of("- a\n- b\n- c\n- d\n- e")
+        assert blocks[0] == ("- a\n- b\n- c\n- d", HEAD)
+
+    def test_no_split_next_to_blank_lines_or_empty_bullets(self):
+        text = HEADER + "\n- after blank\n-\n- after empty"
+        assert len(blocks_of(text)) == 1
+
+    def test_no_split_next_to_properties_and_references(self):
+        for line in ("id:: 1234", "{{embed ((abc))}}", "((abc))", "#+END_NOTE"):
+            text = HEADER + f"  {line}\n- next"
+            assert len(blocks_of(text)) == 1, line
+
+    def test_no_split_inside_sections_and_logbooks(self):
+        section = HEADER + "- note\n  #+BEGIN_NOTE\n- inside\n  #+END_NOTE\n"
+        section += "  x\n- after"
+        starts = [block.split("\n")[0] for block, _ in blocks_of(section)]
+        assert starts == ["- first", "- note", "- after"]
+        logbook = HEADER + "- DONE x\n  :LOGBOOK:\n- inside\n  :END:\n  x\n- after"
+        starts = [block.split("\n")[0] for block, _ in blocks_of(logbook)]
+        assert starts == ["- first", "- DONE x", "- after"]
+
+    def test_no_split_before_numbered_item(self):
+        text = HEADER + "- one\n\nlogseq.order-list-type:: number\n  x\n- two"
+        starts = [block.split("\n")[0] for block, _ in blocks_of(text)]
+        assert starts == ["- first", "- two"]
+
+    def test_code_block_moved_into_bullet_is_one_block(self):
+        # The code block runs to the bare ``` line, past the inline ones
+        text = HEADER + "- code\n```\nx ```\n- not a bullet\n```\ny ```\n- after"
+        starts = [block.split("\n")[0] for block, _ in blocks_of(text)]
+        assert starts == ["- first", "- code", "- after"]
+        starts = [block.split("\n")[0] for block, _ in blocks_of(text, False)]
+        assert starts == ["- first", "- code", "- not a bullet", "- after"]
+
+    def test_blocks_in_fenced_code_are_marked(self):
+        text = HEADER + "- ```\n  x = 1\n  ```\n- next\n- last"
+        positions = [position for _, position in blocks_of(text)]
+        assert positions == [HEAD, 0, FENCED, FENCED | TAIL]
+
+    def test_unpaired_inline_fence_blocks_splitting(self):
+        text = HEADER + "- see ```code\n- more\n- end ``` here\n- after"
+        blocks = blocks_of(text)
+        assert blocks[1][0] == "- see ```code\n- more\n- end ``` here"
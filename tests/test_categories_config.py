@@ -0,0 +1,61 @@
+import pytest
+import builtins
+from src.processors.categories_config import CategoriesConfig
+from src.processors.page_title import PageTitleProcessor
+from src.processors.wikilink import WikiLinkProcessor
+from src.processors.tag_to_backlink import TagToBacklinkProcessor
+from src.file_handlers.page_file_processor import PageFileProcessor
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    (tmp_path / "uppercase.txt").write_text("AWS\nCLI\n")
+    (tmp_path / "types.txt").write_text("jira\nrepo\n")
+    (tmp_path / "lowercase.txt").write_text("of\nthe\n")
+    return str(tmp_path)
+
+
+class TestCategoriesConfig:
+    """Tests for the shared CategoriesConfig"""
+
+    def test_load_is_memoized(self, config_dir, monkeypatch):
+        opened = []
+        real_open = builtins.open
+
+        def counting_open(path, *args, **kwargs):
+            opened.append(str(path))
+            return real_open(path, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "open", counting_open)
+        config = CategoriesConfig.load(config_dir)
+        assert CategoriesConfig.load(config_dir) is config
+        TagToBacklinkProcessor(categories_config=config_dir)
+        WikiLinkProcessor(categories_config=config_dir)
+        PageTitleProcessor(config=config)
+        assert len(opened) == 3
+        assert config.uppercase_terms == {"AWS", "CLI"}
+        assert config.types == {"jira", "repo"}
+        assert config.lowercase_words == {"of", "the"}
+
+    def test_missing_lowercase_file_raises_when_needed(self, tmp_path):
+        (tmp_path / "types.txt").write_text("jira\n")
+        config = CategoriesConfig.load(str(tmp_path))
+        # Processors that don't use lowercase words still work
+        assert TagToBacklinkProcessor(categories_config=str(tmp_path)).types == {"jira"}
+        with pytest.raises(RuntimeError):
+            config.lowercase_words
+
+    def test_page_file_processor_shares_one_title_processor(self, config_dir, tmp_path):
+        processor = PageFileProcessor(categories_config=config_dir)
+        title_processor = processor.title_processor
+        for name in ("aws___cli.md", "jira___state_of_the_art.md"):
+            source = tmp_path / name
+            source.write_text("- Content\n")
+            processor.process_file(str(source), str(tmp_path / "out" / name))
+        assert processor.title_processor is title_processor
+        assert (tmp_path / "out" / "aws___cli.md").read_text().startswith(
+            "# AWS CLI\n"
+        )
+        assert (tmp_path / "out" / "jira___state_of_the_art.md").read_text().startswith(
+            "# State of the Art\n\n#jira\n"
+        )
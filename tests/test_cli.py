@@ -4,6 +4,7 @@ import sys
 import tempfile
 import shutil
 import subprocess
+import json
 from pathlib import Path
 
 
@@ -79,3 +80,26 @@ def test_cli_dry_run(test_workspace):
 
     # Check that no files were created
     assert not os.path.exists(output_dir)
+
+
+def test_cli_profile(test_workspace, tmp_path):
+    """Test the CLI with per-processor profiling"""
+    output_dir = str(tmp_path / "output")
+    profile_path = str(tmp_path / "profile.json")
+    result = run_cli(
+        [
+            "--workspace",
+            test_workspace,
+            "--output-dir",
+            output_dir,
+            "--profile-json",
+            profile_path,
+        ]
+    )
+    assert result.returncode == 0
+    assert "Processor Profile:" in result.stdout
+    assert "TaskCleaner" in result.stdout
+    with open(profile_path) as f:
+        profile = json.load(f)
+    assert profile["TaskCleaner"]["calls"] == 2
+    assert profile["PageTitleProcessor"]["calls"] == 1
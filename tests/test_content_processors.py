@@ -20,11 +20,13 @@ from src.processors import (
     BlockReferencesReplacer,
     FirstContentIndentationProcessor,
 )
+from src.processors import block_references
 from src.processors.base import ContentProcessor
 from src.processors.ordered_list_processor import OrderedListProcessor
 from src.processors.arrows_processor import ArrowsProcessor
 from src.processors.empty_line_processor import EmptyLineBetweenBulletsProcessor
 from src.processors.backlink_collector import BacklinkCollector
+from src.processors.pipeline import ProcessorPipeline
 
 
 class TestDateHeaderProcessor:
@@ -112,6 +114,36 @@ class TestTaskCleaner:
         assert "- # Third task" in new_content
         assert "- #### Final task" in new_content
 
+    def test_logbook_without_end_is_kept(self):
+        processor = TaskCleaner()
+        content = "- DONE a\n  :LOGBOOK:\n  CLOCK: x\n- DONE b\n  :LOGBOOK:\n"
+        new_content, changed = processor.process(content)
+        assert changed is True
+        assert new_content == content.replace("- DONE", "- [x]")
+
+    def test_logbooks_removed_up_to_first_end(self):
+        processor = TaskCleaner()
+        content = "- DONE a\n  :LOGBOOK:\n  :END:\n- b\n:LOGBOOK:\n  :END:\n  :END:"
+        new_content, changed = processor.process(content)
+        assert changed is True
+        assert new_content == "- [x] a\n- b\n  :END:"
+
+    def test_markers_stay_on_their_line(self):
+        processor = TaskCleaner()
+        content = "- CANCELLED\n- next\n## TODO\n- WAITING a - CANCELLED b - WAITING c"
+        new_content, changed = processor.process(content)
+        assert changed is True
+        expected = "- CANCELLED\n- next\n## TODO\n- [ ] a - [x] ~~b - WAITING c~~"
+        assert new_content == expected
+
+    def test_only_first_heading_marker_is_removed(self):
+        processor = TaskCleaner()
+        content = "## TODO CANCELLED a\n- ## DONE CANCELED b"
+        new_content, changed = processor.process(content)
+        assert changed is True
+        # A marker left behind by the first one is kept as heading text
+        assert new_content == "## CANCELLED a\n- ## CANCELED b"
+
 
 class TestLinkProcessor:
     """Tests for the LinkProcessor class"""
@@ -590,6 +622,28 @@ class TestIndentedBulletPointsProcessor:
         assert changed is False  # No change should be made
         assert new_content == expected
 
+    def test_matches_outline_rebuild_on_mixed_content(self):
+        processor = IndentedBulletPointsProcessor()
+        content = (
+            "- a\n\t- b\n\t\t```py\n\t\t# comment\n```\n\t\t\t- c\n"
+            "  ```\n- ## TODO heading\n\t\n\ttext\n - space"
+        )
+        assert processor.process(content) == (content, False)
+
+    def test_very_deep_outline(self):
+        processor = IndentedBulletPointsProcessor()
+        lines = ["\t" * depth + f"- level {depth}" for depth in range(10_000)]
+        assert processor.process_lines(lines) == (lines, False)
+
+    def test_million_lines(self):
+        processor = IndentedBulletPointsProcessor()
+        content = "\n".join(
+            "\t" * (i % 7) + f"- item {i}" for i in range(1_000_000)
+        )
+        new_content, changed = processor.process(content)
+        assert changed is False
+        assert new_content == content
+
 
 class TestWikiLinkProcessor:
     """Tests for the WikiLinkProcessor class"""
@@ -605,6 +659,7 @@ class TestWikiLinkProcessor:
         # Patch the processor to use the test config
         class PatchedWikiLinkProcessor(WikiLinkProcessor):
             def __init__(self, uppercase_path, types_path):
+                super().__init__()
                 self.lowercase_words = {
                     "a",
                     "an",
@@ -711,6 +766,28 @@ class TestWikiLinkProcessor:
         # Non-tag wikilinks should be formatted as usual
         assert "[[Some Page]]" in new_content
 
+    def test_memoized_target_becomes_tag(self):
+        processor = self.processor()
+        assert processor.process("[[Fresh Idea]]")[0] == "[[Fresh Idea]]"
+        TagToBacklinkProcessor.found_tags.add("fresh idea")
+        try:
+            assert processor.process("[[Fresh Idea]]")[0] == "[[fresh idea]]"
+        finally:
+            TagToBacklinkProcessor.found_tags.discard("fresh idea")
+
+    def test_cache_lookups_are_profiled(self):
+        processor = self.processor()
+        profiler = ProcessorPipeline.enable_profiling()
+        try:
+            processor.process("[[a page]] [[b page]] [[a page]]")
+            processor.process("[[a page]]")
+        finally:
+            ProcessorPipeline.disable_profiling()
+        stats = profiler.stats["PatchedWikiLinkProcessor"]
+        assert (stats.cache_hits, stats.cache_misses) == (2, 2)
+        assert profiler.as_dict()["PatchedWikiLinkProcessor"]["cache_hits"] == 2
+        assert "50%" in profiler.format_table()
+
     def test_does_not_reformat_already_slash_tagged(self):
         processor = self.processor()
         content = "- this is a test [[insight]]\n- another [[follow-up]]"
@@ -1086,6 +1163,196 @@ class TestBlockReferencesReplacer:
         assert "([[2024 01 09]])" not in result  # Should not use raw page name
         assert "([[Tue, January 9th, 2024]])" in result
 
+    def test_block_links_are_formatted_at_collection_time(self, tmpdir):
+        pages_dir = tmpdir.mkdir("pages")
+        pages_dir.join("source.md").write(
+            "# Source\n- A block with a \\d backslash\n"
+            "  id:: 67a45c2e-529c-4831-b069-dd6f8e8d1234\n"
+        )
+        replacer = BlockReferencesReplacer()
+        replacer.collect_blocks(str(tmpdir))
+
+        assert replacer.block_links == {
+            "67a45c2e-529c-4831-b069-dd6f8e8d1234": "_A block with a \\d backslash ([[Source]])_"
+        }
+        result, changed = replacer.process(
+            "- ((67a45c2e-529c-4831-b069-dd6f8e8d1234)) and "
+            "((67a45c2e-529c-4831-b069-dd6f8e8d1234))"
+        )
+        assert changed is True
+        # Block text is inserted literally, not as a regex replacement template
+        assert result == (
+            "- _A block with a \\d backslash ([[Source]])_ and "
+            "_A block with a \\d backslash ([[Source]])_"
+        )
+
+    def test_replace_regular_references_with_many_blocks(self):
+        replacer = BlockReferencesReplacer()
+        for i in range(5000):
+            block_id = f"{i:08x}-0000-0000-0000-000000000000"
+            replacer.block_map[block_id] = (f"Block {i}", "Page")
+        content = (
+            "- ((00000010-0000-0000-0000-000000000000))\n"
+            "- ((00001387-0000-0000-0000-000000000000))\n"
+            "- ((ffffffff-0000-0000-0000-000000000000))"
+        )
+
+        result = replacer._replace_regular_references(content)
+
+        assert result == (
+            "- _Block 16 ([[Page]])_\n"
+            "- _Block 4999 ([[Page]])_\n"
+            "- ((ffffffff-0000-0000-0000-000000000000))"
+        )
+
+    def test_collect_blocks_skips_files_without_ids(self, tmpdir):
+        pages_dir = tmpdir.mkdir("pages")
+        pages_dir.join("plain.md").write("# Plain\n- No blocks here\n")
+        pages_dir.join("windows.md").write_binary(
+            b"# Windows\r\n- A block\r\n  id:: 67a45c2e-529c-4831-b069-dd6f8e8d1234\r\n"
+        )
+        replacer = BlockReferencesReplacer()
+        replacer.collect_blocks(str(tmpdir))
+
+        assert (replacer.files_scanned, replacer.files_skipped) == (1, 1)
+        assert replacer.block_map == {
+            "67a45c2e-529c-4831-b069-dd6f8e8d1234": ("A block", "Windows")
+        }
+
+    def test_collect_blocks_in_parallel(self, tmpdir, monkeypatch):
+        monkeypatch.setattr(block_references, "MIN_PARALLEL_FILES", 1)
+        pages_dir = tmpdir.mkdir("pages")
+        for i in range(6):
+            pages_dir.join(f"page{i}.md").write(
+                f"# Page {i}\n- Block {i}\n"
+                f"  id:: 67a45c2e-529c-4831-b069-dd6f8e8d123{i}\n"
+                "- Shared block\n  id:: 67a45c2e-529c-4831-b069-dd6f8e8d9999\n"
+            )
+        pages_dir.join("plain.md").write("# Plain\n- No blocks here\n")
+        sequential = BlockReferencesReplacer()
+        sequential.collect_blocks(str(tmpdir))
+        parallel = BlockReferencesReplacer()
+        parallel.collect_blocks(str(tmpdir), jobs=2)
+
+        assert len(parallel.block_map) == 7
+        # The file scanned last defines the shared block, however many jobs
+        assert parallel.block_map == sequential.block_map
+        assert parallel.block_links == sequential.block_links
+        assert parallel.duplicate_block_ids == 1
+        assert (parallel.files_scanned, parallel.files_skipped) == (6, 1)
+
+    def test_replace_nested_references(self):
+        replacer = BlockReferencesReplacer()
+        # The outer block is collected both before and after the inner one
+        replacer.add_block(
+            "aaaa1111-2222-3333-4444-555566667777",
+            "See ((bbbb1111-2222-3333-4444-555566667777))",
+            "Outer",
+        )
+        replacer.add_block("bbbb1111-2222-3333-4444-555566667777", "Inner", "Notes")
+        replacer.add_block(
+            "cccc1111-2222-3333-4444-555566667777",
+            "Quoting ((aaaa1111-2222-3333-4444-555566667777))",
+            "Quotes",
+        )
+
+        result, changed = replacer.process(
+            "- ((cccc1111-2222-3333-4444-555566667777))"
+        )
+
+        assert changed is True
+        assert result == (
+            "- _Quoting _See _Inner ([[Notes]])_ ([[Outer]])_ ([[Quotes]])_"
+        )
+
+    def test_replace_cyclic_references(self):
+        replacer = BlockReferencesReplacer()
+        replacer.add_block(
+            "aaaa1111-2222-3333-4444-555566667777",
+            "A quotes ((bbbb1111-2222-3333-4444-555566667777))",
+            "Page A",
+        )
+        replacer.add_block(
+            "bbbb1111-2222-3333-4444-555566667777",
+            "B quotes ((aaaa1111-2222-3333-4444-555566667777))",
+            "Page B",
+        )
+
+        result, _ = replacer.process("- ((aaaa1111-2222-3333-4444-555566667777))")
+
+        # The reference back to the block being resolved is left as-is
+        assert result == (
+            "- _A quotes _B quotes ((aaaa1111-2222-3333-4444-555566667777)) "
+            "([[Page B]])_ ([[Page A]])_"
+        )
+
+
+    def test_cyclic_references_resolve_from_each_block(self):
+        replacer = BlockReferencesReplacer()
+        replacer.add_block(
+            "aaaa1111-2222-3333-4444-555566667777",
+            "A quotes ((bbbb1111-2222-3333-4444-555566667777))",
+            "Page A",
+        )
+        replacer.add_block(
+            "bbbb1111-2222-3333-4444-555566667777",
+            "B quotes ((aaaa1111-2222-3333-4444-555566667777))",
+            "Page B",
+        )
+
+        result, _ = replacer.process(
+            "- ((aaaa1111-2222-3333-4444-555566667777))\n"
+            "- ((bbbb1111-2222-3333-4444-555566667777))"
+        )
+
+        # B's text resolved inside A's isn't reused for references to B
+        assert result.split("\n")[1] == (
+            "- _B quotes _A quotes ((bbbb1111-2222-3333-4444-555566667777)) "
+            "([[Page A]])_ ([[Page B]])_"
+        )
+
+    def test_long_reference_chains(self):
+        replacer = BlockReferencesReplacer()
+        block_ids = [f"{i:08x}-2222-3333-4444-555566667777" for i in range(5000)]
+        for block_id, next_id in zip(block_ids, block_ids[1:]):
+            replacer.add_block(block_id, f"(({next_id}))", "Chain")
+        replacer.add_block(block_ids[-1], "End", "Chain")
+
+        # Deeper than the recursion limit
+        result, _ = replacer.process(f"- (({block_ids[0]}))")
+
+        assert result.startswith("- " + "_" * 5000 + "End ([[Chain]])_")
+        assert "((" not in result
+
+    def test_shared_references_are_resolved_once(self):
+        replacer = BlockReferencesReplacer()
+        # Each level quotes the next one twice, so the fully expanded text
+        # doubles with each level
+        block_ids = [f"{i:08x}-2222-3333-4444-555566667777" for i in range(12)]
+        for block_id, next_id in zip(block_ids, block_ids[1:]):
+            replacer.add_block(block_id, f"(({next_id})) and (({next_id}))", "D")
+        replacer.add_block(block_ids[-1], "Leaf", "D")
+
+        result, _ = replacer.process(f"- (({block_ids[0]}))")
+
+        assert result.count("Leaf") == 2**11
+        assert set(replacer.resolved_links) == set(block_ids[:-1])
+
+    def test_resolved_references_follow_block_changes(self):
+        replacer = BlockReferencesReplacer()
+        replacer.add_block(
+            "aaaa1111-2222-3333-4444-555566667777",
+            "See ((bbbb1111-2222-3333-4444-555566667777))",
+            "Outer",
+        )
+        replacer.add_block("bbbb1111-2222-3333-4444-555566667777", "Old", "Notes")
+        content = "- ((aaaa1111-2222-3333-4444-555566667777))"
+        assert "Old" in replacer.process(content)[0]
+
+        replacer.add_block("bbbb1111-2222-3333-4444-555566667777", "New", "Notes")
+        assert "New" in replacer.process(content)[0]
+        replacer.remove_block("bbbb1111-2222-3333-4444-555566667777")
+        assert "((bbbb1111" in replacer.process(content)[0]
 
 class TestOrderedListProcessor:
     """Tests for the OrderedListProcessor class"""
@@ -1100,9 +1367,61 @@ class TestOrderedListProcessor:
         )
         new_content, changed = processor.process(content)
         assert changed is True
-        expected = "1. Ordered subitem one\n" "1. Ordered subitem two\n"
+        expected = "1. Ordered subitem one\n" "2. Ordered subitem two\n"
         assert new_content == expected
 
+    def test_nested_lists_are_numbered_separately(self):
+        processor = OrderedListProcessor()
+        content = (
+            "- First\n"
+            "  logseq.order-list-type:: number\n"
+            "\t- Child one\n"
+            "\t  logseq.order-list-type:: number\n"
+            "\t\t- Unnumbered grandchild\n"
+            "\t- Child two\n"
+            "\t  logseq.order-list-type:: number\n"
+            "- Second\n"
+            "  logseq.order-list-type:: number\n"
+        )
+        new_content, changed = processor.process(content)
+        assert changed is True
+        assert new_content == (
+            "1. First\n"
+            "\t1. Child one\n"
+            "\t\t- Unnumbered grandchild\n"
+            "\t2. Child two\n"
+            "2. Second\n"
+        )
+
+    def test_numbering_restarts_after_other_sibling(self):
+        processor = OrderedListProcessor()
+        content = (
+            "- One\n"
+            "  logseq.order-list-type:: number\n"
+            "- Plain bullet\n"
+            "- One again\n"
+            "  logseq.order-list-type:: number\n"
+            "Paragraph\n"
+            "- One more time\n"
+            "\n"
+            "  logseq.order-list-type:: number"
+        )
+        new_content, _ = processor.process(content)
+        assert new_content == (
+            "1. One\n"
+            "- Plain bullet\n"
+            "1. One again\n"
+            "Paragraph\n"
+            "1. One more time"
+        )
+
+    def test_property_without_bullet_is_kept(self):
+        processor = OrderedListProcessor()
+        content = "-\ntext\nlogseq.order-list-type:: number\n- item\r\n"
+        new_content, changed = processor.process(content)
+        assert changed is False
+        assert new_content == content
+
     def test_no_change_without_order_property(self):
         processor = OrderedListProcessor()
         content = "- Simple bullet\n- Another bullet\n"
@@ -1235,6 +1554,11 @@ class TestArrowsProcessor:
         assert changed is True
         assert new_content == "← a → b ← c → d"
 
+    def test_adjacent_arrows(self):
+        processor = ArrowsProcessor()
+        new_content, _ = processor.process("<-> <=> =-> -=> <<-")
+        assert new_content == "<→ <→ =→ -→ <←"
+
 
 class TestAdmonitionProcessor:
     """Tests for the AdmonitionProcessor class"""
@@ -1407,6 +1731,17 @@ class TestTagToBacklinkProcessor:
         assert "[[tag4]]" in new_content
         assert "#notatag" in new_content  # in link, url, or no space
 
+    def test_found_tags_keep_lowercase_index(self):
+        processor = TagToBacklinkProcessor()
+        processor.process("Some #Release notes")
+        TagToBacklinkProcessor.found_tags.add("Follow-up")
+        assert TagToBacklinkProcessor.is_tag("RELEASE")
+        assert TagToBacklinkProcessor.is_tag("follow-UP")
+        TagToBacklinkProcessor.found_tags.discard("Follow-up")
+        assert not TagToBacklinkProcessor.is_tag("follow-up")
+        TagToBacklinkProcessor.found_tags.clear()
+        assert not TagToBacklinkProcessor.is_tag("release")
+
 
 class TestFirstContentIndentationProcessor:
     """Tests for the FirstContentIndentationProcessor class."""
@@ -156,3 +156,94 @@ class TestLogSeqToReflectConverter:
 
         # Clean up
         shutil.rmtree(output_dir)
+
+    def test_run_parallel_matches_sequential(self, test_workspace, tmp_path):
+        from src.processors.backlink_collector import BacklinkCollector
+        from src.processors.tag_to_backlink import TagToBacklinkProcessor
+
+        with open(os.path.join(test_workspace, "pages", "tagged.md"), "w") as f:
+            f.write("- Some #tagtopic with a [[Linked Page]]\n")
+
+        outputs = {}
+        registries = {}
+        for jobs in (1, 2):
+            output_dir = str(tmp_path / f"jobs_{jobs}")
+            TagToBacklinkProcessor.found_tags.clear()
+            converter = LogSeqToReflectConverter(
+                workspace=test_workspace, output_dir=output_dir, jobs=jobs
+            )
+            stats = converter.run()
+            assert stats.total_files == 5
+            files = {}
+            for step in ("step_1", "step_2"):
+                step_dir = os.path.join(output_dir, step)
+                for name in os.listdir(step_dir):
+                    with open(os.path.join(step_dir, name), "r") as f:
+                        files[(step, name)] = f.read()
+            outputs[jobs] = files
+            registries[jobs] = (
+                set(TagToBacklinkProcessor.found_tags),
+                set(BacklinkCollector.found_backlinks),
+            )
+
+        # Tags and backlinks found in workers are merged back into the parent
+        assert "tagtopic" in registries[2][0]
+        assert "tagtopic" in registries[2][1]
+        assert "Linked Page" in registries[2][1]
+        assert registries[1] == registries[2]
+        assert outputs[1] == outputs[2]
+        TagToBacklinkProcessor.found_tags.clear()
+        BacklinkCollector.clear_backlinks()
+
+    def test_links_to_tags_found_later_match_sequential(self, tmp_path):
+        from src.processors.backlink_collector import BacklinkCollector
+        from src.processors.tag_to_backlink import TagToBacklinkProcessor
+
+        workspace = tmp_path / "workspace"
+        (workspace / "journals").mkdir(parents=True)
+        (workspace / "pages").mkdir()
+        # Journals are converted first and link to the tag before it is found
+        for day in range(1, 21):
+            (workspace / "journals" / f"2024_01_{day:02d}.md").write_text(
+                f"- Wrote the [[Report]] on day {day}\n"
+            )
+        (workspace / "pages" / "aaa.md").write_text("- Draft of the [[Report]]\n")
+        (workspace / "pages" / "zzz.md").write_text("- Finished the #report\n")
+
+        outputs = {}
+        for jobs in (1, 4):
+            output_dir = tmp_path / f"jobs_{jobs}"
+            TagToBacklinkProcessor.found_tags.clear()
+            BacklinkCollector.clear_backlinks()
+            LogSeqToReflectConverter(
+                workspace=str(workspace), output_dir=str(output_dir), jobs=jobs
+            ).run()
+            outputs[jobs] = {
+                str(path.relative_to(output_dir)): path.read_bytes()
+                for path in output_dir.rglob("*")
+                if path.is_file()
+            }
+
+        assert outputs[1] == outputs[4]
+        page = outputs[1][os.path.join("step_2", "aaa.md")].decode("utf-8")
+        assert "[[report]]" in page
+        backlinks = outputs[1]["all_backlinks"].decode("utf-8")
+        assert "Report" not in backlinks
+        TagToBacklinkProcessor.found_tags.clear()
+        BacklinkCollector.clear_backlinks()
+
+    def test_run_with_pipelined_io_matches_sequential(self, test_workspace, tmp_path):
+        outputs = {}
+        for io_threads in (0, 3):
+            output_dir = str(tmp_path / f"io_{io_threads}")
+            converter = LogSeqToReflectConverter(
+                workspace=test_workspace, output_dir=output_dir, io_threads=io_threads
+            )
+            stats = converter.run()
+            assert stats.total_files == 4
+            outputs[io_threads] = {
+                (step, name): open(os.path.join(output_dir, step, name)).read()
+                for step in ("step_1", "step_2")
+                for name in os.listdir(os.path.join(output_dir, step))
+            }
+        assert outputs[0] == outputs[3]
@@ -1,8 +1,14 @@
+import builtins
+import logging
 import pytest
 import os
 import tempfile
 import shutil
+from concurrent.futures.process import BrokenProcessPool
+from src.file_handlers import directory_walker
 from src.file_handlers.directory_walker import DirectoryWalker
+from src.file_handlers.parallel import FileResult
+from src.file_handlers.workspace_index import WorkspaceIndex
 
 
 @pytest.fixture
@@ -139,7 +145,7 @@ class TestDirectoryWalker:
         pages_dir = os.path.join(test_workspace, "pages")
 
         # Process in dry run mode
-        total_files, content_changed = walker.process_pages_directory(pages_dir)
+        total_files, content_changed, _ = walker.process_pages_directory(pages_dir)
 
         # Check counts
         assert total_files == 2
@@ -154,7 +160,7 @@ class TestDirectoryWalker:
         pages_dir = os.path.join(test_workspace, "pages")
 
         # Process pages directory
-        total_files, content_changed = walker.process_pages_directory(pages_dir)
+        total_files, content_changed, _ = walker.process_pages_directory(pages_dir)
 
         # Check counts
         assert total_files == 2
@@ -191,3 +197,143 @@ class TestDirectoryWalker:
                     assert "# Another Page" in content
                     assert "- [x] Task 2" in content
                     assert "id::" not in content
+
+    def test_process_directories_in_parallel(self, test_workspace, output_dir):
+        walker = DirectoryWalker(test_workspace, output_dir, jobs=2)
+        assert walker.jobs == 2
+
+        total_files, content_changed, renamed = walker.process_journal_directory(
+            os.path.join(test_workspace, "journals")
+        )
+        assert (total_files, content_changed, renamed) == (2, 2, 2)
+
+        total_files, content_changed, _ = walker.process_pages_directory(
+            os.path.join(test_workspace, "pages")
+        )
+        assert (total_files, content_changed) == (2, 2)
+
+        step_1_dir = os.path.join(output_dir, "step_1")
+        step_2_dir = os.path.join(output_dir, "step_2")
+        assert os.path.exists(os.path.join(step_2_dir, "2023-01-01.md"))
+        assert os.path.exists(os.path.join(step_1_dir, "test_page.md"))
+        assert os.path.exists(os.path.join(step_2_dir, "another_page.md"))
+        assert walker.pool_report.runs == 2
+        assert walker.pool_report.files == 4
+
+    def test_workers_convert_indexed_content(self, test_workspace, output_dir):
+        index = WorkspaceIndex.scan(test_workspace)
+        # Files changed after the scan are converted as they were indexed
+        for path in ("journals/2023_01_01.md", "pages/another_page.md"):
+            with open(os.path.join(test_workspace, path), "w") as f:
+                f.write("Changed on disk")
+        walker = DirectoryWalker(test_workspace, output_dir, jobs=2, index=index)
+        walker.process_journal_directory(os.path.join(test_workspace, "journals"))
+        walker.process_pages_directory(os.path.join(test_workspace, "pages"))
+
+        step_2_dir = os.path.join(output_dir, "step_2")
+        with open(os.path.join(step_2_dir, "2023-01-01.md"), "r") as f:
+            assert "Task 1" in f.read()
+        with open(os.path.join(step_2_dir, "another_page.md"), "r") as f:
+            assert "More page content" in f.read()
+
+    def test_process_directories_with_pipelined_io(self, test_workspace, output_dir):
+        walker = DirectoryWalker(test_workspace, output_dir, io_threads=2)
+
+        total_files, content_changed, renamed = walker.process_journal_directory(
+            os.path.join(test_workspace, "journals")
+        )
+        assert (total_files, content_changed, renamed) == (2, 2, 2)
+        total_files, content_changed, _ = walker.process_pages_directory(
+            os.path.join(test_workspace, "pages")
+        )
+        assert (total_files, content_changed) == (2, 2)
+        # Every queued write has finished once the directory is processed
+        assert walker.page_processor.writer is None
+
+        step_2_dir = os.path.join(output_dir, "step_2")
+        with open(os.path.join(step_2_dir, "2023-01-02.md"), "r") as f:
+            assert "- [ ] Task 3" in f.read()
+        assert os.path.exists(os.path.join(output_dir, "step_1", "test_page.md"))
+        assert os.path.exists(os.path.join(step_2_dir, "another_page.md"))
+
+    def test_pipelined_io_dry_run_writes_nothing(self, test_workspace, output_dir):
+        walker = DirectoryWalker(test_workspace, output_dir, dry_run=True, io_threads=2)
+        total_files, _, _ = walker.process_pages_directory(
+            os.path.join(test_workspace, "pages")
+        )
+        assert total_files == 2
+        assert os.listdir(output_dir) == []
+
+    def test_pages_are_read_once_and_alias_pages_counted(
+        self, test_workspace, output_dir, monkeypatch
+    ):
+        reads = []
+        real_open = builtins.open
+
+        def counting_open(file, mode="r", *args, **kwargs):
+            if "r" in mode and str(file).startswith(test_workspace):
+                reads.append(os.path.basename(str(file)))
+            return real_open(file, mode, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "open", counting_open)
+        walker = DirectoryWalker(test_workspace, output_dir)
+        total_files, _, aliases = walker.process_pages_directory(
+            os.path.join(test_workspace, "pages")
+        )
+        assert (total_files, aliases) == (2, 1)
+        assert sorted(reads) == ["another_page.md", "test_page.md"]
+
+    def test_parallel_pages_are_read_once(
+        self, test_workspace, output_dir, monkeypatch
+    ):
+        reads = []
+        real_open = builtins.open
+        sent = {}
+
+        def counting_open(file, mode="r", *args, **kwargs):
+            if "r" in mode and str(file).startswith(test_workspace):
+                reads.append(os.path.basename(str(file)))
+            return real_open(file, mode, *args, **kwargs)
+
+        def pool(tasks, *args):
+            for _, file_path, _, content in tasks:
+                sent[os.path.basename(file_path)] = content
+                yield FileResult(
+                    file_path, False, True, set(), set(), {}, None, None, set()
+                )
+
+        monkeypatch.setattr(builtins, "open", counting_open)
+        monkeypatch.setattr(directory_walker, "run_in_pool", pool)
+        walker = DirectoryWalker(test_workspace, output_dir, jobs=2)
+        total_files, _, aliases = walker.process_pages_directory(
+            os.path.join(test_workspace, "pages")
+        )
+        assert (total_files, aliases) == (2, 1)
+        # The content read to route each page goes to the worker with it
+        assert sorted(reads) == ["another_page.md", "test_page.md"]
+        assert sent["test_page.md"].startswith("alias:: Test Alias")
+        assert sent["another_page.md"] is not None
+
+    def test_broken_pool_is_logged_not_raised(
+        self, test_workspace, output_dir, monkeypatch, caplog
+    ):
+        def broken_pool(tasks, *args):
+            kind, file_path, _, _ = tasks[0]
+            yield FileResult(
+                file_path, True, kind == "journal", set(), set(), {}, None, None, set()
+            )
+            raise BrokenProcessPool("A worker process terminated abruptly")
+
+        monkeypatch.setattr(directory_walker, "run_in_pool", broken_pool)
+        walker = DirectoryWalker(test_workspace, output_dir, jobs=2)
+        with caplog.at_level(logging.ERROR):
+            journals = walker.process_journal_directory(
+                os.path.join(test_workspace, "journals")
+            )
+            pages = walker.process_pages_directory(
+                os.path.join(test_workspace, "pages")
+            )
+        # The file converted before the pool broke is still counted
+        assert journals == (1, 1, 1)
+        assert pages[:2] == (1, 1)
+        assert "terminated abruptly" in caplog.text
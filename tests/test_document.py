@@ -0,0 +1,131 @@
+from src.processors import (
+    ArrowsProcessor,
+    EmptyContentCleaner,
+    FirstContentIndentationProcessor,
+    HeadingProcessor,
+)
+from src.processors.base import LineProcessor
+from src.processors.document import Document, code_fence_flags
+from src.processors.pipeline import ProcessorPipeline
+
+
+class RecordingLineProcessor(LineProcessor):
+    """Line processor that records the list objects it was given"""
+
+    def __init__(self):
+        self.seen = []
+
+    def process_lines(self, lines):
+        self.seen.append(lines)
+        return lines, False
+
+
+class TestDocument:
+    def test_lines_are_split_lazily(self):
+        document = Document("a\nb")
+        assert document._lines is None
+        assert document.lines == ["a", "b"]
+        assert document.lines is document.lines
+
+    def test_setting_lines_invalidates_text(self):
+        document = Document("a\nb")
+        document.lines = ["x", "y", "z"]
+        assert document.text == "x\ny\nz"
+
+    def test_setting_text_invalidates_lines(self):
+        document = Document("a\nb")
+        assert document.lines == ["a", "b"]
+        document.text = "c"
+        assert document.lines == ["c"]
+
+    def test_empty_lines_are_empty_text(self):
+        document = Document("a")
+        document.lines = []
+        assert document.text == ""
+        assert document.lines == [""]
+
+    def test_size_matches_text_in_both_forms(self):
+        text = "- é\n\n- b"
+        document = Document(text)
+        document.lines = document.lines
+        assert document.size() == len(text.encode("utf-8"))
+        assert Document(text).size() == len(text.encode("utf-8"))
+
+
+def test_code_fence_flags():
+    lines = ["- a", "  ```", "  [[x]]", "  ```", "- b", "```"]
+    assert code_fence_flags(lines) == [False, True, True, True, False, True]
+    assert code_fence_flags(lines, start=2) == [False] * 3 + [True] * 3
+
+
+class TestLineProcessorPipeline:
+    def test_process_matches_process_lines(self):
+        content = "- ## Heading\n  collapsed:: true\n- text"
+        processor = HeadingProcessor()
+        new_lines, changed = processor.process_lines(content.split("\n"))
+        assert processor.process(content) == ("\n".join(new_lines), changed)
+
+    def test_consecutive_line_processors_share_one_split(self):
+        first, second, third = (RecordingLineProcessor() for _ in range(3))
+        pipeline = ProcessorPipeline([first, second, ArrowsProcessor(), third])
+        result, changed = pipeline.process("- a -> b\n- c")
+
+        assert changed
+        assert result == "- a → b\n- c"
+        assert first.seen[0] is second.seen[0]
+        # A text processor changed the content in between, so it is split again
+        assert third.seen[0] is not first.seen[0]
+        assert third.seen[0] == ["- a → b", "- c"]
+
+    def test_line_pipeline_matches_sequential_processing(self):
+        content = "\n- first\n\n  - child\n- ## Heading\n\n"
+        processors = [
+            EmptyContentCleaner(),
+            HeadingProcessor(),
+            FirstContentIndentationProcessor(),
+        ]
+        expected = content
+        for processor in processors:
+            new_content, changed = processor.process(expected)
+            if changed:
+                expected = new_content
+        assert ProcessorPipeline(processors).process(content)[0] == expected
+
+
+class TriggeredProcessor(ArrowsProcessor):
+    """Arrows processor that counts its calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def process(self, content):
+        self.calls += 1
+        return super().process(content)
+
+
+class TestProcessorTriggers:
+    def test_contains_is_reset_when_content_changes(self):
+        document = Document("- a")
+        assert not document.contains("->")
+        document.text = "- a -> b"
+        assert document.contains("->")
+        document.lines = ["- a"]
+        assert not document.contains("->")
+
+    def test_processor_without_triggers_in_content_is_skipped(self):
+        processor = TriggeredProcessor()
+        pipeline = ProcessorPipeline([processor])
+        assert pipeline.process("- plain text") == ("- plain text", False)
+        assert processor.calls == 0
+        assert pipeline.process("- a -> b") == ("- a → b", True)
+        assert processor.calls == 1
+
+    def test_trigger_added_by_an_earlier_processor(self):
+        class AddArrow(LineProcessor):
+            def process_lines(self, lines):
+                return [line + " ->" for line in lines], True
+
+        processor = TriggeredProcessor()
+        pipeline = ProcessorPipeline([AddArrow(), processor])
+        assert pipeline.process("- a") == ("- a →", True)
+        assert processor.calls == 1
@@ -5,6 +5,9 @@ import shutil
 from src.file_handlers.file_processor import FileProcessor
 from src.file_handlers.journal_file_processor import JournalFileProcessor
 from src.file_handlers.page_file_processor import PageFileProcessor
+from src.processors.pipeline import ProcessorPipeline
+from src.processors import TaskCleaner, ArrowsProcessor
+from benchmarks.graph_generator import generate_journal_corpus
 
 
 @pytest.fixture
@@ -26,6 +29,29 @@ class TestFileProcessor:
         processor = FileProcessor([], dry_run=False)
         assert processor.dry_run is False
 
+    def test_pipeline_profiling(self):
+        pipeline = ProcessorPipeline([TaskCleaner(), ArrowsProcessor()])
+        profiler = ProcessorPipeline.enable_profiling()
+        try:
+            pipeline.process("- TODO Task -> next")
+            pipeline.process("- Plain TODO text é")
+            pipeline.process("- No triggers")
+        finally:
+            ProcessorPipeline.disable_profiling()
+        pipeline.process("- Not recorded")
+
+        tasks = profiler.stats["TaskCleaner"]
+        assert tasks.calls == 2
+        assert tasks.changes == 1
+        assert tasks.change_rate == 0.5
+        assert tasks.skips == 1
+        plain = "- Plain TODO text é"
+        assert tasks.bytes_in == len("- TODO Task -> next") + len(plain) + 1
+        assert tasks.bytes_out == len("- [ ] Task -> next") + len(plain) + 1
+        assert profiler.stats["ArrowsProcessor"].calls == 1
+        assert profiler.as_dict()["ArrowsProcessor"]["skips"] == 2
+        assert "TaskCleaner" in profiler.format_table()
+
 
 class TestJournalFileProcessor:
     """Tests for the JournalFileProcessor class"""
@@ -116,3 +142,46 @@ class TestPageFileProcessor:
         assert "- [ ] Task 1" in content
         assert "- [x] Task 2" in content
         assert "alias::" not in content
+
+
+class TestStreaming:
+    """Converting large pages block by block gives the same output"""
+
+    @pytest.fixture
+    def corpus(self):
+        return generate_journal_corpus(60_000, seed=3)
+
+    def convert(self, processor, content, temp_dir, name):
+        processor.stream_block_size = 0
+        input_path = os.path.join(temp_dir, name)
+        with open(input_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        output_dir = os.path.join(temp_dir, str(processor.stream_threshold))
+        if isinstance(processor, JournalFileProcessor):
+            changed, _ = processor.process_file(input_path, output_dir)
+            output_path = os.path.join(output_dir, "2023-01-15.md")
+        else:
+            output_path = os.path.join(output_dir, name)
+            changed, _ = processor.process_file(input_path, output_path)
+        with open(output_path, "r", encoding="utf-8") as f:
+            return f.read(), changed
+
+    @pytest.mark.parametrize(
+        "processor_class, name",
+        [(JournalFileProcessor, "2023_01_15.md"), (PageFileProcessor, "a___b.md")],
+    )
+    def test_streamed_output_matches(self, corpus, temp_dir, processor_class, name):
+        for content in corpus + ["\n".join(corpus)]:
+            whole = self.convert(
+                processor_class(stream_threshold=None), content, temp_dir, name
+            )
+            streamed = self.convert(
+                processor_class(stream_threshold=0), content, temp_dir, name
+            )
+            assert streamed == whole
+
+    def test_page_with_late_alias_is_converted_whole(self, temp_dir):
+        content = "- one\n- two\n- three\n- four\n- five\nalias:: Other"
+        processor = PageFileProcessor(stream_threshold=0)
+        output, _ = self.convert(processor, content, temp_dir, "page.md")
+        assert output.startswith("# Page // Other")
@@ -0,0 +1,67 @@
+import pytest
+import os
+import re
+from benchmarks.graph_generator import generate_graph
+from src.file_handlers.logseq_to_reflect_converter import LogSeqToReflectConverter
+from src.processors.backlink_collector import BacklinkCollector
+from src.processors.tag_to_backlink import TagToBacklinkProcessor
+
+
+def read_tree(root):
+    files = {}
+    for dir_path, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(dir_path, name)
+            with open(path, "r", encoding="utf-8") as f:
+                files[os.path.relpath(path, root)] = f.read()
+    return files
+
+
+class TestGraphGenerator:
+    """Tests for the synthetic graph generator used by the benchmarks"""
+
+    def test_same_seed_gives_same_graph(self, tmp_path):
+        generate_graph(str(tmp_path / "a"), 60, seed=3)
+        generate_graph(str(tmp_path / "b"), 60, seed=3)
+        generate_graph(str(tmp_path / "c"), 60, seed=4)
+        assert read_tree(tmp_path / "a") == read_tree(tmp_path / "b")
+        assert read_tree(tmp_path / "a") != read_tree(tmp_path / "c")
+
+    def test_graph_has_realistic_mix(self, tmp_path):
+        summary = generate_graph(str(tmp_path), 200)
+        files = read_tree(tmp_path)
+        assert len(files) == 200
+        assert summary.journals + summary.pages == 200
+        journals = [p for p in files if p.startswith("journals")]
+        assert all(
+            re.fullmatch(r"\d{4}_\d{2}_\d{2}\.md", os.path.basename(p))
+            for p in journals
+        )
+        assert any("___" in p for p in files)
+        content = "".join(files.values())
+        for marker in (
+            "alias::",
+            "id::",
+            "{{embed ((",
+            "[[",
+            " #",
+            "```",
+            ":LOGBOOK:",
+            "#+BEGIN_",
+            "logseq.order-list-type:: number",
+        ):
+            assert marker in content, marker
+        # Every block reference points at a block defined somewhere in the graph
+        defined = set(re.findall(r"id:: ([0-9a-f-]{36})", content))
+        referenced = set(re.findall(r"\(\(([0-9a-f-]{36})\)\)", content))
+        assert referenced and referenced <= defined
+
+    def test_generated_graph_converts(self, tmp_path):
+        generate_graph(str(tmp_path / "graph"), 40)
+        converter = LogSeqToReflectConverter(
+            workspace=str(tmp_path / "graph"), output_dir=str(tmp_path / "out")
+        )
+        stats = converter.run()
+        assert stats.total_files == 40
+        TagToBacklinkProcessor.found_tags.clear()
+        BacklinkCollector.clear_backlinks()
@@ -0,0 +1,223 @@
+import pytest
+import os
+import json
+from src.file_handlers.logseq_to_reflect_converter import LogSeqToReflectConverter
+from src.file_handlers import manifest
+from src.file_handlers.manifest import MANIFEST_FILENAME
+from src.processors.tag_to_backlink import TagToBacklinkProcessor
+
+BLOCK_ID = "67a45c2e-529c-4831-b069-dd6f8e8d1234"
+QUOTE_ID = "67a45c2e-529c-4831-b069-dd6f8e8d5678"
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    """Create a small workspace with a block reference between two pages"""
+    journals_dir = tmp_path / "workspace" / "journals"
+    pages_dir = tmp_path / "workspace" / "pages"
+    journals_dir.mkdir(parents=True)
+    pages_dir.mkdir()
+    (journals_dir / "2023_01_01.md").write_text("- Journal entry\n- TODO Task 1\n")
+    (pages_dir / "source.md").write_text(f"- Original text\n  id:: {BLOCK_ID}\n")
+    (pages_dir / "referrer.md").write_text(f"- See (({BLOCK_ID}))\n")
+    (pages_dir / "linker.md").write_text("- Link to [[Release]]\n")
+    (pages_dir / "other.md").write_text("- Unrelated page\n")
+    yield str(tmp_path / "workspace")
+    TagToBacklinkProcessor.found_tags.clear()
+
+
+def convert(workspace, output_dir, **kwargs):
+    converter = LogSeqToReflectConverter(
+        workspace=workspace, output_dir=output_dir, incremental=True, **kwargs
+    )
+    return converter.run()
+
+
+def read(output_dir, rel_path):
+    with open(os.path.join(output_dir, rel_path), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def snapshot(output_dir):
+    files = {}
+    for step in ("step_1", "step_2"):
+        for name in sorted(os.listdir(os.path.join(output_dir, step))):
+            files[(step, name)] = read(output_dir, os.path.join(step, name))
+    return files
+
+
+class TestIncrementalConversion:
+    """Tests for the --incremental mode of LogSeqToReflectConverter"""
+
+    def test_first_run_matches_full_run_and_writes_manifest(
+        self, workspace, tmp_path
+    ):
+        full_dir = str(tmp_path / "full")
+        LogSeqToReflectConverter(workspace=workspace, output_dir=full_dir).run()
+        TagToBacklinkProcessor.found_tags.clear()
+        incremental_dir = str(tmp_path / "incremental")
+        stats = convert(workspace, incremental_dir)
+
+        assert stats.total_files == 5
+        assert snapshot(incremental_dir) == snapshot(full_dir)
+        with open(os.path.join(incremental_dir, MANIFEST_FILENAME)) as f:
+            manifest = json.load(f)
+        assert set(manifest["files"]) == {
+            os.path.join("journals", "2023_01_01.md"),
+            os.path.join("pages", "source.md"),
+            os.path.join("pages", "referrer.md"),
+            os.path.join("pages", "linker.md"),
+            os.path.join("pages", "other.md"),
+        }
+        assert manifest["files"][os.path.join("pages", "other.md")]["output"] == (
+            os.path.join("step_2", "other.md")
+        )
+
+    def test_unchanged_workspace_converts_nothing(self, workspace, tmp_path):
+        output_dir = str(tmp_path / "output")
+        convert(workspace, output_dir)
+        before = snapshot(output_dir)
+
+        stats = convert(workspace, output_dir)
+
+        assert stats.total_files == 0
+        assert stats.files_unchanged == 5
+        assert snapshot(output_dir) == before
+
+    def test_only_edited_file_is_reconverted(self, workspace, tmp_path):
+        output_dir = str(tmp_path / "output")
+        convert(workspace, output_dir)
+        with open(os.path.join(workspace, "pages", "other.md"), "w") as f:
+            f.write("- Edited page\n")
+
+        stats = convert(workspace, output_dir)
+
+        assert stats.total_files == 1
+        assert stats.files_unchanged == 4
+        assert "Edited page" in read(output_dir, os.path.join("step_2", "other.md"))
+
+    def test_changed_block_reconverts_referencing_files(self, workspace, tmp_path):
+        output_dir = str(tmp_path / "output")
+        convert(workspace, output_dir)
+        assert "_Original text ([[Source]])_" in read(
+            output_dir, os.path.join("step_2", "referrer.md")
+        )
+        with open(os.path.join(workspace, "pages", "source.md"), "w") as f:
+            f.write(f"- Updated text\n  id:: {BLOCK_ID}\n")
+
+        stats = convert(workspace, output_dir)
+
+        assert stats.total_files == 2
+        assert "_Updated text ([[Source]])_" in read(
+            output_dir, os.path.join("step_2", "referrer.md")
+        )
+
+    def test_changed_block_reconverts_indirect_referrers(self, workspace, tmp_path):
+        pages_dir = os.path.join(workspace, "pages")
+        with open(os.path.join(pages_dir, "quote.md"), "w") as f:
+            f.write(f"- Quoting (({BLOCK_ID}))\n  id:: {QUOTE_ID}\n")
+        with open(os.path.join(pages_dir, "chain.md"), "w") as f:
+            f.write(f"- Ref (({QUOTE_ID}))\n")
+        output_dir = str(tmp_path / "output")
+        convert(workspace, output_dir)
+        assert "Original text" in read(output_dir, os.path.join("step_2", "chain.md"))
+        with open(os.path.join(pages_dir, "source.md"), "w") as f:
+            f.write(f"- Updated text\n  id:: {BLOCK_ID}\n")
+
+        stats = convert(workspace, output_dir)
+
+        # source.md, referrer.md, quote.md and chain.md, through quote.md's block
+        assert stats.total_files == 4
+        assert "Updated text" in read(output_dir, os.path.join("step_2", "chain.md"))
+
+    def test_deleted_source_removes_output(self, workspace, tmp_path):
+        output_dir = str(tmp_path / "output")
+        convert(workspace, output_dir)
+        os.remove(os.path.join(workspace, "pages", "other.md"))
+
+        stats = convert(workspace, output_dir)
+
+        assert stats.outputs_removed == 1
+        assert not os.path.exists(os.path.join(output_dir, "step_2", "other.md"))
+        with open(os.path.join(output_dir, MANIFEST_FILENAME)) as f:
+            assert os.path.join("pages", "other.md") not in json.load(f)["files"]
+
+    def test_tag_changes_reconvert_files_linking_to_it(self, workspace, tmp_path):
+        output_dir = str(tmp_path / "output")
+        convert(workspace, output_dir)
+        linker_output = os.path.join("step_2", "linker.md")
+        assert "[[Release]]" in read(output_dir, linker_output)
+        tagger_path = os.path.join(workspace, "pages", "tagger.md")
+
+        # A new page turns "release" into a tag: the unchanged linker page follows
+        with open(tagger_path, "w") as f:
+            f.write("- A #release note\n")
+        stats = convert(workspace, output_dir)
+        assert stats.total_files == 2
+        assert "[[release]]" in read(output_dir, linker_output)
+        assert os.path.exists(os.path.join(output_dir, "step_1", "release.md"))
+
+        # Removing the tag again reverts the link and removes the tag page
+        with open(tagger_path, "w") as f:
+            f.write("- No tags anymore\n")
+        stats = convert(workspace, output_dir)
+        assert stats.total_files == 2
+        assert "[[Release]]" in read(output_dir, linker_output)
+        assert not os.path.exists(os.path.join(output_dir, "step_1", "release.md"))
+
+    def test_config_change_reconverts_everything(self, workspace, tmp_path):
+        output_dir = str(tmp_path / "output")
+        config_dir = tmp_path / "config"
+        config_dir.mkdir()
+        (config_dir / "types.txt").write_text("repo\n")
+        (config_dir / "uppercase.txt").write_text("AWS\n")
+        (config_dir / "lowercase.txt").write_text("a\nthe\n")
+        convert(workspace, output_dir, categories_config=str(config_dir))
+        (config_dir / "uppercase.txt").write_text("AWS\nIAM\n")
+
+        stats = convert(workspace, output_dir, categories_config=str(config_dir))
+
+        assert stats.total_files == 5
+        assert stats.files_unchanged == 0
+
+    def test_manifest_version_change_reconverts_everything(self, workspace, tmp_path):
+        output_dir = str(tmp_path / "output")
+        convert(workspace, output_dir)
+        manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
+        with open(manifest_path) as f:
+            data = json.load(f)
+        data["version"] -= 1
+        with open(manifest_path, "w") as f:
+            json.dump(data, f)
+
+        stats = convert(workspace, output_dir)
+
+        assert stats.total_files == 5
+        assert stats.files_unchanged == 0
+
+    def test_converter_change_reconverts_everything(
+        self, workspace, tmp_path, monkeypatch
+    ):
+        output_dir = str(tmp_path / "output")
+        convert(workspace, output_dir)
+        monkeypatch.setattr(manifest, "_converter_fingerprint", "other converter")
+
+        stats = convert(workspace, output_dir)
+
+        assert stats.total_files == 5
+        assert stats.files_unchanged == 0
+
+    def test_moved_config_keeps_outputs(self, workspace, tmp_path):
+        output_dir = str(tmp_path / "output")
+        for name in ("config", "moved"):
+            config_dir = tmp_path / name
+            config_dir.mkdir()
+            (config_dir / "types.txt").write_text("repo\n")
+            (config_dir / "lowercase.txt").write_text("a\nthe\n")
+        convert(workspace, output_dir, categories_config=str(tmp_path / "config"))
+
+        moved = str(tmp_path / "moved")
+        stats = convert(workspace, output_dir, categories_config=moved)
+
+        assert stats.total_files == 0
+        assert stats.files_unchanged == 5
@@ -7,6 +7,9 @@ from pathlib import Path
 import importlib.util
 import re
 import subprocess
+from src.file_handlers.file_processor import FileProcessor
+from src.file_handlers.logseq_to_reflect_converter import LogSeqToReflectConverter
+from src.processors.backlink_collector import BacklinkCollector
 from src.processors.tag_to_backlink import TagToBacklinkProcessor
 
 
@@ -253,6 +256,34 @@ def test_full_workspace_conversion(monkeypatch):
     converter_module.main()
 
 
+def test_full_workspace_streamed_conversion(monkeypatch, tmp_path):
+    """Converting every page block by block gives the same output"""
+    monkeypatch.setattr(FileProcessor, "stream_block_size", 0)
+    full_test_workspace = os.path.join(os.path.dirname(__file__), "full_test_workspace")
+    expected_dir = full_test_workspace + " (Reflect format)"
+    output_dir = tmp_path / "out"
+    try:
+        LogSeqToReflectConverter(
+            workspace=full_test_workspace,
+            output_dir=str(output_dir),
+            stream_threshold=0,
+        ).run()
+    finally:
+        TagToBacklinkProcessor.found_tags.clear()
+        BacklinkCollector.clear_backlinks()
+
+    def read_tree(root):
+        files = {}
+        for dir_path, _, names in os.walk(root):
+            for name in names:
+                path = os.path.join(dir_path, name)
+                with open(path, "r", encoding="utf-8") as f:
+                    files[os.path.relpath(path, root)] = f.read()
+        return files
+
+    assert read_tree(output_dir) == read_tree(expected_dir)
+
+
 def test_arrows_processor_integration(tmp_path):
     from src.processors.arrows_processor import ArrowsProcessor
     from src.processors.pipeline import ProcessorPipeline
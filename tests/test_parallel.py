@@ -0,0 +1,50 @@
+from src.file_handlers.parallel import PoolReport, plan_chunks
+
+
+class TestPlanChunks:
+    """Tests for plan_chunks"""
+
+    def test_largest_files_go_first(self):
+        sizes = [10, 5_000_000, 200, 300_000, 1_000_000]
+        chunks = plan_chunks(sizes, jobs=2, chunk_bytes=100_000)
+        assert chunks[:3] == [[1], [4], [3]]
+        assert sorted(sum(chunks, [])) == list(range(len(sizes)))
+
+    def test_small_files_are_chunked(self):
+        sizes = [1_000] * 1_000
+        chunks = plan_chunks(sizes, jobs=4, chunk_bytes=10_000)
+        assert [len(chunk) for chunk in chunks] == [10] * 100
+        # Equal sizes keep the task order
+        assert chunks[0] == list(range(10))
+
+    def test_chunks_are_bounded_by_file_count(self):
+        # Without sizes, chunks hold as many files as the pool's old chunksize
+        chunks = plan_chunks([0] * 80, jobs=2)
+        assert [len(chunk) for chunk in chunks] == [10] * 8
+
+
+class TestPoolReport:
+    """Tests for the PoolReport class"""
+
+    def test_tail_idle_time(self):
+        report = PoolReport()
+        # Worker 1 finishes at 4s, worker 2 at 10s and worker 3 never gets a chunk
+        chunks = [(1, 0.0, 4.0, 3), (2, 0.0, 6.0, 1), (2, 6.0, 10.0, 1)]
+        report.add_run(3, 0.0, chunks)
+        assert report.runs == 1
+        assert (report.files, report.chunks) == (5, 3)
+        assert report.worker_seconds == 30.0
+        assert report.busy_seconds == 14.0
+        assert report.tail_idle_seconds == 16.0
+        assert report.longest_tail == 10.0
+        assert "idle at the tail 16.00s (53%" in str(report)
+
+    def test_runs_add_up(self):
+        report = PoolReport()
+        report.add_run(2, 0.0, [(1, 0.0, 2.0, 1), (2, 0.0, 2.0, 1)])
+        report.add_run(2, 5.0, [(1, 5.0, 6.0, 1), (2, 5.0, 7.0, 1)])
+        report.add_run(2, 9.0, [])
+        assert report.runs == 2
+        assert report.worker_seconds == 8.0
+        assert report.tail_idle_seconds == 1.0
+        assert report.tail_idle_rate == 1.0 / 8.0
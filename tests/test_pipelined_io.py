@@ -0,0 +1,74 @@
+import threading
+from src.file_handlers.pipelined_io import PrefetchReader, WriteBehindWriter
+
+
+def test_prefetch_reader_keeps_order(tmp_path):
+    paths = []
+    for i in range(20):
+        path = tmp_path / f"{i}.md"
+        path.write_text(f"- file {i}\n", encoding="utf-8")
+        paths.append(str(path))
+
+    results = list(PrefetchReader(threads=4, max_pending=3).read(paths))
+    assert [path for path, _ in results] == paths
+    assert [content for _, content in results] == [
+        f"- file {i}\n" for i in range(20)
+    ]
+
+
+def test_prefetch_reader_reports_unreadable_files(tmp_path):
+    missing = str(tmp_path / "missing.md")
+    assert list(PrefetchReader(threads=2).read([missing])) == [(missing, None)]
+
+
+def test_prefetch_reader_bounds_read_ahead(tmp_path):
+    requested = []
+
+    def paths():
+        for i in range(10):
+            requested.append(i)
+            yield str(tmp_path / f"{i}.md")
+
+    reader = PrefetchReader(threads=2, max_pending=3)
+    results = reader.read(paths())
+    next(results)
+    # Taking the first file only requested as many files as may be pending
+    assert len(requested) == 3
+
+
+def test_write_behind_writer(tmp_path):
+    output = tmp_path / "out" / "page.md"
+    with WriteBehindWriter() as writer:
+        writer.submit(str(output), "first")
+        writer.submit(str(output), "second")
+    # Writes are applied in submission order
+    assert output.read_text(encoding="utf-8") == "second"
+    assert writer.errors == []
+
+
+def test_write_behind_writer_applies_backpressure(tmp_path):
+    writer = WriteBehindWriter(max_pending=1)
+    # Stop the writer thread so that nothing drains the queue
+    writer._queue.put(None)
+    writer._workers[0].join()
+    writer.submit(str(tmp_path / "a.md"), "a")
+
+    submitted = threading.Event()
+    thread = threading.Thread(
+        target=lambda: (writer.submit(str(tmp_path / "b.md"), "b"), submitted.set()),
+        daemon=True,
+    )
+    thread.start()
+    # The queue is full, so submit() waits until an output is taken from it
+    assert not submitted.wait(0.1)
+    writer._queue.get()
+    assert submitted.wait(1)
+
+
+def test_write_behind_writer_collects_errors(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("", encoding="utf-8")
+    writer = WriteBehindWriter()
+    writer.submit(str(blocker / "page.md"), "content")
+    errors = writer.close()
+    assert [path for path, _ in errors] == [str(blocker / "page.md")]
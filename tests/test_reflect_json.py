@@ -0,0 +1,110 @@
+import pytest
+import os
+import json
+import datetime
+from src.file_handlers.reflect_json import (
+    ReflectJsonWriter,
+    markdown_to_document,
+    make_note,
+)
+from src.file_handlers.logseq_to_reflect_converter import LogSeqToReflectConverter
+from src.processors.tag_to_backlink import TagToBacklinkProcessor
+
+EXPORTS_DIR = os.path.join(os.path.dirname(__file__), "..", "Exports", "Reflect_JSON")
+MODIFIED = datetime.datetime(2025, 4, 13, 14, 50, 40, 980000)
+
+
+class TestReflectJsonWriter:
+    """Tests for the streaming Reflect JSON export"""
+
+    def test_empty_export_matches_reflect_format(self, tmp_path):
+        path = str(tmp_path / "export.json")
+        with ReflectJsonWriter(path) as writer:
+            writer.close([])
+        with open(path) as f:
+            exported = json.load(f)
+        with open(os.path.join(EXPORTS_DIR, "fresh_graph.json")) as f:
+            assert exported == json.load(f)
+
+    def test_notes_are_flushed_as_they_are_written(self, tmp_path):
+        path = str(tmp_path / "export.json")
+        with ReflectJsonWriter(path, buffer_size=100) as writer:
+            for i in range(50):
+                note = make_note(f"note-{i}", f"Note {i}", ["- x"], MODIFIED)
+                writer.write_note(note)
+                # Never more than one note over the buffer size is held in memory
+                assert writer._buffered < 100 + 1000
+            assert os.path.getsize(path + ".tmp") > 0
+            writer.close(["b", "a"])
+        with open(path) as f:
+            data = json.load(f)
+        ids = [note["id"] for note in data["notes"]]
+        assert ids == [f"note-{i}" for i in range(50)]
+        assert data["tags"] == ["a", "b"]
+        assert data["notes"][0]["created_at"] == "2025-04-13T14:50:40.980Z"
+        assert not os.path.exists(path + ".tmp")
+
+    def test_failed_export_leaves_no_file(self, tmp_path):
+        path = str(tmp_path / "export.json")
+        with pytest.raises(ValueError):
+            with ReflectJsonWriter(path) as writer:
+                writer.write_note(make_note("a", "A", [], MODIFIED))
+                raise ValueError("boom")
+        assert os.listdir(tmp_path) == []
+
+    def test_markdown_to_document(self):
+        lines = [
+            "",
+            "- Parent with [[Some Page]]",
+            "\t- [x] Done child",
+            "\t  continuation",
+            "- ```python",
+            "  print(1)",
+            "  ```",
+            "Closing paragraph",
+        ]
+        document = markdown_to_document("page", "Page", lines)
+        heading, parent, code_item, paragraph = document["content"]
+        assert heading["content"][0]["text"] == "Page"
+        assert parent["content"][0]["content"][1] == {
+            "type": "backlink",
+            "attrs": {"id": "some-page", "label": "Some Page"},
+        }
+        child = parent["content"][1]
+        assert child["attrs"]["kind"] == "task"
+        assert child["attrs"]["checked"] is True
+        assert child["content"][0]["content"][0]["text"] == "Done child"
+        assert child["content"][1]["content"][0]["text"] == "continuation"
+        code = code_item["content"][0]
+        assert code["type"] == "codeBlock"
+        assert code["attrs"]["language"] == "python"
+        assert code["content"][0]["text"] == "  print(1)"
+        assert paragraph["content"][0]["text"] == "Closing paragraph"
+        # Guids are stable across runs
+        assert markdown_to_document("page", "Page", lines) == document
+
+
+def test_converter_json_export(tmp_path):
+    workspace = tmp_path / "workspace"
+    (workspace / "journals").mkdir(parents=True)
+    (workspace / "pages").mkdir()
+    (workspace / "journals" / "2025_04_13.md").write_text("- Met #tagperson today\n")
+    (workspace / "pages" / "How to use Reflect.md").write_text("- Tips\n")
+    json_path = str(tmp_path / "export.json")
+    TagToBacklinkProcessor.found_tags.clear()
+    LogSeqToReflectConverter(
+        workspace=str(workspace),
+        output_dir=str(tmp_path / "output"),
+        json_export=json_path,
+    ).run()
+    TagToBacklinkProcessor.found_tags.clear()
+
+    with open(json_path) as f:
+        data = json.load(f)
+    notes = {note["id"]: note for note in data["notes"]}
+    assert data["tags"] == ["tagperson"]
+    assert notes["13042025"]["subject"] == "Sun, April 13th, 2025"
+    assert notes["13042025"]["daily_at"] == "2025-04-13"
+    assert notes["how-to-use-reflect"]["subject"] == "How to Use Reflect"
+    assert notes["how-to-use-reflect"]["daily_at"] is None
+    assert "tagperson" in notes
@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from src.file_handlers.shared_block_map import SharedBlockMap
+
+BLOCK_MAP = {
+    "6650a1b2-0000-4000-8000-000000000002": ("Second block", "Page B"),
+    "6650a1b2-0000-4000-8000-000000000001": ("First block ✓", "Résumé"),
+    "6650a1b2-0000-4000-8000-000000000003": ("", "journals/2024_01_02"),
+}
+
+
+@pytest.fixture
+def shared_map(tmp_path):
+    path = str(tmp_path / "blocks.map")
+    SharedBlockMap.write(BLOCK_MAP, path)
+    block_map = SharedBlockMap(path)
+    yield block_map
+    block_map.close()
+
+
+class TestSharedBlockMap:
+    """Tests for the SharedBlockMap class"""
+
+    def test_round_trip(self, shared_map):
+        assert len(shared_map) == 3
+        assert dict(shared_map.items()) == BLOCK_MAP
+
+    def test_ids_are_sorted(self, shared_map):
+        assert list(shared_map) == sorted(BLOCK_MAP)
+
+    def test_missing_ids(self, shared_map):
+        assert "6650a1b2-0000-4000-8000-000000000000" not in shared_map
+        assert shared_map.get("6650a1b2-0000-4000-8000-000000000009") is None
+        assert 3 not in shared_map
+        with pytest.raises(KeyError):
+            shared_map["missing"]
+
+    def test_empty_map(self, tmp_path):
+        path = str(tmp_path / "empty.map")
+        SharedBlockMap.write({}, path)
+        block_map = SharedBlockMap(path)
+        assert len(block_map) == 0
+        assert "anything" not in block_map
+        block_map.close()
+
+    def test_temporary_file(self):
+        path = SharedBlockMap.write_temporary(BLOCK_MAP)
+        try:
+            block_map = SharedBlockMap(path)
+            assert block_map["6650a1b2-0000-4000-8000-000000000002"] == (
+                "Second block",
+                "Page B",
+            )
+            block_map.close()
+        finally:
+            os.remove(path)
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "other.map"
+        path.write_bytes(b"\0" * 64)
+        with pytest.raises(ValueError):
+            SharedBlockMap(str(path))
@@ -0,0 +1,67 @@
+import pytest
+
+from src.file_handlers.workspace_index import WorkspaceIndex
+from src.processors.page_title import PageTitleProcessor
+from src.processors.title_table import TitleTable
+
+
+@pytest.fixture(autouse=True)
+def graph_names(monkeypatch):
+    """Give every test its own graph names"""
+    monkeypatch.setattr(TitleTable, "graph_names", set())
+
+
+class CountingFormatter:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, name):
+        self.calls.append(name)
+        return name.title()
+
+
+class TestTitleTable:
+    """Tests for the TitleTable class"""
+
+    def test_formats_each_name_once(self):
+        formatter = CountingFormatter()
+        table = TitleTable(formatter)
+        assert table["a page"] == "A Page"
+        assert table["a page"] == "A Page"
+        assert formatter.calls == ["a page"]
+
+    def test_unmatched_names_are_bounded(self):
+        formatter = CountingFormatter()
+        table = TitleTable(formatter, max_unmatched=2)
+        for name in ("one", "two", "one", "three", "one", "two"):
+            table[name]
+        # "two" was the least recently used when "three" came in
+        assert formatter.calls == ["one", "two", "three", "two"]
+        assert len(table) == 2
+
+    def test_graph_names_are_kept(self):
+        TitleTable.register_names(["Kept Page"])
+        formatter = CountingFormatter()
+        table = TitleTable(formatter, max_unmatched=1)
+        for name in ("kept page", "other", "another", "kept page"):
+            table[name]
+        assert formatter.calls == ["kept page", "other", "another"]
+
+    def test_register_workspace(self, tmp_path):
+        pages = tmp_path / "pages"
+        pages.mkdir()
+        (pages / "repo___My%20Thing.md").write_text("alias:: First, second_one\n")
+        TitleTable.register_workspace(WorkspaceIndex.scan(str(tmp_path)))
+        assert {
+            "repo___my%20thing.md",
+            "repo___my thing",
+            "repo/my thing",
+            "first",
+            "second_one",
+        } <= TitleTable.graph_names
+
+    def test_page_titles_go_through_the_table(self):
+        processor = PageTitleProcessor()
+        title = processor._format_title_from_filename("project___big_plan.md")
+        assert processor._format_title_from_filename("project___big_plan.md") is title
+        assert len(processor.titles) == 1
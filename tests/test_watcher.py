@@ -0,0 +1,158 @@
+import os
+import pytest
+from src.file_handlers.logseq_to_reflect_converter import LogSeqToReflectConverter
+from src.file_handlers.watcher import WorkspaceWatcher, snapshot_workspace
+from src.processors.backlink_collector import BacklinkCollector
+from src.processors.tag_to_backlink import TagToBacklinkProcessor
+
+BLOCK_ID = "67a45c2e-529c-4831-b069-dd6f8e8d1234"
+QUOTE_ID = "67a45c2e-529c-4831-b069-dd6f8e8d5678"
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    """Create a small workspace with a block reference between two pages"""
+    journals_dir = tmp_path / "workspace" / "journals"
+    pages_dir = tmp_path / "workspace" / "pages"
+    journals_dir.mkdir(parents=True)
+    pages_dir.mkdir()
+    (journals_dir / "2023_01_01.md").write_text("- Journal entry\n")
+    (pages_dir / "source.md").write_text(f"- Original text\n  id:: {BLOCK_ID}\n")
+    (pages_dir / "referrer.md").write_text(f"- See (({BLOCK_ID}))\n")
+    (pages_dir / "other.md").write_text("- Unrelated page #tagkept\n")
+    TagToBacklinkProcessor.found_tags.clear()
+    BacklinkCollector.clear_backlinks()
+    yield str(tmp_path / "workspace")
+    TagToBacklinkProcessor.found_tags.clear()
+    BacklinkCollector.clear_backlinks()
+
+
+def edit(path, content):
+    """Rewrite a file and move its mtime forward, as an editor save would"""
+    stat = os.stat(path) if os.path.exists(path) else None
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    if stat is not None:
+        mtime_ns = stat.st_mtime_ns + 1_000_000_000
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def read(output_dir, rel_path):
+    with open(os.path.join(output_dir, rel_path), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture
+def watcher(workspace, tmp_path):
+    converter = LogSeqToReflectConverter(
+        workspace=workspace, output_dir=str(tmp_path / "output")
+    )
+    watcher = WorkspaceWatcher(converter, interval=0)
+    watcher.start()
+    return watcher
+
+
+class TestWorkspaceWatcher:
+    """Tests for the --watch mode of LogSeqToReflectConverter"""
+
+    def test_snapshot_lists_journals_and_pages(self, workspace):
+        snapshot = snapshot_workspace(workspace)
+        kinds = sorted(
+            (os.path.basename(path), kind) for path, (_, _, kind) in snapshot.items()
+        )
+        assert kinds == [
+            ("2023_01_01.md", "journal"),
+            ("other.md", "page"),
+            ("referrer.md", "page"),
+            ("source.md", "page"),
+        ]
+
+    def test_snapshot_does_not_follow_directory_links(self, workspace):
+        pages_dir = os.path.join(workspace, "pages")
+        os.symlink(pages_dir, os.path.join(pages_dir, "loop"))
+        snapshot = snapshot_workspace(workspace)
+        assert len(snapshot) == 4
+
+    def test_no_changes(self, watcher):
+        assert watcher.poll() is None
+
+    def test_only_the_changed_file_is_reconverted(self, watcher, workspace):
+        output_dir = watcher.converter.output_dir
+        page = os.path.join(workspace, "pages", "other.md")
+        edit(page, "- Edited page #tagkept\n")
+
+        cycle = watcher.poll()
+        assert cycle.changed == [page]
+        assert cycle.converted == {page}
+        assert "Edited page" in read(output_dir, "step_2/other.md")
+        assert watcher.poll() is None
+
+    def test_block_edit_reconverts_referrers(self, watcher, workspace):
+        output_dir = watcher.converter.output_dir
+        source = os.path.join(workspace, "pages", "source.md")
+        edit(source, f"- Updated text\n  id:: {BLOCK_ID}\n")
+
+        cycle = watcher.poll()
+        referrer = os.path.join(workspace, "pages", "referrer.md")
+        assert cycle.converted == {source, referrer}
+        assert "Updated text" in read(output_dir, "step_2/referrer.md")
+
+    def test_block_edit_reconverts_indirect_referrers(self, workspace, tmp_path):
+        pages_dir = os.path.join(workspace, "pages")
+        quote = os.path.join(pages_dir, "quote.md")
+        chain = os.path.join(pages_dir, "chain.md")
+        edit(quote, f"- Quoting (({BLOCK_ID}))\n  id:: {QUOTE_ID}\n")
+        edit(chain, f"- Ref (({QUOTE_ID}))\n")
+        converter = LogSeqToReflectConverter(
+            workspace=workspace, output_dir=str(tmp_path / "output")
+        )
+        watcher = WorkspaceWatcher(converter, interval=0)
+        watcher.start()
+        source = os.path.join(pages_dir, "source.md")
+        edit(source, f"- Updated text\n  id:: {BLOCK_ID}\n")
+
+        cycle = watcher.poll()
+        referrer = os.path.join(pages_dir, "referrer.md")
+        assert cycle.converted == {source, referrer, quote, chain}
+        assert "Updated text" in read(converter.output_dir, "step_2/chain.md")
+
+    def test_new_and_deleted_files(self, watcher, workspace):
+        output_dir = watcher.converter.output_dir
+        new_page = os.path.join(workspace, "pages", "new.md")
+        edit(new_page, "- Brand new #tagnew\n")
+
+        cycle = watcher.poll()
+        assert cycle.converted == {new_page}
+        assert os.path.exists(os.path.join(output_dir, "step_2", "new.md"))
+        assert os.path.exists(os.path.join(output_dir, "step_1", "tagnew.md"))
+        assert "tagnew" in TagToBacklinkProcessor.found_tags
+
+        os.remove(new_page)
+        cycle = watcher.poll()
+        assert cycle.removed == [new_page]
+        assert not os.path.exists(os.path.join(output_dir, "step_2", "new.md"))
+        assert not os.path.exists(os.path.join(output_dir, "step_1", "tagnew.md"))
+        assert "tagnew" not in TagToBacklinkProcessor.found_tags
+        assert "tagkept" in TagToBacklinkProcessor.found_tags
+
+    def test_new_tag_reconverts_linking_pages(self, watcher, workspace):
+        output_dir = watcher.converter.output_dir
+        linker = os.path.join(workspace, "pages", "linker.md")
+        edit(linker, "- Link to [[tagrelease]]\n")
+        watcher.poll()
+        assert "[[Tagrelease]]" in read(output_dir, "step_2/linker.md")
+
+        tagger = os.path.join(workspace, "pages", "tagger.md")
+        edit(tagger, "- Shipped #tagrelease\n")
+        cycle = watcher.poll()
+        assert cycle.converted == {tagger, linker}
+        assert "[[tagrelease]]" in read(output_dir, "step_2/linker.md")
+
+    def test_page_moving_to_step_1_removes_old_output(self, watcher, workspace):
+        output_dir = watcher.converter.output_dir
+        page = os.path.join(workspace, "pages", "other.md")
+        edit(page, "alias:: Another name\n\n- Unrelated page #tagkept\n")
+
+        watcher.poll()
+        assert os.path.exists(os.path.join(output_dir, "step_1", "other.md"))
+        assert not os.path.exists(os.path.join(output_dir, "step_2", "other.md"))
@@ -0,0 +1,111 @@
+import pytest
+import os
+import builtins
+from src.file_handlers.workspace_index import WorkspaceIndex
+from src.file_handlers.logseq_to_reflect_converter import LogSeqToReflectConverter
+from src.processors.block_references import BlockReferencesReplacer
+from src.utils import find_markdown_files
+
+
+@pytest.fixture
+def test_workspace(tmp_path):
+    """Create a workspace with journals, pages and a nested page directory"""
+    journals_dir = tmp_path / "journals"
+    pages_dir = tmp_path / "pages"
+    nested_dir = pages_dir / "nested"
+    nested_dir.mkdir(parents=True)
+    journals_dir.mkdir()
+    (journals_dir / "2023_01_01.md").write_text("- Journal entry\n- TODO Task 1\n")
+    (pages_dir / "plain.md").write_text(
+        "- A block\n  id:: 67a45c2e-529c-4831-b069-dd6f8e8d1234\n"
+    )
+    (pages_dir / "with_alias.md").write_text("alias:: Other Name\n- Content\n")
+    (pages_dir / "repo___thing.md").write_text(
+        "- ((67a45c2e-529c-4831-b069-dd6f8e8d1234))\n"
+    )
+    (nested_dir / "deep.md").write_text("- Deep page\n")
+    (pages_dir / "notes.txt").write_text("not markdown")
+    return str(tmp_path)
+
+
+class TestWorkspaceIndex:
+    """Tests for the WorkspaceIndex class"""
+
+    def test_scan_indexes_all_markdown_files(self, test_workspace):
+        index = WorkspaceIndex.scan(test_workspace)
+
+        walked = [
+            os.path.abspath(p)
+            for subdir in ("journals", "pages")
+            for p in find_markdown_files(os.path.join(test_workspace, subdir))
+        ]
+        assert [f.path for f in index.files] == walked
+        assert [f.filename for f in index.journals()] == ["2023_01_01.md"]
+        assert len(index.pages()) == 4
+
+    def test_scan_does_not_follow_directory_links(self, test_workspace):
+        pages_dir = os.path.join(test_workspace, "pages")
+        # A link back up the tree would otherwise be scanned forever
+        os.symlink(pages_dir, os.path.join(pages_dir, "nested", "loop"))
+        index = WorkspaceIndex.scan(test_workspace)
+
+        walked = [os.path.abspath(p) for p in find_markdown_files(pages_dir)]
+        assert [f.path for f in index.pages()] == walked
+        assert len(index.pages()) == 4
+
+    def test_entries_have_metadata_and_content(self, test_workspace):
+        index = WorkspaceIndex.scan(test_workspace)
+        entry = index.get(os.path.join(test_workspace, "journals", "2023_01_01.md"))
+
+        assert entry.kind == "journal"
+        assert entry.content == "- Journal entry\n- TODO Task 1\n"
+        assert entry.size == len(entry.content.encode("utf-8"))
+        assert entry.mtime > 0
+
+    def test_alias_flags(self, test_workspace):
+        index = WorkspaceIndex.scan(test_workspace)
+        flags = {f.filename: f.has_aliases for f in index.pages()}
+
+        assert flags == {
+            "plain.md": False,
+            "with_alias.md": True,
+            "repo___thing.md": True,
+            "deep.md": False,
+        }
+
+    def test_files_under(self, test_workspace):
+        index = WorkspaceIndex.scan(test_workspace)
+        nested = index.files_under(os.path.join(test_workspace, "pages", "nested"))
+        assert [f.filename for f in nested] == ["deep.md"]
+
+    def test_collect_blocks_from_index(self, test_workspace):
+        from_disk = BlockReferencesReplacer()
+        from_disk.collect_blocks(test_workspace)
+        from_index = BlockReferencesReplacer()
+        from_index.collect_blocks(test_workspace, WorkspaceIndex.scan(test_workspace))
+
+        assert from_index.block_map == from_disk.block_map
+        assert "67a45c2e-529c-4831-b069-dd6f8e8d1234" in from_index.block_map
+
+    def test_run_reads_each_source_file_once(
+        self, test_workspace, tmp_path, monkeypatch
+    ):
+        reads = []
+        real_open = builtins.open
+
+        def counting_open(file, mode="r", *args, **kwargs):
+            path = os.path.abspath(str(file))
+            if "r" in mode and path.startswith(test_workspace + os.sep):
+                reads.append(path)
+            return real_open(file, mode, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "open", counting_open)
+        converter = LogSeqToReflectConverter(
+            workspace=test_workspace, output_dir=str(tmp_path / "output")
+        )
+        stats = converter.run()
+
+        assert stats.total_files == 5
+        # One page has '___' in its name, the other an alias:: property
+        assert stats.files_in_step_1 == 2
+        assert sorted(reads) == sorted(f.path for f in converter.index.files)